@@ -10,6 +10,9 @@ Licensed under CERN-OHL-W v2 or later
 
 __version__ = "1.0.2"
 
+from .make import Session
 from .make import make
+from .profiling import Profiler
+from .report import Report
 
-__all__ = ["make"]
+__all__ = ["Profiler", "Report", "Session", "make"]
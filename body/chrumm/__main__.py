@@ -4,38 +4,94 @@ If a configuration parameter appears multiple times, then its latest
 value is used. STL files are written to the current working directory.
 
 Usage:
-  chrumm [--help] [--version] [--log LEVEL] [--threads N] [--knob] JSON...
+  chrumm [--help] [--version] [--log LEVEL] [--threads N] [--knob]
+         [--pcb-only] [--parts ITEMS] [--side SIDE] [--preview] [--final]
+         [--keep ITEMS] [--validate] [--check] [--report FILE]
+         [--profile DIR] [--collapsed] [--trace FILE] [--watch] JSON...
+  chrumm [OPTIONS] --batch FILE [JSON...]
 
 Options:
-  -h, --help   Print this help and exit
-  --version    Print program version and exit
-  --log LEVEL  Either DEBUG, INFO, WARNING, or ERROR (default: INFO)
-  --threads N  Number of threads to use (default: 8)
-  --knob       Generate the rotary encoder knob only
+  -h, --help     Print this help and exit
+  --version      Print program version and exit
+  --log LEVEL    Either DEBUG, INFO, WARNING, or ERROR (default: INFO)
+  --threads N    Number of threads to use (default: 8)
+  --knob         Generate the rotary encoder knob only
+  --pcb-only     Generate the PCB switch positions only
+  --parts ITEMS  Comma-separated parts to generate, which are all by default:
+                 knob,pcb,body,floor,palm,support
+  --side SIDE    Generate the keyboard parts of either left or right side only
+  --preview      Generate coarse meshes quickly, with a "-preview" suffix
+  --final        Generate the final meshes as well, in preview mode
+  --keep ITEMS   Comma-separated items to keep in preview mode,
+                 which are omitted by default: hexHoles,support
+  --validate     Check the faces for intersections before triangulation
+  --check        Check if the meshes are watertight after triangulation
+  --report FILE  Write the wall and CPU time of each stage, the size of
+                 each mesh, and the peak memory usage as JSON
+  --profile DIR  Write a cProfile .pstats file per stage, and per stage
+                 of the worker processes with a "-workers" suffix
+  --collapsed    Also write collapsed stacks for flame graphs, see --profile
+  --trace FILE   Write a timeline of the main and worker processes in the
+                 trace event format of chrome://tracing and Perfetto
+  --watch        Keep running and regenerate the parts that are affected,
+                 whenever a JSON file changes. Unchanged files are kept.
+  --batch FILE   Generate multiple configurations into a directory each.
+                 The file contains a JSON object of directory names and
+                 JSON files, or lists of JSON files as layers, which are
+                 relative to the file and merged on top of the JSON
+                 arguments. Parts with the same parameters are generated
+                 once, and hard-linked into the other directories.
 """
 
 import getopt
 import json
 import logging
+import os
 import pathlib
+import shutil
 import sys
 import time
 import traceback
 
 import chrumm
 
+from chrumm import trace
+from chrumm.make import PARTS
+from chrumm.make import affectedParts
+from chrumm.make import partKey
+from chrumm.make import partOfFile
+
 
 logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
 log = logging.getLogger()
 
+# Seconds between checks of the JSON files in watch mode
+WATCH_INTERVAL = 0.5
+
 
 def main():
     try:
         threads = 8
         isKnob = False
+        parts = None
+        side = None
+        isPreview = False
+        isFinal = False
+        previewKeep = []
+        isValidating = False
+        isChecking = False
+        isWatching = False
+        batchPath = None
+        reportPath = None
+        profilePath = None
+        isCollapsed = False
+        tracePath = None
 
-        options, jsonFiles = getopt.getopt(
-            sys.argv[1:], "h", "help version log= threads= knob".split())
+        longOptions = (
+            "help version log= threads= knob pcb-only parts= side= "
+            "preview final keep= validate check report= profile= collapsed trace= "
+            "watch batch=")
+        options, jsonFiles = getopt.getopt(sys.argv[1:], "h", longOptions.split())
 
         for name, arg in options:
             if name == "-h" or name == "--help":
@@ -50,13 +106,49 @@ def main():
                 threads = int(arg)
             elif name == "--knob":
                 isKnob = True
+            elif name == "--pcb-only":
+                parts = ["pcb"]
+            elif name == "--parts":
+                parts = [item for item in arg.split(",") if item]
+            elif name == "--side":
+                side = arg
+            elif name == "--preview":
+                isPreview = True
+            elif name == "--final":
+                isFinal = True
+            elif name == "--keep":
+                previewKeep = [item for item in arg.split(",") if item]
+            elif name == "--validate":
+                isValidating = True
+            elif name == "--check":
+                isChecking = True
+            elif name == "--report":
+                reportPath = pathlib.Path(arg)
+            elif name == "--profile":
+                profilePath = pathlib.Path(arg)
+            elif name == "--collapsed":
+                isCollapsed = True
+            elif name == "--trace":
+                tracePath = pathlib.Path(arg)
+            elif name == "--watch":
+                isWatching = True
+            elif name == "--batch":
+                batchPath = pathlib.Path(arg)
 
-        if not jsonFiles:
+        if not jsonFiles and not batchPath:
             raise getopt.GetoptError("Missing JSON argument.")
 
+        if (reportPath or profilePath or tracePath) and (batchPath or isWatching):
+            raise getopt.GetoptError(
+                "The --report, --profile, and --trace options are not available "
+                "in batch or watch mode.")
+
+        if isCollapsed and not profilePath:
+            raise getopt.GetoptError("The --collapsed option requires --profile.")
+
         jsonPaths = [pathlib.Path(f) for f in jsonFiles]
         jsonStrings = [p.read_text() for p in jsonPaths]
-        jsonStem = jsonPaths[-1].stem
+        jsonStem = jsonPaths[-1].stem if jsonPaths else "chrumm"
 
         log.info(r"  ___ _   _ ____  _   _ __  __ __  __ ")
         log.info(r".' __| |_| |  _ '| | | |  \/  |  \/  |")
@@ -65,37 +157,193 @@ def main():
         log.info("")
         log.info("This is chrumm %s", chrumm.__version__)
 
+        if batchPath:
+            isSuccessful = _batch(
+                batchPath, jsonStrings, jsonStem, threads, ["knob"] if isKnob else parts, side,
+                isPreview=isPreview, isFinal=isFinal, previewKeep=previewKeep,
+                isValidating=isValidating, isChecking=isChecking)
+            sys.exit(0 if isSuccessful else 1)
+
+        if isWatching:
+            _watch(
+                jsonPaths, threads, ["knob"] if isKnob else parts, side,
+                isPreview=isPreview, isFinal=isFinal, previewKeep=previewKeep,
+                isValidating=isValidating, isChecking=isChecking)
+            return
+
         seconds = time.perf_counter()
-        files = chrumm.make(jsonStrings, threads, isKnob)
+        report = None
+        if reportPath or profilePath:
+            profiler = chrumm.Profiler(profilePath, isCollapsed) if profilePath else None
+            report = chrumm.Report(profiler)
+        if tracePath:
+            trace.start()
+        files = chrumm.make(
+            jsonStrings, threads, isKnob,
+            isPreview, isFinal, previewKeep, isValidating, isChecking, parts, side, report)
+        events = trace.stop()
+        _writeFiles(files, jsonStem)
 
-        for name, data in files.items():
-            path = pathlib.Path(f"{jsonStem}-{name}")
-            log.info('Writing "%s"...', path)
-            if isinstance(data, str):
-                path.write_text(data)
-            else:
-                path.write_bytes(data)
+        if reportPath:
+            log.info('Writing "%s"...', reportPath)
+            reportPath.write_text(json.dumps(report.toDict(), indent=1))
+        if profilePath:
+            report.profiler.write()
+        if tracePath:
+            log.info('Writing "%s"...', tracePath)
+            tracePath.write_text(trace.toJson(events))
 
         seconds = time.perf_counter() - seconds
         log.info("Done after %.3f seconds.", seconds)
 
-    except json.decoder.JSONDecodeError as e:
-        log.error("Could not parse JSON: %s", e)
-        log.debug(traceback.format_exc().strip())
+    except KeyboardInterrupt:
+        log.info("Stopped.")
+
+    except Exception as e:
+        _logError(e)
         sys.exit(1)
 
-    except ZeroDivisionError:
+
+def _logError(e):
+    """Log an exception, while it is handled."""
+    if isinstance(e, json.decoder.JSONDecodeError):
+        log.error("Could not parse JSON: %s", e)
+    elif isinstance(e, ZeroDivisionError):
         log.error(
             "Encountered a division by zero.\n"
             "  This can be caused by overlapping points or malformed geometry.\n"
             "  Make sure to use sensible parameters, especially for margins and chamfers.")
-        log.debug(traceback.format_exc().strip())
-        sys.exit(1)
-
-    except Exception as e:
+    else:
         log.error(e)
-        log.debug(traceback.format_exc().strip())
-        sys.exit(1)
+    log.debug(traceback.format_exc().strip())
+
+
+def _writeFiles(files, jsonStem, isChangedOnly=False):
+    """Write the files, and optionally skip those with identical content."""
+    for name, data in files.items():
+        path = pathlib.Path(f"{jsonStem}-{name}")
+        isText = isinstance(data, str)
+        if isChangedOnly and path.is_file():
+            if (path.read_text() if isText else path.read_bytes()) == data:
+                log.debug('Keeping unchanged "%s"', path)
+                continue
+        log.info('Writing "%s"...', path)
+        if isText:
+            path.write_text(data)
+        else:
+            path.write_bytes(data)
+
+
+def _batch(batchPath, baseStrings, baseStem, threads, parts, side, **makeArgs):
+    """Generate the configurations of a batch file, with a shared pool.
+
+    Returns:
+        bool: True if all configurations were generated.
+    """
+    sets = json.loads(batchPath.read_text())
+    if not isinstance(sets, dict):
+        raise ValueError("The batch file must contain a JSON object.")
+
+    selected = list(PARTS if parts is None else parts)
+    generatedFiles = {}
+    failedNames = []
+
+    with chrumm.Session(threads) as session:
+        for name, layers in sets.items():
+            log.info('Generating "%s"...', name)
+            seconds = time.perf_counter()
+            try:
+                layers = [layers] if isinstance(layers, str) else layers
+                jsonPaths = [batchPath.parent / layer for layer in layers]
+                jsonStrings = baseStrings + [p.read_text() for p in jsonPaths]
+                stem = jsonPaths[-1].stem if jsonPaths else baseStem
+                directory = pathlib.Path(name)
+                directory.mkdir(parents=True, exist_ok=True)
+
+                keys = {part: partKey(jsonStrings, part) for part in selected}
+                missing = [part for part in selected if keys[part] not in generatedFiles]
+                files = session.make(jsonStrings, parts=missing, side=side, **makeArgs)
+                _writeFiles(files, directory / stem)
+
+                for part in missing:
+                    generatedFiles[keys[part]] = {}
+                for fileName in files:
+                    path = directory / f"{stem}-{fileName}"
+                    generatedFiles[keys[partOfFile(fileName)]][fileName] = path
+
+                for part in selected:
+                    if part not in missing:
+                        for fileName, source in generatedFiles[keys[part]].items():
+                            _linkFile(source, directory / f"{stem}-{fileName}")
+
+                seconds = time.perf_counter() - seconds
+                log.info('Done with "%s" after %.3f seconds.', name, seconds)
+            except Exception as e:
+                _logError(e)
+                failedNames.append(name)
+
+    if failedNames:
+        log.error("Could not generate: %s", ", ".join(failedNames))
+    return not failedNames
+
+
+def _linkFile(source, target):
+    """Hard-link a file, or copy it if that is not possible."""
+    log.info('Linking "%s"...', target)
+    if target.exists():
+        target.unlink()
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def _watch(jsonPaths, threads, parts, side, **makeArgs):
+    """Regenerate the affected files whenever the JSON files change, until interrupted.
+
+    The worker pool and the caches are kept warm by a single session.
+    """
+    jsonStem = jsonPaths[-1].stem
+    selected = list(PARTS if parts is None else parts)
+    jsonStrings = None
+    mtimes = None
+
+    with chrumm.Session(threads) as session:
+        while True:
+            try:
+                newMtimes = [p.stat().st_mtime_ns for p in jsonPaths]
+            except OSError:
+                # Some editors replace files on save
+                newMtimes = mtimes
+
+            if newMtimes != mtimes:
+                mtimes = newMtimes
+                seconds = time.perf_counter()
+                try:
+                    newStrings = [p.read_text() for p in jsonPaths]
+                    if jsonStrings is None:
+                        rebuild = selected
+                    else:
+                        affected = affectedParts(jsonStrings, newStrings)
+                        rebuild = [part for part in selected if part in affected]
+
+                    if rebuild:
+                        log.info("Generating parts: %s", ", ".join(rebuild))
+                        files = session.make(newStrings, parts=rebuild, side=side, **makeArgs)
+                        _writeFiles(files, jsonStem, True)
+                        seconds = time.perf_counter() - seconds
+                        log.info("Done after %.3f seconds.", seconds)
+                    elif newStrings != jsonStrings:
+                        log.info("The changes do not affect any parts.")
+
+                    # Unsuccessful changes are included in the next diff
+                    jsonStrings = newStrings
+                except Exception as e:
+                    _logError(e)
+
+                log.info("Watching for changes...")
+
+            time.sleep(WATCH_INTERVAL)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,6 @@
+_jsonStrings = ()
+
+
 def _init(jsonStrings):
     """Make JSON values available as native module attributes."""
     # Imports are done in local scope because
@@ -25,3 +28,47 @@ def _init(jsonStrings):
     # Add new attributes to globals()
     for string in jsonStrings:
         mergeDicts(json.loads(string), globals())
+
+    # Allows worker processes to parse the same strings
+    global _jsonStrings
+    _jsonStrings = tuple(jsonStrings)
+
+
+def _get(name):
+    """Return the value of a dotted parameter name, or None."""
+    obj = globals()
+    for key in name.split("."):
+        obj = obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+    return obj
+
+
+def _set(name, value):
+    """Set the value of a dotted parameter name without conversion."""
+    *path, key = name.split(".")
+    obj = globals()
+    for parentKey in path:
+        obj = obj[parentKey] if isinstance(obj, dict) else getattr(obj, parentKey)
+    if isinstance(obj, dict):
+        obj[key] = value
+    else:
+        setattr(obj, key, value)
+
+
+class _Override:
+    """Temporarily replace parameter values, given as a dict of dotted names."""
+
+    def __init__(self, values):
+        self._values = values
+        self._backup = {}
+
+    def __enter__(self):
+        for name, value in self._values.items():
+            self._backup[name] = _get(name)
+            _set(name, value)
+        return self
+
+    def __exit__(self, *exc):
+        for name, value in reversed(list(self._backup.items())):
+            _set(name, value)
+        self._backup = {}
+        return False
@@ -1,12 +1,20 @@
 from .circle import Circle
 from .edge import Edge
 from .face import Face
+from .grid import SegmentGrid
 from .line import Line
+from .loft import loft
+from .manifold import findMeshProblems
 from .matrix import Matrix
+from .merge import mergeCoplanar
+from .offset import offset2D
 from .plane import Plane
 from .segment import Segment
+from .simplify import simplifyFaces
+from .sweep import findIntersection2D
 from .triangle import Triangle
 from .vector import Vector
+from .weld import VertexWelder
 
 __all__ = [
     "Circle",
@@ -16,5 +24,13 @@ __all__ = [
     "Matrix",
     "Plane",
     "Segment",
+    "SegmentGrid",
     "Triangle",
-    "Vector"]
+    "Vector",
+    "VertexWelder",
+    "findIntersection2D",
+    "findMeshProblems",
+    "loft",
+    "mergeCoplanar",
+    "offset2D",
+    "simplifyFaces"]
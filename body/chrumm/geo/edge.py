@@ -1,18 +1,36 @@
+import bisect
 import collections
 import math
 
+from .epsilon import isZero
+from .grid import PolygonIndex
+from .loft import loft
 from .segment import Segment
 from .triangle import Triangle
 from .vector import Vector
 
 
+# Minimum number of vectors to build a query index
+INDEX_MIN_LENGTH = 16
+
+
 class Edge(collections.UserList):
     """A flat list of Vectors with additional convenience functions."""
 
+    # Lazily built query index, see _queryIndex. Every method that
+    # modifies the vectors resets it to None.
+    _index = None
+
     def __init__(self, *args):
         super().__init__()
         self.add(*args)
 
+    def __getstate__(self):
+        # The index is rebuilt on demand, rather than pickled for workers
+        state = self.__dict__.copy()
+        state.pop("_index", None)
+        return state
+
     @staticmethod
     def fromConvexHull2D(vectors):
         # Another efficient algorithm for convex hulls in two dimensions - A. M. Andrew
@@ -39,6 +57,7 @@ class Edge(collections.UserList):
         return [Segment(self.data[i], self.data[(i+1) % vecCount]) for i in range(segCount)]
 
     def add(self, *args):
+        self._index = None
         for arg in args:
             if isinstance(arg, Vector):
                 self.data.append(arg)
@@ -47,105 +66,187 @@ class Edge(collections.UserList):
 
     @property
     def xy(self):
-        return Edge(v.xy for v in self.data)
+        return _wrap([v.xy for v in self.data])
 
     @property
     def xz(self):
-        return Edge(v.xz for v in self.data)
+        return _wrap([v.xz for v in self.data])
 
     @property
     def yz(self):
-        return Edge(v.yz for v in self.data)
+        return _wrap([v.yz for v in self.data])
 
     def mirroredX(self):
-        return Edge(v.mirroredX() for v in self.data)
+        return _wrap([v.mirroredX() for v in self.data])
 
     def mirroredY(self):
-        return Edge(v.mirroredY() for v in self.data)
+        return _wrap([v.mirroredY() for v in self.data])
 
     def mirroredZ(self):
-        return Edge(v.mirroredZ() for v in self.data)
+        return _wrap([v.mirroredZ() for v in self.data])
 
     def reversed(self):
-        return Edge(reversed(self.data))
+        return _wrap(self.data[::-1])
 
     def scaled(self, scalar, center=Vector()):
-        return Edge((v - center)*scalar + center for v in self.data)
+        return _wrap([(v - center)*scalar + center for v in self.data])
 
     def translated(self, vector):
-        return Edge(v + vector for v in self.data)
+        return _wrap([v + vector for v in self.data])
 
     def transformed(self, matrix):
-        return Edge(v.transformed(matrix) for v in self.data)
+        return _wrap(matrix.transformMany(self.data))
 
     def snapped(self):
-        return Edge(p.snapped() for p in self.data)
+        return _wrap([p.snapped() for p in self.data])
+
+    # Modifications of UserList
+
+    def __setitem__(self, i, item):
+        self._index = None
+        super().__setitem__(i, item)
+
+    def __delitem__(self, i):
+        self._index = None
+        super().__delitem__(i)
+
+    def __iadd__(self, other):
+        self._index = None
+        return super().__iadd__(other)
+
+    def __imul__(self, n):
+        self._index = None
+        return super().__imul__(n)
+
+    def append(self, item):
+        self._index = None
+        self.data.append(item)
+
+    def insert(self, i, item):
+        self._index = None
+        self.data.insert(i, item)
+
+    def pop(self, i=-1):
+        self._index = None
+        return self.data.pop(i)
+
+    def remove(self, item):
+        self._index = None
+        self.data.remove(item)
+
+    def clear(self):
+        self._index = None
+        self.data.clear()
+
+    def reverse(self):
+        self._index = None
+        self.data.reverse()
+
+    def sort(self, *args, **kwargs):
+        self._index = None
+        self.data.sort(*args, **kwargs)
+
+    def extend(self, other):
+        self._index = None
+        super().extend(other)
+
+    # In-place variants of the above, for edges that are not shared.
+    # The vectors are replaced rather than modified, because they are
+    # usually shared with other edges, faces, and triangles.
+    # Use reverse to reverse an edge in place.
+
+    def mirrorX(self):
+        self._index = None
+        self.data[:] = [v.mirroredX() for v in self.data]
+
+    def mirrorY(self):
+        self._index = None
+        self.data[:] = [v.mirroredY() for v in self.data]
+
+    def mirrorZ(self):
+        self._index = None
+        self.data[:] = [v.mirroredZ() for v in self.data]
+
+    def scale(self, scalar, center=Vector()):
+        self._index = None
+        self.data[:] = [(v - center)*scalar + center for v in self.data]
+
+    def translate(self, vector):
+        self._index = None
+        self.data[:] = [v + vector for v in self.data]
+
+    def transform(self, matrix):
+        self._index = None
+        self.data[:] = matrix.transformMany(self.data)
+
+    def snap(self):
+        self._index = None
+        self.data[:] = [p.snapped() for p in self.data]
 
     def collapsed(self, threshold=1e-3):
         """Remove segments that are shorter than the threshold."""
         return Edge(s.a for s in self.toSegments(True) if s.magnitude() >= threshold)
 
+    def simplified(self, tolerance, pinned=(), isClosed=False):
+        """Remove points that are closer than the tolerance to the remaining edge.
+
+        Pinned points and the ends of an open edge are always kept. The
+        chains between kept points are simplified in a canonical direction,
+        so that a chain shared by two edges yields the same points,
+        even if the edges are in opposite order.
+
+        Args:
+            tolerance (float): Maximum distance of removed points.
+            pinned (set[tuple[float, float, float]]): Coordinates to keep.
+            isClosed (bool): Treat the edge as a polygon.
+        """
+        # Douglas-Peucker algorithm
+        # https://en.wikipedia.org/wiki/Ramer-Douglas-Peucker_algorithm
+        data = self.data
+        count = len(data)
+        if count < 3 + bool(isClosed):
+            return Edge(data)
+
+        keys = [(p.x, p.y, p.z) for p in data]
+        anchors = {i for i in range(count) if keys[i] in pinned}
+
+        if not isClosed:
+            anchors.update((0, count - 1))
+        else:
+            # Split the polygon at the canonical point
+            # and the point furthest away from it
+            if not anchors:
+                anchors.add(keys.index(min(keys)))
+            if len(anchors) == 1:
+                first = data[min(anchors)]
+                anchors.add(max(
+                    range(count),
+                    key=lambda i: ((data[i] - first).magSquared(), keys[i])))
+
+        anchors = sorted(anchors)
+        isKept = [i in anchors for i in range(count)]
+
+        chains = list(zip(anchors, anchors[1:]))
+        if isClosed:
+            chains.append((anchors[-1], anchors[0] + count))
+
+        for start, stop in chains:
+            chain = [i % count for i in range(start, stop + 1)]
+            if keys[chain[-1]] < keys[chain[0]]:
+                chain.reverse()
+            _douglasPeucker(data, chain, tolerance, isKept)
+
+        return Edge(p for p, isK in zip(data, isKept) if isK)
+
     def meshPairwise(self, other, isClosed=False):
         """Triangulate each pair of edge segments in order.
 
         Edges may overlap. If one edge has more segments
         than the other, its remaining segments are
         connected to the last point of the shorter edge.
+        See loft for several edges at once.
         """
-        triangles = []
-
-        selfLen = len(self.data)
-        otherLen = len(other.data)
-
-        selfEnd = selfLen - 1 + int(isClosed)
-        otherEnd = otherLen - 1 + int(isClosed)
-
-        for i in range(max(otherEnd, selfEnd)):
-            a = self.data[min(selfEnd, i) % selfLen]
-            b = self.data[min(selfEnd, i+1) % selfLen]
-            c = other.data[min(otherEnd, i+1) % otherLen]
-            d = other.data[min(otherEnd, i) % otherLen]
-
-            # There are two possible pairs of triangles:
-            #  --d----c->  --d----c->  other
-            #    |1 / |      | \ 3|
-            #    | / 0|      |2 \ |
-            #  --a----b->  --a----b->  self
-
-            abc = Triangle(a, b, c)
-            cda = Triangle(c, d, a)
-            abd = Triangle(a, b, d)
-            dbc = Triangle(d, b, c)
-
-            # Lookup table to determine which triangles
-            # to use, based on which are valid
-            valid = bool(dbc)*8 + bool(abd)*4 + bool(cda)*2 + bool(abc)
-            table = (
-                0b0000, 0b0000, 0b0000, 0b0001,
-                0b0000, 0b0001, 0b0010, 0b0011,
-                0b0000, 0b0001, 0b0010, 0b0011,
-                0b0100, 0b1100, 0b1100, 0b0011)
-            bits = table[valid]
-
-            if valid == 0b1111:
-                # https://en.wikipedia.org/wiki/Delaunay_triangulation
-                abcAngle = (a - b).angleBetween(c - b)
-                cdaAngle = (c - d).angleBetween(a - d)
-                # The epsilon is not necessary, but it prevents
-                # irregular quad diagonals due to rounding errors.
-                if abcAngle + cdaAngle > math.pi + 1e-6:
-                    bits = 0b1100
-
-            if bits & 0b0001:
-                triangles.append(abc)
-            if bits & 0b0010:
-                triangles.append(cda)
-            if bits & 0b0100:
-                triangles.append(abd)
-            if bits & 0b1000:
-                triangles.append(dbc)
-
-        return triangles
+        return loft((self.data, other.data), isClosed)
 
     def meshParallel(self, other, isClosed=False):
         """Triangulate reasonably parallel, non-intersecting edges
@@ -212,6 +313,10 @@ class Edge(collections.UserList):
 
         Vectors on the exact edge may or may not be considered inside.
         """
+        index = self._queryIndex()
+        if index is not None:
+            return index.contains2D(vector)
+
         # Point Inclusion in Polygon Test - W. Randolph Franklin
         # https://wrf.ecse.rpi.edu/Research/Short_Notes/pnpoly.html
         isIn = False
@@ -223,8 +328,86 @@ class Edge(collections.UserList):
                     isIn = not isIn
         return isIn
 
+    def containsMany2D(self, vectors):
+        """Check which vectors are inside the simple closed edge.
+
+        Equivalent to contains2D for each vector, but the edge
+        crossings are calculated only once per distinct y value.
+        """
+        crossings = {}
+        results = []
+        for vector in vectors:
+            xs = crossings.get(vector.y)
+            if xs is None:
+                xs = crossings[vector.y] = self._crossings2D(vector.y)
+            results.append((len(xs) - bisect.bisect_right(xs, vector.x)) % 2 == 1)
+        return results
+
+    def _crossings2D(self, y):
+        """Return sorted x values where the closed edge crosses y."""
+        # Same crossing rule and expression as in contains2D
+        xs = []
+        for i in range(len(self.data)):
+            a = self.data[i-1]
+            b = self.data[i]
+            if (a.y > y) != (b.y > y):
+                xs.append((b.x - a.x) * (y - a.y) / (b.y - a.y) + a.x)
+        xs.sort()
+        return xs
+
     def distance2D(self, vector):
         """Return the minimum distance to the simple closed edge."""
         if self.contains2D(vector):
             return 0
+        index = self._queryIndex()
+        if index is not None:
+            return index.distance2D(vector)
         return min(s.distance2D(vector) for s in self.toSegments(True))
+
+    def _queryIndex(self):
+        """Return the query index, or None on the first query.
+
+        The index is built on the second query without changes in between,
+        so that edges that are queried only once do not pay for it.
+        The first query sets the index to False, and changes reset it.
+        """
+        if len(self.data) < INDEX_MIN_LENGTH:
+            return None
+        if self._index is None:
+            self._index = False
+            return None
+        if self._index is False:
+            self._index = PolygonIndex(self.data)
+        return self._index
+
+
+def _douglasPeucker(points, chain, tolerance, isKept):
+    """Mark the points of the chain that are kept."""
+    stack = [(0, len(chain) - 1)]
+    while stack:
+        first, last = stack.pop()
+        a = points[chain[first]]
+        ab = points[chain[last]] - a
+        abMagSquared = ab.magSquared()
+
+        maxDist = 0
+        maxIndex = None
+        for k in range(first + 1, last):
+            ap = points[chain[k]] - a
+            u = max(0, min(ap.dot(ab) / abMagSquared, 1)) if abMagSquared != 0 else 0
+            dist = (ab*u - ap).magnitude()
+            if dist > maxDist:
+                maxDist = dist
+                maxIndex = k
+
+        if maxIndex is not None and maxDist > tolerance and not isZero(maxDist):
+            isKept[chain[maxIndex]] = True
+            stack.append((first, maxIndex))
+            stack.append((maxIndex, last))
+
+
+def _wrap(data):
+    """Return an edge that takes ownership of a list of vectors."""
+    edge = Edge()
+    edge.data = data
+    return edge
@@ -21,6 +21,8 @@
 # https://peps.python.org/pep-0485/
 # https://numpy.org/doc/stable/reference/generated/numpy.isclose.html
 
+EPSILON = 1e-6
+
 
 def isZero(n):
-    return abs(n) < 1e-6
+    return abs(n) < EPSILON
@@ -1,6 +1,8 @@
 import math
 
+from .grid import PolygonIndex
 from .matrix import Matrix
+from .sweep import findIntersection2D
 from .triangle import Triangle
 from .vector import Vector
 
@@ -24,9 +26,79 @@ class Face:
         self.edge = edge
         self.holes = holes
 
-    def triangulate(self):
+    def validate(self):
+        """Check the requirements of the stored polygon data.
+
+        The requirements are checked in their listed order, except
+        for coplanarity. Intersections are found with a sweep line.
+
+        Raises:
+            ValueError: If a requirement is violated, with coordinates.
+        """
+        loops = [list(self.edge)] + [list(hole) for hole in self.holes if hole]
+
+        for loop in loops:
+            if len(loop) < 3:
+                raise ValueError(f"Polygon with less than three points: {loop}")
+
+        points = set()
+        for loop in loops:
+            for p in loop:
+                if (p.x, p.y, p.z) in points:
+                    raise ValueError(f"Duplicate point: {p}")
+                points.add((p.x, p.y, p.z))
+
+        try:
+            surfaceNormal = Vector.fromSurfaceNormal(self.edge)
+        except ZeroDivisionError:
+            raise ValueError(f"Polygon without surface normal: {loops[0][0]}")
+
+        uprightMatrix = Matrix.fromAlignment(surfaceNormal, Vector(0, 0, 1))
+        uprightLoops = [[p.transformed(uprightMatrix).xy for p in loop] for loop in loops]
+
+        intersection = findIntersection2D(uprightLoops)
+        if intersection is not None:
+            (i, j), (k, m) = intersection
+            raise ValueError(
+                "Intersecting segments: "
+                f"{loops[i][j]} to {loops[i][(j+1) % len(loops[i])]} and "
+                f"{loops[k][m]} to {loops[k][(m+1) % len(loops[k])]}")
+
+        # Without intersections, a single point per hole
+        # is sufficient to check the nesting of holes
+        edgeIndex = PolygonIndex(uprightLoops[0])
+        for i, hole in enumerate(uprightLoops[1:], 1):
+            if not edgeIndex.contains2D(hole[0]):
+                raise ValueError(f"Hole outside of edge: {loops[i][0]}")
+
+        boxes = sorted((
+            min(p.x for p in hole),
+            max(p.x for p in hole),
+            min(p.y for p in hole),
+            max(p.y for p in hole),
+            i) for i, hole in enumerate(uprightLoops[1:], 1))
+
+        for a, (minX, maxX, minY, maxY, i) in enumerate(boxes):
+            for otherMinX, _, otherMinY, otherMaxY, j in boxes[a+1:]:
+                if otherMinX > maxX:
+                    break
+                if otherMinY > maxY or otherMaxY < minY:
+                    continue
+                if PolygonIndex(uprightLoops[i]).contains2D(uprightLoops[j][0]):
+                    raise ValueError(f"Nested hole: {loops[j][0]}")
+                if PolygonIndex(uprightLoops[j]).contains2D(uprightLoops[i][0]):
+                    raise ValueError(f"Nested hole: {loops[i][0]}")
+
+        for i, hole in enumerate(uprightLoops[1:], 1):
+            if _signedArea2D(hole) > 0:
+                raise ValueError(f"Hole with the same point order as the edge: {loops[i][0]}")
+
+    def triangulate(self, isRefined=True):
         """Triangulate the stored polygon.
 
+        Args:
+            isRefined (bool): Flip the triangles to satisfy the
+                Delaunay condition. Skip for quick previews.
         Returns:
             list[Triangle]
         """
@@ -47,7 +119,8 @@ class Face:
 
         Face._mergeHoles(uprightPoints, polyIndexes, holeIndexes)
         triangles = Face._cutEars(uprightPoints, polyIndexes)
-        Face._flipTriangles(uprightPoints, triangles)
+        if isRefined:
+            Face._flipTriangles(uprightPoints, triangles)
 
         return [Triangle(
             realPoints[i],
@@ -250,3 +323,11 @@ class Face:
             remaining.add((a, d))
             remaining.add((d, b))
             remaining.add((b, c))
+
+
+def _signedArea2D(points):
+    """Return the signed area, which is positive if counterclockwise."""
+    # Shoelace formula
+    return sum(
+        points[i-1].x*points[i].y - points[i].x*points[i-1].y
+        for i in range(len(points))) / 2
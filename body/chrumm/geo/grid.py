@@ -0,0 +1,158 @@
+import bisect
+import math
+
+from .segment import Segment
+
+
+class SegmentGrid:
+    """Uniform grid of 2D segments for fast proximity queries.
+
+    Each segment is stored in every cell that overlaps its bounding box.
+    Queries only visit nearby cells, but return the same results as a
+    linear scan over all segments.
+    """
+
+    def __init__(self, segments, cellSize=None):
+        self.segments = list(segments)
+        self._cells = {}
+
+        if not self.segments:
+            self._minX = self._minY = 0
+            self._cellSize = 1
+            self._countX = self._countY = 0
+            return
+
+        minX = min(min(s.a.x, s.b.x) for s in self.segments)
+        minY = min(min(s.a.y, s.b.y) for s in self.segments)
+        maxX = max(max(s.a.x, s.b.x) for s in self.segments)
+        maxY = max(max(s.a.y, s.b.y) for s in self.segments)
+
+        if cellSize is None:
+            extent = max(maxX - minX, maxY - minY, 1e-3)
+            cellSize = extent / max(1, int(len(self.segments)**0.5))
+
+        self._minX = minX
+        self._minY = minY
+        self._cellSize = cellSize
+        self._countX = int((maxX - minX) / cellSize) + 1
+        self._countY = int((maxY - minY) / cellSize) + 1
+
+        for index, s in enumerate(self.segments):
+            for cell in self._cellRange(
+                    min(s.a.x, s.b.x), min(s.a.y, s.b.y),
+                    max(s.a.x, s.b.x), max(s.a.y, s.b.y)):
+                self._cells.setdefault(cell, []).append(index)
+
+    def near2D(self, minX, minY, maxX, maxY):
+        """Return the indexes of segments in cells that overlap the box, in order."""
+        indexes = set()
+        for cell in self._cellRange(minX, minY, maxX, maxY):
+            indexes.update(self._cells.get(cell, ()))
+        return sorted(indexes)
+
+    def distance2D(self, vector):
+        """Return the minimum distance to any segment, or inf if empty."""
+        # Search rings of cells around the vector. After ring r, all
+        # remaining segments are more than r cell sizes away.
+        cellX, cellY = self._cellIndex(vector.x, vector.y)
+        maxRing = max(
+            cellX, self._countX - 1 - cellX,
+            cellY, self._countY - 1 - cellY)
+
+        best = math.inf
+        visited = set()
+
+        for ring in range(maxRing + 1):
+            if best < (ring - 1)*self._cellSize - 1e-6:
+                break
+            for cell in self._ringCells(cellX, cellY, ring):
+                for index in self._cells.get(cell, ()):
+                    if index not in visited:
+                        visited.add(index)
+                        best = min(best, self.segments[index].distance2D(vector))
+
+        return best
+
+    def _cellIndex(self, x, y):
+        return (
+            math.floor((x - self._minX) / self._cellSize),
+            math.floor((y - self._minY) / self._cellSize))
+
+    def _cellRange(self, minX, minY, maxX, maxY):
+        # Pad the box to catch segments that touch a cell border
+        x0, y0 = self._cellIndex(minX - 1e-6, minY - 1e-6)
+        x1, y1 = self._cellIndex(maxX + 1e-6, maxY + 1e-6)
+        x0 = max(x0, 0)
+        y0 = max(y0, 0)
+        x1 = min(x1, self._countX - 1)
+        y1 = min(y1, self._countY - 1)
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    def _ringCells(self, cellX, cellY, ring):
+        if ring == 0:
+            return [(cellX, cellY)]
+        cells = []
+        for x in range(cellX - ring, cellX + ring + 1):
+            cells.append((x, cellY - ring))
+            cells.append((x, cellY + ring))
+        for y in range(cellY - ring + 1, cellY + ring):
+            cells.append((cellX - ring, y))
+            cells.append((cellX + ring, y))
+        return cells
+
+
+class PolygonIndex:
+    """Query index of a simple closed polygon.
+
+    Distances are answered by a SegmentGrid. Containment is answered by
+    horizontal slabs between distinct vertex y values, each storing the
+    segments that cross it. The results are identical to a linear scan.
+    Both parts are built on their first use.
+    """
+
+    def __init__(self, vectors):
+        self.vectors = list(vectors)
+        self._grid = None
+        self._slabYs = None
+        self._slabs = None
+
+    def contains2D(self, vector):
+        """Check if the vector is inside, with the same rule as Edge.contains2D."""
+        if self._slabs is None:
+            self._buildSlabs()
+
+        k = bisect.bisect_right(self._slabYs, vector.y) - 1
+        if k < 0 or k >= len(self._slabs):
+            return False
+
+        isIn = False
+        for a, b in self._slabs[k]:
+            if vector.x < (b.x - a.x) * (vector.y - a.y) / (b.y - a.y) + a.x:
+                isIn = not isIn
+        return isIn
+
+    def distance2D(self, vector):
+        """Return the minimum distance to any segment of the polygon."""
+        if self._grid is None:
+            vectors = self.vectors
+            self._grid = SegmentGrid(
+                Segment(vectors[i-1], vectors[i]) for i in range(len(vectors)))
+        return self._grid.distance2D(vector)
+
+    def _buildSlabs(self):
+        # A segment crosses y, if min(a.y, b.y) <= y < max(a.y, b.y).
+        # That is constant between two consecutive vertex y values.
+        vectors = self.vectors
+        ys = sorted({v.y for v in vectors})
+        slabs = [[] for _ in range(len(ys) - 1)]
+
+        for i in range(len(vectors)):
+            a = vectors[i-1]
+            b = vectors[i]
+            start = bisect.bisect_left(ys, min(a.y, b.y))
+            stop = bisect.bisect_left(ys, max(a.y, b.y))
+            for k in range(start, stop):
+                slabs[k].append((a, b))
+
+        self._slabYs = ys
+        self._slabs = slabs
@@ -1,4 +1,5 @@
 from .epsilon import isZero
+from .vector import Vector
 
 
 class Line:
@@ -57,3 +58,37 @@ class Line:
         a = self.pos + self.dir*muA
         b = other.pos + other.dir*muB
         return (a + b) / 2
+
+    def intersectMany(self, others):
+        """Return the intersections with many lines, like intersect."""
+        sx, sy, sz = self.pos.x, self.pos.y, self.pos.z
+        tx, ty, tz = self.dir.x, self.dir.y, self.dir.z
+        ss = tx*tx + ty*ty + tz*tz
+        result = []
+
+        for other in others:
+            ox, oy, oz = other.dir.x, other.dir.y, other.dir.z
+            dx = sx - other.pos.x
+            dy = sy - other.pos.y
+            dz = sz - other.pos.z
+
+            do = dx*ox + dy*oy + dz*oz
+            ds = dx*tx + dy*ty + dz*tz
+            os = ox*tx + oy*ty + oz*tz
+            oo = ox*ox + oy*oy + oz*oz
+
+            numer = do * os - ds * oo
+            denom = ss * oo - os * os
+
+            if isZero(denom):
+                raise ZeroDivisionError("Cannot find intersection of parallel lines.")
+
+            muA = numer / denom
+            muB = (do + muA*os) / oo
+
+            result.append(Vector(
+                ((sx + tx*muA) + (other.pos.x + ox*muB)) / 2,
+                ((sy + ty*muA) + (other.pos.y + oy*muB)) / 2,
+                ((sz + tz*muA) + (other.pos.z + oz*muB)) / 2))
+
+        return result
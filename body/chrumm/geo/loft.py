@@ -0,0 +1,136 @@
+import math
+
+from .epsilon import EPSILON
+from .triangle import Triangle
+
+
+def loft(rings, isClosed=False, isReversed=False):
+    """Triangulate the strips between each pair of consecutive rings.
+
+    Each strip is meshed like Edge.meshPairwise, with the earlier ring
+    as the edge and the later ring as the other edge. The coordinates
+    of each ring are unpacked once and shared by both adjacent strips.
+    Triangle validity and quad diagonals are decided on these floats,
+    so that only the resulting triangles are allocated.
+
+    Args:
+        rings (list[list[Vector]]): Edges or polylines.
+        isClosed (bool): Also connect the last and first points.
+        isReversed (bool): Use the later ring as the edge instead,
+            which flips the surface.
+    Returns:
+        list[Triangle]: The triangles of all strips, in ring order.
+    """
+    rings = [list(ring) for ring in rings]
+    packed = [[(v.x, v.y, v.z) for v in ring] for ring in rings]
+    triangles = []
+
+    for i in range(len(rings) - 1):
+        j, k = (i+1, i) if isReversed else (i, i+1)
+        _loftStrip(rings[j], packed[j], rings[k], packed[k], isClosed, triangles)
+
+    return triangles
+
+
+def _loftStrip(selfRing, selfPacked, otherRing, otherPacked, isClosed, triangles):
+    """Append the triangles between two rings, see Edge.meshPairwise."""
+    selfLen = len(selfRing)
+    otherLen = len(otherRing)
+
+    selfEnd = selfLen - 1 + int(isClosed)
+    otherEnd = otherLen - 1 + int(isClosed)
+
+    count = max(otherEnd, selfEnd)
+    if count <= 0:
+        return
+
+    selfIndexes = [min(selfEnd, i) % selfLen for i in range(count + 1)]
+    otherIndexes = [min(otherEnd, i) % otherLen for i in range(count + 1)]
+
+    # Lookup table to determine which triangles
+    # to use, based on which are valid
+    table = (
+        0b0000, 0b0000, 0b0000, 0b0001,
+        0b0000, 0b0001, 0b0010, 0b0011,
+        0b0000, 0b0001, 0b0010, 0b0011,
+        0b0100, 0b1100, 0b1100, 0b0011)
+
+    for i in range(count):
+        ai = selfIndexes[i]
+        bi = selfIndexes[i+1]
+        ci = otherIndexes[i+1]
+        di = otherIndexes[i]
+        ax, ay, az = selfPacked[ai]
+        bx, by, bz = selfPacked[bi]
+        cx, cy, cz = otherPacked[ci]
+        dx, dy, dz = otherPacked[di]
+
+        # There are two possible pairs of triangles:
+        #  --d----c->  --d----c->  other
+        #    |1 / |      | \ 3|
+        #    | / 0|      |2 \ |
+        #  --a----b->  --a----b->  self
+
+        # A triangle is valid if it has an area, like Triangle.__bool__.
+        # The cross products use the same operands as Triangle.area.
+        abx, aby, abz = bx - ax, by - ay, bz - az
+        acx, acy, acz = cx - ax, cy - ay, cz - az
+        adx, ady, adz = dx - ax, dy - ay, dz - az
+        dcx, dcy, dcz = cx - dx, cy - dy, cz - dz
+        dbx, dby, dbz = bx - dx, by - dy, bz - dz
+        cdx, cdy, cdz = dx - cx, dy - cy, dz - cz
+        cax, cay, caz = ax - cx, ay - cy, az - cz
+
+        valid = 0
+        x = aby*acz - abz*acy
+        y = abz*acx - abx*acz
+        z = abx*acy - aby*acx
+        if (x*x + y*y + z*z)**0.5 / 2 >= EPSILON:
+            valid = 0b0001
+        x = cdy*caz - cdz*cay
+        y = cdz*cax - cdx*caz
+        z = cdx*cay - cdy*cax
+        if (x*x + y*y + z*z)**0.5 / 2 >= EPSILON:
+            valid |= 0b0010
+        x = aby*adz - abz*ady
+        y = abz*adx - abx*adz
+        z = abx*ady - aby*adx
+        if (x*x + y*y + z*z)**0.5 / 2 >= EPSILON:
+            valid |= 0b0100
+        x = dby*dcz - dbz*dcy
+        y = dbz*dcx - dbx*dcz
+        z = dbx*dcy - dby*dcx
+        if (x*x + y*y + z*z)**0.5 / 2 >= EPSILON:
+            valid |= 0b1000
+        bits = table[valid]
+
+        if valid == 0b1111:
+            # https://en.wikipedia.org/wiki/Delaunay_triangulation
+            abcAngle = _angle(ax - bx, ay - by, az - bz, cx - bx, cy - by, cz - bz)
+            cdaAngle = _angle(dcx, dcy, dcz, ax - dx, ay - dy, az - dz)
+            # The epsilon is not necessary, but it prevents
+            # irregular quad diagonals due to rounding errors.
+            if abcAngle + cdaAngle > math.pi + 1e-6:
+                bits = 0b1100
+
+        if bits:
+            va = selfRing[ai]
+            vb = selfRing[bi]
+            vc = otherRing[ci]
+            vd = otherRing[di]
+            if bits & 0b0001:
+                triangles.append(Triangle(va, vb, vc))
+            if bits & 0b0010:
+                triangles.append(Triangle(vc, vd, va))
+            if bits & 0b0100:
+                triangles.append(Triangle(va, vb, vd))
+            if bits & 0b1000:
+                triangles.append(Triangle(vd, vb, vc))
+
+
+def _angle(ux, uy, uz, vx, vy, vz):
+    """Return the angle between two vectors, like Vector.angleBetween."""
+    uMag = (ux*ux + uy*uy + uz*uz)**0.5
+    vMag = (vx*vx + vy*vy + vz*vz)**0.5
+    cos = (ux/uMag)*(vx/vMag) + (uy/uMag)*(vy/vMag) + (uz/uMag)*(vz/vMag)
+    return math.acos(max(-1, min(cos, 1)))
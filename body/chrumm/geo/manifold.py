@@ -0,0 +1,43 @@
+from .weld import VertexWelder
+
+
+def findMeshProblems(triangles):
+    """Check if triangles form closed and consistently oriented surfaces.
+
+    Vertexes are welded within epsilon, and each edge is hashed with
+    its direction. Every edge must be used exactly once in each
+    direction, so that the check runs in linear time.
+
+    Args:
+        triangles (list[Triangle])
+    Returns:
+        list[tuple[str, Vector, Vector]]: Descriptions of the problems,
+            each with the two vertexes of the affected edge.
+    """
+    welder = VertexWelder()
+    problems = []
+    edgeCounts = {}
+
+    for triangle, (i, j, k) in zip(triangles, welder.addTriangles(triangles)):
+        if i == j or j == k or k == i:
+            problems.append(("Degenerate triangle", triangle.a, triangle.b))
+            continue
+        for edge in (i, j), (j, k), (k, i):
+            edgeCounts[edge] = edgeCounts.get(edge, 0) + 1
+
+    for (i, j), count in edgeCounts.items():
+        reverseCount = edgeCounts.get((j, i), 0)
+        # Report each undirected edge once
+        if reverseCount and j < i:
+            continue
+        if count + reverseCount == 1:
+            description = "Open edge"
+        elif count + reverseCount > 2:
+            description = "Non-manifold edge"
+        elif count != 1:
+            description = "Inconsistently oriented edge"
+        else:
+            continue
+        problems.append((description, welder.vectors[i], welder.vectors[j]))
+
+    return problems
@@ -1,5 +1,8 @@
 import math
 
+from .triangle import Triangle
+from .vector import Vector
+
 
 class Matrix:
 
@@ -47,6 +50,28 @@ class Matrix:
         # https://en.wikipedia.org/wiki/Matrix_multiplication
         s = self.data
         o = other.data
+
+        if self.isAffine() and other.isAffine():
+            # The last column is (0, 0, 0, 1), so a quarter
+            # of the products can be skipped
+            return Matrix((
+                s[0]*o[0] + s[1]*o[4] + s[2]*o[8],
+                s[0]*o[1] + s[1]*o[5] + s[2]*o[9],
+                s[0]*o[2] + s[1]*o[6] + s[2]*o[10],
+                0.0,
+                s[4]*o[0] + s[5]*o[4] + s[6]*o[8],
+                s[4]*o[1] + s[5]*o[5] + s[6]*o[9],
+                s[4]*o[2] + s[5]*o[6] + s[6]*o[10],
+                0.0,
+                s[8]*o[0] + s[9]*o[4] + s[10]*o[8],
+                s[8]*o[1] + s[9]*o[5] + s[10]*o[9],
+                s[8]*o[2] + s[9]*o[6] + s[10]*o[10],
+                0.0,
+                s[12]*o[0] + s[13]*o[4] + s[14]*o[8] + o[12],
+                s[12]*o[1] + s[13]*o[5] + s[14]*o[9] + o[13],
+                s[12]*o[2] + s[13]*o[6] + s[14]*o[10] + o[14],
+                1.0))
+
         return Matrix((
             s[0]*o[0] + s[1]*o[4] + s[2]*o[8] + s[3]*o[12],
             s[0]*o[1] + s[1]*o[5] + s[2]*o[9] + s[3]*o[13],
@@ -65,69 +90,135 @@ class Matrix:
             s[12]*o[2] + s[13]*o[6] + s[14]*o[10] + s[15]*o[14],
             s[12]*o[3] + s[13]*o[7] + s[14]*o[11] + s[15]*o[15]))
 
+    def isAffine(self):
+        """Check if the last column is (0, 0, 0, 1).
+
+        Vectors are rows, so the translation is in the last row.
+        Affine matrices are composed with fewer multiplications.
+        """
+        d = self.data
+        return d[3] == 0 and d[7] == 0 and d[11] == 0 and d[15] == 1
+
+    # The following compositions only modify the affected columns,
+    # instead of multiplying with a temporary matrix
+
     def mirroredX(self):
-        return self * Matrix((
-            -1.0, 0.0, 0.0, 0.0,
-            0.0,  1.0, 0.0, 0.0,
-            0.0,  0.0, 1.0, 0.0,
-            0.0,  0.0, 0.0, 1.0))
+        d = self.data
+        return Matrix((
+            -d[0], d[1], d[2], d[3],
+            -d[4], d[5], d[6], d[7],
+            -d[8], d[9], d[10], d[11],
+            -d[12], d[13], d[14], d[15]))
 
     def mirroredY(self):
-        return self * Matrix((
-            1.0,  0.0, 0.0, 0.0,
-            0.0, -1.0, 0.0, 0.0,
-            0.0,  0.0, 1.0, 0.0,
-            0.0,  0.0, 0.0, 1.0))
+        d = self.data
+        return Matrix((
+            d[0], -d[1], d[2], d[3],
+            d[4], -d[5], d[6], d[7],
+            d[8], -d[9], d[10], d[11],
+            d[12], -d[13], d[14], d[15]))
 
     def mirroredZ(self):
-        return self * Matrix((
-            1.0, 0.0,  0.0, 0.0,
-            0.0, 1.0,  0.0, 0.0,
-            0.0, 0.0, -1.0, 0.0,
-            0.0, 0.0,  0.0, 1.0))
+        d = self.data
+        return Matrix((
+            d[0], d[1], -d[2], d[3],
+            d[4], d[5], -d[6], d[7],
+            d[8], d[9], -d[10], d[11],
+            d[12], d[13], -d[14], d[15]))
 
     def rotatedX(self, angle, center=None):
         # https://en.wikipedia.org/wiki/Rotation_matrix
+        #     1.0,  0.0, 0.0, 0.0,
+        #     0.0,  cos, sin, 0.0,
+        #     0.0, -sin, cos, 0.0,
+        #     0.0,  0.0, 0.0, 1.0
         cos = math.cos(angle)
         sin = math.sin(angle)
-        rotation = Matrix((
-            1.0,  0.0, 0.0, 0.0,
-            0.0,  cos, sin, 0.0,
-            0.0, -sin, cos, 0.0,
-            0.0,  0.0, 0.0, 1.0))
-        if center is None:
-            return self * rotation
-        return self.translated(-center).__mul__(rotation).translated(center)
+        m = self if center is None else self.translated(-center)
+        d = m.data
+        m = Matrix((
+            d[0], d[1]*cos - d[2]*sin, d[1]*sin + d[2]*cos, d[3],
+            d[4], d[5]*cos - d[6]*sin, d[5]*sin + d[6]*cos, d[7],
+            d[8], d[9]*cos - d[10]*sin, d[9]*sin + d[10]*cos, d[11],
+            d[12], d[13]*cos - d[14]*sin, d[13]*sin + d[14]*cos, d[15]))
+        return m if center is None else m.translated(center)
 
     def rotatedY(self, angle, center=None):
         # https://en.wikipedia.org/wiki/Rotation_matrix
+        #     cos, 0.0, -sin, 0.0,
+        #     0.0, 1.0,  0.0, 0.0,
+        #     sin, 0.0,  cos, 0.0,
+        #     0.0, 0.0,  0.0, 1.0
         cos = math.cos(angle)
         sin = math.sin(angle)
-        rotation = Matrix((
-            cos, 0.0, -sin, 0.0,
-            0.0, 1.0,  0.0, 0.0,
-            sin, 0.0,  cos, 0.0,
-            0.0, 0.0,  0.0, 1.0))
-        if center is None:
-            return self * rotation
-        return self.translated(-center).__mul__(rotation).translated(center)
+        m = self if center is None else self.translated(-center)
+        d = m.data
+        m = Matrix((
+            d[0]*cos + d[2]*sin, d[1], d[2]*cos - d[0]*sin, d[3],
+            d[4]*cos + d[6]*sin, d[5], d[6]*cos - d[4]*sin, d[7],
+            d[8]*cos + d[10]*sin, d[9], d[10]*cos - d[8]*sin, d[11],
+            d[12]*cos + d[14]*sin, d[13], d[14]*cos - d[12]*sin, d[15]))
+        return m if center is None else m.translated(center)
 
     def rotatedZ(self, angle, center=None):
         # https://en.wikipedia.org/wiki/Rotation_matrix
+        #     cos,  sin, 0.0, 0.0,
+        #     -sin, cos, 0.0, 0.0,
+        #     0.0,  0.0, 1.0, 0.0,
+        #     0.0,  0.0, 0.0, 1.0
         cos = math.cos(angle)
         sin = math.sin(angle)
-        rotation = Matrix((
-            cos,  sin, 0.0, 0.0,
-            -sin, cos, 0.0, 0.0,
-            0.0,  0.0, 1.0, 0.0,
-            0.0,  0.0, 0.0, 1.0))
-        if center is None:
-            return self * rotation
-        return self.translated(-center).__mul__(rotation).translated(center)
+        m = self if center is None else self.translated(-center)
+        d = m.data
+        m = Matrix((
+            d[0]*cos - d[1]*sin, d[0]*sin + d[1]*cos, d[2], d[3],
+            d[4]*cos - d[5]*sin, d[4]*sin + d[5]*cos, d[6], d[7],
+            d[8]*cos - d[9]*sin, d[8]*sin + d[9]*cos, d[10], d[11],
+            d[12]*cos - d[13]*sin, d[12]*sin + d[13]*cos, d[14], d[15]))
+        return m if center is None else m.translated(center)
 
     def translated(self, vector):
-        return self * Matrix((
-            1.0, 0.0, 0.0, 0.0,
-            0.0, 1.0, 0.0, 0.0,
-            0.0, 0.0, 1.0, 0.0,
-            vector.x, vector.y, vector.z, 1.0))
+        #     1.0, 0.0, 0.0, 0.0,
+        #     0.0, 1.0, 0.0, 0.0,
+        #     0.0, 0.0, 1.0, 0.0,
+        #     x,   y,   z,   1.0
+        d = self.data
+        x = vector.x
+        y = vector.y
+        z = vector.z
+
+        if self.isAffine():
+            # Only the translation changes
+            return Matrix(d[:12] + (d[12] + x, d[13] + y, d[14] + z, d[15]))
+
+        return Matrix((
+            d[0] + d[3]*x, d[1] + d[3]*y, d[2] + d[3]*z, d[3],
+            d[4] + d[7]*x, d[5] + d[7]*y, d[6] + d[7]*z, d[7],
+            d[8] + d[11]*x, d[9] + d[11]*y, d[10] + d[11]*z, d[11],
+            d[12] + d[15]*x, d[13] + d[15]*y, d[14] + d[15]*z, d[15]))
+
+    def transformMany(self, vectors):
+        """Return the transformed vectors, like Vector.transformed."""
+        m = self.data
+        m0, m1, m2, m4, m5, m6, m8, m9, m10, m12, m13, m14 = (
+            m[0], m[1], m[2], m[4], m[5], m[6], m[8], m[9], m[10], m[12], m[13], m[14])
+        return [Vector(
+            v.x*m0 + v.y*m4 + v.z*m8 + m12,
+            v.x*m1 + v.y*m5 + v.z*m9 + m13,
+            v.x*m2 + v.y*m6 + v.z*m10 + m14) for v in vectors]
+
+    def transformTriangles(self, triangles):
+        """Return the transformed triangles, like Triangle.transformed.
+
+        Vertexes that are shared by several triangles are only
+        transformed once, and remain shared.
+        """
+        vectors = {}
+        for t in triangles:
+            for v in t.a, t.b, t.c:
+                vectors[id(v)] = v
+        transformed = dict(zip(vectors, self.transformMany(vectors.values())))
+        return [Triangle(
+            transformed[id(t.a)],
+            transformed[id(t.b)],
+            transformed[id(t.c)]) for t in triangles]
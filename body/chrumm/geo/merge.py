@@ -0,0 +1,248 @@
+import math
+
+from .epsilon import EPSILON
+from .epsilon import isZero
+from .face import Face
+from .weld import VertexWelder
+
+
+def mergeCoplanar(triangles, maxAngle=0.0):
+    """Merge coplanar triangles and triangulate each region again.
+
+    The triangles must form closed, consistently oriented surfaces.
+    Edge-connected triangles whose normals deviate less than maxAngle
+    from the first triangle of their region are merged. Vertexes inside
+    a region are removed. A vertex on a straight border between exactly
+    two regions is removed from both, so that no T-junctions occur.
+    Regions that cannot be triangulated reliably are kept as they are.
+
+    Args:
+        triangles (list[Triangle])
+        maxAngle (float): Maximum normal deviation in radians.
+    Returns:
+        list[Triangle]
+    """
+    welder = VertexWelder()
+    indexes = welder.addTriangles(triangles)
+    vectors = welder.vectors
+    maxCos = math.cos(maxAngle)
+
+    # Half-edges map each directed vertex pair to their triangle.
+    # The twin of a half-edge is the reversed pair.
+    halfEdges = {}
+    for t, (i, j, k) in enumerate(indexes):
+        for edge in (i, j), (j, k), (k, i):
+            if edge in halfEdges:
+                return list(triangles)
+            halfEdges[edge] = t
+
+    for i, j in halfEdges:
+        if (j, i) not in halfEdges:
+            return list(triangles)
+
+    normals = []
+    for triangle in triangles:
+        normals.append(triangle.normal() if triangle else None)
+
+    # Vertexes that are represented by more than one exact coordinate
+    # must not be moved to a new triangle, to avoid tiny cracks
+    keys = {}
+    fuzzy = set()
+    for triangle, tIndexes in zip(triangles, indexes):
+        for vector, index in zip((triangle.a, triangle.b, triangle.c), tIndexes):
+            key = (vector.x, vector.y, vector.z)
+            if keys.setdefault(index, key) != key:
+                fuzzy.add(index)
+
+    regions = _growRegions(indexes, halfEdges, vectors, normals, maxCos)
+    regionOf = [0] * len(triangles)
+    for r, region in enumerate(regions):
+        for t in region:
+            regionOf[t] = r
+
+    # A failed region keeps its triangles, so its vertexes must be kept
+    # by the neighboring regions as well. Repeat until nothing fails.
+    pinned = set(fuzzy)
+    for t, normal in enumerate(normals):
+        if normal is None:
+            pinned.update(indexes[t])
+
+    kept = set()
+    while True:
+        removable = _findRemovable(indexes, regionOf, halfEdges, vectors, pinned)
+        results = {}
+        isFailed = False
+        for r, region in enumerate(regions):
+            if r in kept or len(region) == 1:
+                continue
+            result = _triangulateRegion(
+                region, triangles, indexes, regionOf, halfEdges, vectors, removable)
+            if result is None:
+                kept.add(r)
+                pinned.update(v for t in region for v in indexes[t])
+                isFailed = True
+            else:
+                results[r] = result
+        if not isFailed:
+            break
+
+    merged = []
+    for r, region in enumerate(regions):
+        if r in results:
+            merged.extend(results[r])
+        else:
+            merged.extend(triangles[t] for t in region)
+    return merged
+
+
+def _growRegions(indexes, halfEdges, vectors, normals, maxCos):
+    """Return the lists of triangle indexes of coplanar regions.
+
+    A triangle joins a region, if its normal is within the angle of
+    the first normal, or if its vertexes are within epsilon of the
+    first plane, so that exactly coplanar triangles are always merged.
+    """
+    regions = []
+    isAssigned = [False] * len(indexes)
+
+    for seed in range(len(indexes)):
+        if isAssigned[seed]:
+            continue
+        isAssigned[seed] = True
+        region = [seed]
+        normal = normals[seed]
+        origin = vectors[indexes[seed][0]]
+
+        if normal is not None:
+            stack = [seed]
+            while stack:
+                i, j, k = indexes[stack.pop()]
+                for edge in (j, i), (k, j), (i, k):
+                    t = halfEdges.get(edge)
+                    if t is None or isAssigned[t] or normals[t] is None:
+                        continue
+                    dot = normals[t].dot(normal)
+                    if dot >= maxCos or dot > 0 and all(
+                            isZero((vectors[v] - origin).dot(normal)) for v in indexes[t]):
+                        isAssigned[t] = True
+                        region.append(t)
+                        stack.append(t)
+
+        regions.append(region)
+
+    return regions
+
+
+def _findRemovable(indexes, regionOf, halfEdges, vectors, pinned):
+    """Return the vertexes that are inside a region or on a straight border."""
+    # Collect the regions and border neighbors of each vertex
+    vertexRegions = {}
+    borders = {}
+    for t, (i, j, k) in enumerate(indexes):
+        for a, b in (i, j), (j, k), (k, i):
+            vertexRegions.setdefault(a, set()).add(regionOf[t])
+            twin = halfEdges.get((b, a))
+            if twin is None or regionOf[twin] != regionOf[t]:
+                borders.setdefault(a, []).append(b)
+                borders.setdefault(b, []).append(a)
+
+    removable = set()
+    for v, regions in vertexRegions.items():
+        if v in pinned:
+            continue
+        if len(regions) == 1 and v not in borders:
+            removable.add(v)
+        elif len(regions) == 2 and len(borders.get(v, ())) == 4:
+            # Two regions border on each other along the same two edges
+            neighbors = set(borders[v])
+            if len(neighbors) != 2:
+                continue
+            p, n = (vectors[i] for i in neighbors)
+            vector = vectors[v]
+            pn = n - p
+            pv = vector - p
+            if pn.dot(pv) <= 0 or pn.dot(vector - n) >= 0:
+                continue
+            if pn.cross(pv).magnitude() / pn.magnitude() < EPSILON:
+                removable.add(v)
+
+    return removable
+
+
+def _triangulateRegion(region, triangles, indexes, regionOf, halfEdges, vectors, removable):
+    """Return the new triangles of a region, or None if that failed."""
+    r = regionOf[region[0]]
+
+    # Border half-edges form the loops of the region polygon
+    nextVertex = {}
+    isReduced = False
+    for t in region:
+        i, j, k = indexes[t]
+        for a, b in (i, j), (j, k), (k, i):
+            twin = halfEdges.get((b, a))
+            if twin is None or regionOf[twin] != r:
+                if a in nextVertex:
+                    return None
+                nextVertex[a] = b
+            isReduced = isReduced or a in removable
+
+    if not isReduced:
+        return [triangles[t] for t in region]
+
+    loops = []
+    while nextVertex:
+        start, b = nextVertex.popitem()
+        loop = [start]
+        while b != start:
+            loop.append(b)
+            b = nextVertex.pop(b, None)
+            if b is None:
+                return None
+        loop = [vectors[v] for v in loop if v not in removable]
+        if len(loop) < 3:
+            return None
+        loops.append(loop)
+
+    # The outer loop is counterclockwise around the normal
+    normal = triangles[region[0]].normal()
+    areas = [_signedArea(loop, normal) for loop in loops]
+    outer = [loop for loop, area in zip(loops, areas) if area > 0]
+    if len(outer) != 1:
+        return None
+    holes = [loop for loop, area in zip(loops, areas) if area <= 0]
+
+    try:
+        result = Face(outer[0], holes).triangulate()
+    except (ArithmeticError, ValueError):
+        return None
+
+    # Reject anything that does not cover the same projected area
+    # with the same orientation and a minimal number of triangles
+    expectedCount = sum(len(loop) for loop in loops) - 2 + 2*len(holes)
+    if len(result) != expectedCount or len(result) >= len(region):
+        return None
+    for triangle in result:
+        if not triangle or triangle.normal().dot(normal) <= 0:
+            return None
+    oldArea = sum(_projectedArea(triangles[t], normal) for t in region)
+    newArea = sum(_projectedArea(t, normal) for t in result)
+    if not isZero(newArea - oldArea):
+        return None
+
+    return result
+
+
+def _signedArea(loop, normal):
+    """Return the area of a planar loop, which is positive if counterclockwise."""
+    x = y = z = 0
+    for i in range(len(loop)):
+        p = loop[i-1]
+        q = loop[i]
+        x += p.y*q.z - p.z*q.y
+        y += p.z*q.x - p.x*q.z
+        z += p.x*q.y - p.y*q.x
+    return (x*normal.x + y*normal.y + z*normal.z) / 2
+
+
+def _projectedArea(triangle, normal):
+    return (triangle.b - triangle.a).cross(triangle.c - triangle.a).dot(normal) / 2
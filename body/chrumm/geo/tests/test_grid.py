@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from ..edge import Edge
+from ..grid import PolygonIndex
+from ..grid import SegmentGrid
+from ..vector import Vector
+
+
+class SegmentGridTest(unittest.TestCase):
+
+    def test_near2D(self):
+        edge = Edge(Vector(0, 0), Vector(4, 0), Vector(4, 4), Vector(0, 4))
+        grid = SegmentGrid(edge.toSegments(True), 1)
+
+        self.assertEqual(grid.near2D(-1, -1, 5, 5), [0, 1, 2, 3])
+        self.assertEqual(grid.near2D(1.5, -0.5, 2.5, 0.5), [0])
+        self.assertEqual(grid.near2D(3.5, 3.5, 5, 5), [1, 2])
+        self.assertEqual(grid.near2D(1.5, 1.5, 2.5, 2.5), [])
+        self.assertEqual(grid.near2D(10, 10, 11, 11), [])
+
+    def test_distance2D(self):
+        grid = SegmentGrid([])
+        self.assertEqual(grid.distance2D(Vector()), float("inf"))
+
+        # Compare with a linear scan
+        rand = random.Random(0)
+        edge = Edge(Vector(rand.uniform(-9, 9), rand.uniform(-9, 9)) for _ in range(50))
+        segments = edge.toSegments(True)
+
+        for cellSize in None, 0.5, 20:
+            grid = SegmentGrid(segments, cellSize)
+            for _ in range(50):
+                vector = Vector(rand.uniform(-12, 12), rand.uniform(-12, 12))
+                expected = min(s.distance2D(vector) for s in segments)
+                self.assertEqual(grid.distance2D(vector), expected)
+
+
+class PolygonIndexTest(unittest.TestCase):
+
+    def test_queries(self):
+        rand = random.Random(0)
+        vectors = [Vector(rand.randint(-9, 9), rand.randint(-9, 9)) for _ in range(30)]
+        edge = Edge(vectors)
+        segments = edge.toSegments(True)
+        index = PolygonIndex(vectors)
+
+        # Compare with a linear scan, including queries at vertex heights
+        for _ in range(200):
+            vector = Vector(rand.uniform(-10, 10), rand.choice([rand.uniform(-10, 10), 3, 9]))
+            self.assertEqual(index.contains2D(vector), edge.containsMany2D([vector])[0])
+            self.assertEqual(index.distance2D(vector), min(s.distance2D(vector) for s in segments))
@@ -58,3 +58,13 @@ class LineTest(unittest.TestCase):
         lineX = Line(Vector(0, 0, 0), Vector(1, 0, 0))
         lineY = Line(Vector(0, 0, 2), Vector(0, 1, 0))
         self.assertEqual(lineX.intersect(lineY), Vector(0, 0, 1))
+
+    def test_intersectMany(self):
+        lines = [
+            Line(Vector(0, 0, 2), Vector(0, 1, 0)),
+            Line(Vector(1, 1, 3), Vector(0.2, 1, -0.1))]
+        self.assertEqual(LINE.intersectMany(lines), [LINE.intersect(line) for line in lines])
+        self.assertEqual(LINE.intersectMany([]), [])
+
+        with self.assertRaises(ZeroDivisionError):
+            LINE.intersectMany([LINE])
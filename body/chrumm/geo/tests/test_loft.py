@@ -0,0 +1,52 @@
+import math
+import unittest
+
+from ..edge import Edge
+from ..loft import loft
+from ..vector import Vector
+
+
+class LoftTest(unittest.TestCase):
+
+    def test_loft(self):
+        self.assertEqual(loft([]), [])
+        self.assertEqual(loft([Edge(Vector(), Vector(1))]), [])
+        self.assertEqual(loft([Edge(), Edge(Vector())]), [])
+
+        # A cone with a tip, two rings and a cap
+        rings = [Edge(Vector())]
+        for z in 1, 2:
+            rings.append(Edge(
+                Vector(math.cos(a/8*math.tau)*z, math.sin(a/8*math.tau)*z, z)
+                for a in range(8)))
+        rings.append(Edge(Vector(0, 0, 2)))
+
+        tris = loft(rings, True)
+        self.assertEqual(len(tris), 8 + 16 + 8)
+        area = sum(t.area() for t in tris)
+        self.assertTrue(all(tris))
+
+        # Same triangles and order as meshing each pair separately
+        expected = []
+        for i in range(len(rings) - 1):
+            expected.extend(rings[i].meshPairwise(rings[i+1], True))
+        for tri, other in zip(tris, expected):
+            self.assertEqual((tri.a, tri.b, tri.c), (other.a, other.b, other.c))
+
+        # Reversed strips flip the surface
+        tris = loft(rings, True, True)
+        expected = []
+        for i in range(len(rings) - 1):
+            expected.extend(rings[i+1].meshPairwise(rings[i], True))
+        self.assertEqual(len(tris), len(expected))
+        for tri, other in zip(tris, expected):
+            self.assertEqual((tri.a, tri.b, tri.c), (other.a, other.b, other.c))
+        self.assertAlmostEqual(sum(t.area() for t in tris), area)
+
+        # Open polylines of different lengths
+        rings = [
+            [Vector(0, 0, 0), Vector(1, 0, 0), Vector(2, 0, 0)],
+            [Vector(0, 1, 0), Vector(2, 1, 0)]]
+        tris = loft(rings)
+        self.assertEqual(len(tris), 3)
+        self.assertAlmostEqual(sum(t.area() for t in tris), 2)
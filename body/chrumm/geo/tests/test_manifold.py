@@ -0,0 +1,46 @@
+import unittest
+
+from ..manifold import findMeshProblems
+from ..triangle import Triangle
+from ..vector import Vector
+
+
+A = Vector(0, 0, 0)
+B = Vector(1, 0, 0)
+C = Vector(0, 1, 0)
+D = Vector(0, 0, 1)
+
+TETRAHEDRON = [
+    Triangle(A, C, B),
+    Triangle(A, B, D),
+    Triangle(B, C, D),
+    Triangle(C, A, D)]
+
+
+class ManifoldTest(unittest.TestCase):
+
+    def test_findMeshProblems(self):
+        self.assertEqual(findMeshProblems([]), [])
+        self.assertEqual(findMeshProblems(TETRAHEDRON), [])
+
+        # Vertexes are welded within epsilon
+        triangles = TETRAHEDRON[:3] + [Triangle(C, A, D + Vector(1e-7))]
+        self.assertEqual(findMeshProblems(triangles), [])
+
+        # Missing triangle
+        problems = findMeshProblems(TETRAHEDRON[:3])
+        self.assertEqual(sorted(p[0] for p in problems), ["Open edge"]*3)
+
+        # Flipped triangle
+        triangles = TETRAHEDRON[:3] + [TETRAHEDRON[3].reversed()]
+        problems = findMeshProblems(triangles)
+        self.assertEqual(sorted(p[0] for p in problems), ["Inconsistently oriented edge"]*3)
+
+        # Duplicate triangle
+        problems = findMeshProblems(TETRAHEDRON + TETRAHEDRON[:1])
+        self.assertEqual(sorted(p[0] for p in problems), ["Non-manifold edge"]*3)
+        self.assertTrue(all(a in (A, B, C) and b in (A, B, C) for _, a, b in problems))
+
+        # Degenerate triangle
+        problems = findMeshProblems(TETRAHEDRON + [Triangle(A, A, B)])
+        self.assertEqual(problems, [("Degenerate triangle", A, A)])
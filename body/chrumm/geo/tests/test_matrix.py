@@ -1,8 +1,10 @@
+import math
 import unittest
 
 from math import pi as PI
 
 from ..matrix import Matrix
+from ..triangle import Triangle
 from ..vector import Vector
 
 
@@ -46,6 +48,67 @@ class MatrixTest(unittest.TestCase):
         self.assertEqual((MAT_ODD * MAT_ZERO).data, MAT_ZERO.data)
         self.assertEqual((MAT_ODD * MAT_EVEN).data, oddMulEven)
 
+    def test_mulAffine(self):
+        a = Matrix().rotatedX(0.3).translated(Vector(1, 2, 3))
+        b = Matrix().rotatedZ(1.1).mirroredY().translated(Vector(-4, 5, 6))
+        self.assertTrue(a.isAffine())
+        self.assertTrue(b.isAffine())
+        self.assertFalse(MAT_ODD.isAffine())
+
+        product = (a * b).data
+        for r in range(4):
+            for c in range(4):
+                expected = sum(a.data[r*4 + k] * b.data[k*4 + c] for k in range(4))
+                self.assertAlmostEqual(product[r*4 + c], expected)
+
+    def test_composed(self):
+        # Compositions must equal the multiplication with a
+        # temporary matrix, also if the matrix is not affine
+        cos = PI**0.5 / 2
+        sin = (1 - cos*cos)**0.5
+        angle = math.acos(cos)
+        compositions = [
+            (MAT_ODD.mirroredX(), (
+                -1, 0, 0, 0,
+                0, 1, 0, 0,
+                0, 0, 1, 0,
+                0, 0, 0, 1)),
+            (MAT_ODD.mirroredY(), (
+                1, 0, 0, 0,
+                0, -1, 0, 0,
+                0, 0, 1, 0,
+                0, 0, 0, 1)),
+            (MAT_ODD.mirroredZ(), (
+                1, 0, 0, 0,
+                0, 1, 0, 0,
+                0, 0, -1, 0,
+                0, 0, 0, 1)),
+            (MAT_ODD.rotatedX(angle), (
+                1, 0, 0, 0,
+                0, cos, sin, 0,
+                0, -sin, cos, 0,
+                0, 0, 0, 1)),
+            (MAT_ODD.rotatedY(angle), (
+                cos, 0, -sin, 0,
+                0, 1, 0, 0,
+                sin, 0, cos, 0,
+                0, 0, 0, 1)),
+            (MAT_ODD.rotatedZ(angle), (
+                cos, sin, 0, 0,
+                -sin, cos, 0, 0,
+                0, 0, 1, 0,
+                0, 0, 0, 1)),
+            (MAT_ODD.translated(Vector(1, 2, 3)), (
+                1, 0, 0, 0,
+                0, 1, 0, 0,
+                0, 0, 1, 0,
+                1, 2, 3, 1))]
+
+        for composed, other in compositions:
+            expected = (MAT_ODD * Matrix(other)).data
+            for a, b in zip(composed.data, expected):
+                self.assertAlmostEqual(a, b)
+
     def test_mirroredX(self):
         matrix = Matrix().mirroredX()
         self.assertEqual(Vector(1, 2, 3).transformed(matrix), Vector(-1, 2, 3))
@@ -109,3 +172,28 @@ class MatrixTest(unittest.TestCase):
     def test_translated(self):
         matrix = Matrix().translated(Vector(1, 2, 3))
         self.assertEqual(Vector(1, 2, 3).transformed(matrix), Vector(2, 4, 6))
+
+        matrix = Matrix().rotatedZ(1).translated(Vector(1, 2, 3))
+        self.assertEqual(matrix.translated(Vector(-1, -2, -3)).data, Matrix().rotatedZ(1).data)
+
+    def test_transformMany(self):
+        matrix = Matrix().rotatedY(0.7).translated(Vector(1, 2, 3))
+        vectors = [Vector(1, 2, 3), Vector(-4, 5, 6)]
+        self.assertEqual(matrix.transformMany(vectors), [v.transformed(matrix) for v in vectors])
+        self.assertEqual(matrix.transformMany([]), [])
+
+    def test_transformTriangles(self):
+        matrix = Matrix().rotatedY(0.7).translated(Vector(1, 2, 3))
+        a = Vector(1, 2, 3)
+        b = Vector(4, 5, 6)
+        c = Vector(7, 8, 0)
+        d = Vector(1, 0, 1)
+        triangles = matrix.transformTriangles([Triangle(a, b, c), Triangle(c, b, d)])
+
+        for triangle, vectors in zip(triangles, [(a, b, c), (c, b, d)]):
+            transformed = (triangle.a, triangle.b, triangle.c)
+            self.assertEqual(transformed, tuple(v.transformed(matrix) for v in vectors))
+
+        # Shared vertexes remain shared
+        self.assertIs(triangles[0].b, triangles[1].b)
+        self.assertIs(triangles[0].c, triangles[1].a)
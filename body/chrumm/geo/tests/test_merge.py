@@ -0,0 +1,73 @@
+import math
+import unittest
+
+from ..manifold import findMeshProblems
+from ..merge import mergeCoplanar
+from ..triangle import Triangle
+from ..vector import Vector
+
+
+def _subdividedCube():
+    """Return a unit cube with 8 triangles per side."""
+    triangles = []
+    for axis in range(3):
+        for side in 0, 1:
+            def point(u, v):
+                coords = [u, v]
+                coords.insert(axis, side)
+                return Vector(*coords)
+            for u in 0, 0.5:
+                for v in 0, 0.5:
+                    a = point(u, v)
+                    b = point(u + 0.5, v)
+                    c = point(u + 0.5, v + 0.5)
+                    d = point(u, v + 0.5)
+                    triangles.append(Triangle(a, b, c))
+                    triangles.append(Triangle(a, c, d))
+
+    # Orient all triangles outward
+    center = Vector(0.5, 0.5, 0.5)
+    return [t if t.normal().dot(t.a - center) > 0 else t.reversed() for t in triangles]
+
+
+def _volume(triangles):
+    return sum(t.a.dot(t.b.cross(t.c)) for t in triangles) / 6
+
+
+class MergeTest(unittest.TestCase):
+
+    def test_mergeCoplanar(self):
+        cube = _subdividedCube()
+        self.assertEqual(findMeshProblems(cube), [])
+
+        merged = mergeCoplanar(cube)
+        self.assertEqual(len(merged), 12)
+        self.assertEqual(findMeshProblems(merged), [])
+        self.assertAlmostEqual(_volume(merged), 1)
+
+        # Only the corners remain
+        for triangle in merged:
+            for p in triangle.a, triangle.b, triangle.c:
+                self.assertIn(p.x, (0, 1))
+                self.assertIn(p.y, (0, 1))
+                self.assertIn(p.z, (0, 1))
+
+    def test_mergeCoplanar_angle(self):
+        # Lift the center of the top side
+        cube = []
+        for t in _subdividedCube():
+            cube.append(Triangle(*(
+                p + Vector(0, 0, 0.01) if p == Vector(0.5, 0.5, 1) else p
+                for p in (t.a, t.b, t.c))))
+
+        merged = mergeCoplanar(cube)
+        self.assertGreater(len(merged), 12)
+        self.assertEqual(findMeshProblems(merged), [])
+
+        merged = mergeCoplanar(cube, math.radians(5))
+        self.assertEqual(len(merged), 12)
+        self.assertEqual(findMeshProblems(merged), [])
+
+    def test_mergeCoplanar_open(self):
+        cube = _subdividedCube()[1:]
+        self.assertEqual(mergeCoplanar(cube), cube)
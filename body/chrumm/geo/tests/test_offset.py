@@ -0,0 +1,51 @@
+import unittest
+
+from ..edge import Edge
+from ..offset import offset2D
+from ..vector import Vector
+
+
+EDGE_SQUARE = Edge(Vector(0, 0), Vector(4, 0), Vector(4, 4), Vector(0, 4))
+
+
+class OffsetTest(unittest.TestCase):
+
+    def test_offset2D(self):
+        self.assertIs(offset2D(EDGE_SQUARE, 0), EDGE_SQUARE)
+
+        # Grow closed
+        edge = offset2D(EDGE_SQUARE, 1, True)
+        self.assertEqual(len(edge), 4)
+        self.assertTrue(edge[0].isClose(Vector(-1, -1)))
+        self.assertTrue(edge[2].isClose(Vector(5, 5)))
+
+        # Shrink closed
+        edge = offset2D(EDGE_SQUARE, -1, True)
+        self.assertEqual(len(edge), 4)
+        self.assertTrue(edge[0].isClose(Vector(1, 1)))
+        self.assertTrue(edge[2].isClose(Vector(3, 3)))
+
+        # Shrink open, the closing segment is kept in place
+        edge = offset2D(EDGE_SQUARE, -1)
+        self.assertEqual(len(edge), 4)
+        self.assertTrue(edge[0].isClose(Vector(0, 1)))
+        self.assertTrue(edge[3].isClose(Vector(0, 3)))
+
+    def test_offset2D_loop(self):
+        # The tab is narrower than the offset and is cut off
+        edge = Edge(
+            Vector(0, 0),
+            Vector(10, 0),
+            Vector(10, 10),
+            Vector(5.5, 10),
+            Vector(5.5, 14),
+            Vector(4.5, 14),
+            Vector(4.5, 10),
+            Vector(0, 10))
+        offset = offset2D(edge, -1, True)
+
+        self.assertTrue(offset[0].isClose(Vector(1, 1)))
+        for point in offset:
+            self.assertLessEqual(point.y, 9 + 1e-6)
+            distance = min(s.distance2D(point) for s in edge.toSegments(True))
+            self.assertAlmostEqual(distance, 1)
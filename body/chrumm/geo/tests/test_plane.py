@@ -101,3 +101,20 @@ class PlaneTest(unittest.TestCase):
         line = Line(Vector(2, 3, 4), Vector(1, -1, 0))
         with self.assertRaises(ZeroDivisionError):
             PLANE.intersect(line)
+
+    def test_intersectLines(self):
+        lines = [
+            Line(Vector(2, 3, 4), Vector(1, 1, 1)),
+            Line(Vector(0, 5, 7), Vector(0.1, -0.3, 1))]
+        self.assertEqual(PLANE.intersectLines(lines), [PLANE.intersect(line) for line in lines])
+        self.assertEqual(PLANE.intersectLines([]), [])
+
+        lines.append(Line(Vector(2, 3, 4), Vector(1, -1, 0)))
+        with self.assertRaises(ZeroDivisionError):
+            PLANE.intersectLines(lines)
+
+    def test_projectMany(self):
+        direction = Vector(0.1, -0.3, 2)
+        vectors = [Vector(2, 3, 4), Vector(0, 5, 7)]
+        expected = [PLANE.intersect(Line(v, direction)) for v in vectors]
+        self.assertEqual(PLANE.projectMany(vectors, direction), expected)
@@ -0,0 +1,62 @@
+import unittest
+
+from ..edge import Edge
+from ..face import Face
+from ..simplify import simplifyFaces
+from ..triangle import Triangle
+from ..vector import Vector
+
+
+class SimplifyTest(unittest.TestCase):
+
+    def test_simplified(self):
+        edge = Edge(
+            Vector(0, 0),
+            Vector(1, 0.001),
+            Vector(2, 0),
+            Vector(2, 1),
+            Vector(2, 2),
+            Vector(1, 2.5),
+            Vector(0, 2))
+
+        self.assertEqual(Edge().simplified(1), Edge())
+        self.assertEqual(edge.simplified(0), Edge(edge[:3], edge[4:]))
+        self.assertEqual(edge.simplified(0.01), Edge(edge[0], edge[2], edge[4], edge[5], edge[6]))
+        self.assertEqual(edge.simplified(1), Edge(edge[0], edge[2], edge[4], edge[6]))
+        self.assertEqual(edge.simplified(3), Edge(edge[0], edge[6]))
+
+        # Closed
+        self.assertEqual(edge.simplified(0.01, isClosed=True), Edge(
+            edge[0], edge[2], edge[4], edge[5], edge[6]))
+        self.assertEqual(edge.simplified(3, isClosed=True), Edge(edge[0], edge[4]))
+
+        # Pinned
+        pinned = {(1, 0.001, 0), (2, 1, 0)}
+        self.assertEqual(edge.simplified(0.01, pinned, True), Edge(
+            edge[0], edge[1], edge[2], edge[3], edge[4], edge[5], edge[6]))
+
+        # Reversed order yields the same points
+        reversedEdge = edge.reversed()
+        for tolerance in 0.01, 1, 3:
+            self.assertEqual(
+                sorted(edge.simplified(tolerance, isClosed=True)),
+                sorted(reversedEdge.simplified(tolerance, isClosed=True)))
+
+    def test_simplifyFaces(self):
+        #  3---4---5
+        #  |   |   |
+        #  2   7   6
+        #  |   |   |
+        #  1---0---8
+        p = [Vector(1, 0), Vector(0, 0), Vector(0, 1), Vector(0, 2),
+             Vector(1, 2), Vector(2, 2), Vector(2, 1), Vector(1, 1), Vector(2, 0)]
+        faceL = Face(Edge(p[0], p[7], p[4], p[3], p[2], p[1]))
+        faceR = Face(Edge(p[0], p[8], p[6], p[5], p[4], p[7]))
+
+        # Points shared with triangles are kept
+        triangle = Triangle(p[1], p[2], Vector(-1, 1))
+        removedCount = simplifyFaces([faceL, faceR], [triangle], 0.1)
+
+        self.assertEqual(removedCount, 3)
+        self.assertEqual(faceL.edge, Edge(p[0], p[4], p[3], p[2], p[1]))
+        self.assertEqual(faceR.edge, Edge(p[0], p[8], p[5], p[4]))
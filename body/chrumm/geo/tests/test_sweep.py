@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from ..segment import Segment
+from ..sweep import findIntersection2D
+from ..vector import Vector
+
+
+SQUARE = [Vector(0, 0), Vector(4, 0), Vector(4, 4), Vector(0, 4)]
+
+
+class SweepTest(unittest.TestCase):
+
+    def test_findIntersection2D(self):
+        self.assertIsNone(findIntersection2D([]))
+        self.assertIsNone(findIntersection2D([SQUARE]))
+
+        # Bow tie
+        loop = [Vector(0, 0), Vector(4, 4), Vector(4, 0), Vector(0, 4)]
+        self.assertEqual(findIntersection2D([loop]), ((0, 0), (0, 2)))
+
+        # Spike that folds back onto the previous segment
+        loop = [Vector(0, 0), Vector(4, 0), Vector(2, 0), Vector(2, 4)]
+        self.assertIsNotNone(findIntersection2D([loop]))
+
+        # Hole touching the edge at a point
+        hole = [Vector(2, 2), Vector(4, 2), Vector(3, 3)]
+        self.assertEqual(findIntersection2D([SQUARE, hole]), ((0, 1), (1, 0)))
+
+        # Separate and overlapping holes
+        hole0 = [Vector(1, 1), Vector(1, 2), Vector(2, 2), Vector(2, 1)]
+        hole1 = [Vector(3, 1), Vector(3, 2), Vector(3.5, 2)]
+        self.assertIsNone(findIntersection2D([SQUARE, hole0, hole1]))
+        hole1 = [Vector(1.5, 1.5), Vector(1.5, 3), Vector(3, 3)]
+        self.assertIsNotNone(findIntersection2D([SQUARE, hole0, hole1]))
+
+    def test_findIntersection2D_random(self):
+        # Compare with a brute force search for any intersection
+        rand = random.Random(0)
+        for _ in range(200):
+            loop = [Vector(rand.randint(0, 9), rand.randint(0, 9)) for _ in range(6)]
+            if len(set((p.x, p.y) for p in loop)) < len(loop):
+                continue
+            segments = [Segment(loop[i-1], loop[i]) for i in range(len(loop))]
+            isExpected = any(
+                _isIntersecting(segments[i], segments[j], j - i in (1, len(loop) - 1))
+                for i in range(len(loop)) for j in range(i + 1, len(loop)))
+            self.assertEqual(findIntersection2D([loop]) is not None, isExpected, loop)
+
+
+def _isIntersecting(s, t, isAdjacent):
+    """Check a pair of segments without the sweep line."""
+    def orientation(a, b, c):
+        return (b.x - a.x)*(c.y - a.y) - (b.y - a.y)*(c.x - a.x)
+
+    def isOn(p, seg):
+        return (orientation(seg.a, seg.b, p) == 0 and
+                min(seg.a.x, seg.b.x) <= p.x <= max(seg.a.x, seg.b.x) and
+                min(seg.a.y, seg.b.y) <= p.y <= max(seg.a.y, seg.b.y))
+
+    shared = [p for p in (s.a, s.b) if p in (t.a, t.b)]
+    if isAdjacent and shared:
+        sFar = s.b if s.a == shared[0] else s.a
+        tFar = t.b if t.a == shared[0] else t.a
+        return isOn(sFar, t) or isOn(tFar, s)
+
+    if isOn(s.a, t) or isOn(s.b, t) or isOn(t.a, s) or isOn(t.b, s):
+        return True
+    return s.intersect2D(t) is not None
@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from ..triangle import Triangle
+from ..vector import Vector
+from ..weld import VertexWelder
+
+
+class VertexWelderTest(unittest.TestCase):
+
+    def test_add(self):
+        welder = VertexWelder()
+        self.assertEqual(welder.add(Vector(1, 2, 3)), 0)
+        self.assertEqual(welder.add(Vector(1, 2, 3)), 0)
+        self.assertEqual(welder.add(Vector(1, 2, 3 + 0.9e-6)), 0)
+        self.assertEqual(welder.add(Vector(1, 2, 3 + 1.1e-6)), 1)
+        self.assertEqual(welder.add(Vector(1, 2, 3 + 1.9e-6)), 1)
+        self.assertEqual(len(welder), 2)
+
+        # The first vector represents its index
+        self.assertEqual(welder.vectors[0], Vector(1, 2, 3))
+
+        # Cell boundaries
+        welder = VertexWelder()
+        self.assertEqual(welder.add(Vector(-0.1e-6, 0, 0)), 0)
+        self.assertEqual(welder.add(Vector(0.1e-6, 0, 0)), 0)
+        self.assertEqual(welder.add(Vector(0.1e-6, 0.99e-6, -0.99e-6)), 0)
+
+    def test_add_random(self):
+        # Compare with a linear search
+        rand = random.Random(0)
+        welder = VertexWelder()
+        vectors = []
+        for _ in range(500):
+            vector = Vector(*(rand.randint(0, 20)*0.4e-6 for _ in range(3)))
+            expected = None
+            for i, v in enumerate(vectors):
+                if v.isClose(vector):
+                    expected = i
+                    break
+            if expected is None:
+                expected = len(vectors)
+                vectors.append(vector)
+            self.assertEqual(welder.add(vector), expected)
+
+    def test_addTriangles(self):
+        a = Vector(0, 0, 0)
+        b = Vector(1, 0, 0)
+        c = Vector(0, 1, 0)
+        d = Vector(1, 1, 0)
+        triangles = [Triangle(a, b, c), Triangle(c, b + Vector(0, 1e-7), d)]
+        welder = VertexWelder()
+        self.assertEqual(welder.addTriangles(triangles), [(0, 1, 2), (2, 1, 3)])
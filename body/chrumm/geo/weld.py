@@ -0,0 +1,60 @@
+import math
+
+from .epsilon import EPSILON
+
+
+class VertexWelder:
+    """Assign canonical indexes to vectors that are close to each other.
+
+    Vectors are hashed into cubic cells with the size of epsilon. A close
+    vector is in the same or in an adjacent cell, so that each lookup
+    checks 27 cells at most. An index represents the first added vector
+    within epsilon, as defined by Vector.isClose.
+    """
+
+    def __init__(self):
+        self.vectors = []
+        self._indexes = {}
+        self._cells = {}
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def add(self, vector):
+        """Return the index of the vector, which is added if it is new."""
+        key = (vector.x, vector.y, vector.z)
+        index = self._indexes.get(key)
+        if index is not None:
+            return index
+
+        cellX = math.floor(vector.x / EPSILON)
+        cellY = math.floor(vector.y / EPSILON)
+        cellZ = math.floor(vector.z / EPSILON)
+
+        # A vector may be close to more than one canonical
+        # vector. Use the lowest index to stay deterministic.
+        for x in cellX - 1, cellX, cellX + 1:
+            for y in cellY - 1, cellY, cellY + 1:
+                for z in cellZ - 1, cellZ, cellZ + 1:
+                    for i in self._cells.get((x, y, z), ()):
+                        if (index is None or i < index) and self.vectors[i].isClose(vector):
+                            index = i
+
+        if index is None:
+            index = len(self.vectors)
+            self.vectors.append(vector)
+            self._cells.setdefault((cellX, cellY, cellZ), []).append(index)
+
+        self._indexes[key] = index
+        return index
+
+    def addTriangles(self, triangles):
+        """Return the vertex indexes of each triangle.
+
+        Args:
+            triangles (list[Triangle])
+        Returns:
+            list[tuple[int, int, int]]
+        """
+        add = self.add
+        return [(add(t.a), add(t.b), add(t.c)) for t in triangles]
@@ -1,10 +1,25 @@
+import functools
+import json
 import logging
+import math
 import multiprocessing
+import signal
+import time
 
 from chrumm import __version__
 from chrumm import cfg
 from chrumm import pcb
 from chrumm import stl
+from chrumm import trace
+
+from chrumm.profiling import profileCall
+from chrumm.report import peakRss
+from chrumm.report import stage
+
+from chrumm.geo import Triangle
+from chrumm.geo import findMeshProblems
+from chrumm.geo import mergeCoplanar
+from chrumm.geo import simplifyFaces
 
 from chrumm.part import Body
 from chrumm.part import Floor
@@ -12,88 +27,702 @@ from chrumm.part import Knob
 from chrumm.part import Palm
 from chrumm.part import Plan
 from chrumm.part import Support
+from chrumm.part import tessellation
+from chrumm.part import validation
+from chrumm.part.arc import arcCacheInfo
 
 
 log = logging.getLogger(__name__)
 
 
-def make(jsonStrings, threads, isKnobOnly):
+# Minimum tessellation parameters in preview mode
+PREVIEW_QUALITY = {
+    "quality.maxChordHeight": 0.2,
+    "quality.maxChordAngle": math.radians(45)}
+
+# Optional items that are omitted in preview mode, unless kept
+PREVIEW_ITEMS = ["hexHoles", "support"]
+
+# Parts that can be selected, and the sides of the keyboard parts
+PARTS = ["knob", "pcb", "body", "floor", "palm", "support"]
+SIDES = ["right", "left"]
+
+# Keyboard parts that are constructed from other parts of the same side.
+# Each of them is also constructed from the plan of its side.
+PART_DEPENDENCIES = {
+    "body": [],
+    "floor": ["body"],
+    "palm": [],
+    "support": []}
+
+# Top-level parameter sections that each part depends on, including
+# the sections of the plan. Dependencies of PART_DEPENDENCIES are added.
+PLAN_CFG = ["quality", "body", "boss", "floor", "layout", "palm", "support", "switch"]
+PART_CFG = {
+    "knob": ["quality", "knob"],
+    "pcb": PLAN_CFG + ["pcb"],
+    "body": PLAN_CFG + ["bracket", "cable", "encoder", "pcb"],
+    "floor": PLAN_CFG + ["bracket", "bumper", "cable"],
+    "palm": PLAN_CFG + ["bumper"],
+    "support": PLAN_CFG}
+
+# Maximum number of mesh problems that are logged per file
+MAX_LOGGED_PROBLEMS = 10
+
+# Coarsening steps to meet quality.maxTriangles
+BUDGET_SCALE_STEP = 4
+BUDGET_MAX_STEPS = 3
+
+
+def make(
+        jsonStrings, threads, isKnobOnly,
+        isPreview=False, isFinal=False, previewKeep=(), isValidating=False, isChecking=False,
+        parts=None, side=None, report=None):
     """Generate files, based on JSON configuration strings.
 
     Args:
         jsonStrings (list[str]): List of JSON strings.
         threads (int): Number of threads to use.
         isKnobOnly (bool): Generate the encoder knob only.
+        isPreview (bool): Generate coarse preview meshes, with a "-preview" file suffix.
+        isFinal (bool): Also generate the final meshes in preview mode.
+        previewKeep (list[str]): Items of PREVIEW_ITEMS to keep in preview mode.
+        isValidating (bool): Check the faces before triangulation.
+        isChecking (bool): Check if the meshes are watertight and manifold.
+        parts (list[str]): Items of PARTS to generate, or None for all.
+        side (str): Either "left" or "right" to generate the keyboard
+            parts of one side only, or None for both.
+        report (Report): Receives the time of each stage and the size
+            of each mesh, or None.
     Returns:
         dict[str, bytes|str]: A dict of file names and data.
     """
-    files = {}
+    with Session(threads) as session:
+        return session.make(
+            jsonStrings, isKnobOnly,
+            isPreview, isFinal, previewKeep, isValidating, isChecking, parts, side,
+            report=report)
 
-    # Parse parameters
 
-    log.info("Parsing configuration parameters...")
+def construct(jsonStrings, parts=None, isPreview=False):
+    """Construct the parts and validate their faces, without triangulation.
+
+    This takes a fraction of the time of make(), and raises the same
+    errors of the parameters and of the construction.
+
+    Args:
+        jsonStrings (list[str]): List of JSON strings.
+        parts (list[str]): Items of PARTS to construct, or None for all.
+        isPreview (bool): Construct with the coarse preview parameters.
+    Returns:
+        dict[str, Part]: The constructed keyboard parts of both sides.
+    """
     cfg._init(jsonStrings)
 
-    if cfg.maker != "chrumm " + __version__:
-        log.warning("The parameters are intended for %s", cfg.maker)
+    partNames = list(PARTS if parts is None else parts)
+    for item in partNames:
+        if item not in PARTS:
+            raise ValueError(f"Unknown part: {item}")
+
+    keyboardParts = _resolveParts(partNames)
+    build = "preview" if isPreview else "final"
+
+    with _buildCfg(build, ()):
+        plans = _checkParameters(partNames, keyboardParts, SIDES, False)
+        if cfg.knob and "knob" in partNames:
+            Knob()
+        parts = _makeParts(plans, keyboardParts, partNames, not isPreview)
+        _validateParts(parts)
+
+    return parts
+
+
+def flatParameters(jsonStrings):
+    """Return the merged parameters of JSON strings by dotted names, like cfg._init."""
+    parameters = {}
+
+    def flatten(source, prefix):
+        for key, value in source.items():
+            if key.isidentifier() and not key.startswith("_"):
+                if isinstance(value, dict):
+                    flatten(value, prefix + key + ".")
+                else:
+                    # A value replaces a section with the same name
+                    for name in [n for n in parameters if n.startswith(prefix + key + ".")]:
+                        del parameters[name]
+                    parameters[prefix + key] = value
+
+    for string in jsonStrings:
+        flatten(json.loads(string), "")
+    return parameters
+
+
+def affectedParts(oldJsonStrings, newJsonStrings):
+    """Return the items of PARTS whose parameters differ.
+
+    Changes of unknown sections affect all parts.
+
+    Args:
+        oldJsonStrings (list[str]): List of JSON strings.
+        newJsonStrings (list[str]): List of JSON strings.
+    Returns:
+        list[str]
+    """
+    old = flatParameters(oldJsonStrings)
+    new = flatParameters(newJsonStrings)
+    missing = object()
+    changed = {n for n in old.keys() | new.keys() if old.get(n, missing) != new.get(n, missing)}
+    sections = {name.split(".")[0] for name in changed} - {"maker"}
+
+    knownSections = {section for names in PART_CFG.values() for section in names}
+    if not sections <= knownSections:
+        return list(PARTS)
+
+    return [part for part in PARTS if sections & _partSections(part)]
+
+
+def partKey(jsonStrings, part):
+    """Return a string that is equal for configurations with the same part.
+
+    The key contains the merged parameters of the sections that the part
+    depends on, and of unknown sections.
+
+    Args:
+        jsonStrings (list[str]): List of JSON strings.
+        part (str): Item of PARTS.
+    Returns:
+        str
+    """
+    knownSections = {section for names in PART_CFG.values() for section in names}
+    sections = _partSections(part)
+    parameters = {
+        name: value for name, value in flatParameters(jsonStrings).items()
+        if name.split(".")[0] in sections or name.split(".")[0] not in knownSections | {"maker"}}
+    return json.dumps([part, parameters], sort_keys=True)
+
+
+def partOfFile(fileName):
+    """Return the item of PARTS that a generated file belongs to."""
+    for prefix, part in ("rotary-knob", "knob"), ("pcb-positions", "pcb"):
+        if fileName.startswith(prefix):
+            return part
+    return fileName.split("-")[0]
+
+
+class Session:
+    """Generate files repeatedly, with a persistent pool and warm caches.
+
+    The worker processes are started on first use and kept until the
+    session is closed. The face triangulations and the part triangles
+    of the latest call are kept, so that unchanged faces and parts of
+    the next call are reused. The arc caches are kept by the process.
+
+    Example:
+        with chrumm.Session(threads=8) as session:
+            for jsonStrings in variants:
+                files = session.make(jsonStrings)
+    """
+
+    def __init__(self, threads=8):
+        self.threads = threads
+        self._pool = None
+        self._partCache = {}
+        self._faceCache = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, *exc):
+        self.close(isTerminating=excType is not None)
+
+    def close(self, isTerminating=False):
+        """Stop the worker processes.
+
+        Args:
+            isTerminating (bool): Stop the workers without waiting for
+                their tasks, for example after an error.
+        """
+        if self._pool:
+            if isTerminating:
+                self._pool.pool.terminate()
+            else:
+                self._pool.pool.close()
+            self._pool.pool.join()
+            self._pool = None
+
+    def make(
+            self, jsonStrings, isKnobOnly=False,
+            isPreview=False, isFinal=False, previewKeep=(), isValidating=False, isChecking=False,
+            parts=None, side=None, deadline=None, report=None):
+        """Generate files, based on JSON configuration strings.
+
+        The arguments are the same as for make(), except for the threads.
+        A deadline of time.monotonic() raises a TimeoutError, if it has
+        passed between two stages. The current stage is not interrupted.
+        """
+        files = {}
+        partCache = {}
+        tessellation.resetSegmentCounts()
+
+        # Parse parameters
+
+        log.info("Parsing configuration parameters...")
+        with stage(report, "parse"):
+            cfg._init(jsonStrings)
+
+        if cfg.maker != "chrumm " + __version__:
+            log.warning("The parameters are intended for %s", cfg.maker)
+
+        if hasattr(cfg.quality, "bumpscosity"):
+            responses = {
+                0: "Where did all of the bumpscosity go?",
+                1: "Only a single bumpscosit. It will have to do.",
+                12: "Just a light breeze of bumpscosity, not bad.",
+                50: "Ah, quite a pleasant amount of bumpscosity.",
+                76: "The bumpscosity is really getting up there, isn't it?",
+                100: "Who turned up the bumpscosity so high?",
+                1000: "A thousand?! How can you stand this much bumpscosity?"}
+            if cfg.quality.bumpscosity in responses:
+                log.debug(responses[cfg.quality.bumpscosity])
+
+        for item in previewKeep:
+            if item not in PREVIEW_ITEMS:
+                raise ValueError(f"Unknown preview item: {item}")
+
+        partNames = ["knob"] if isKnobOnly else list(PARTS if parts is None else parts)
+        for item in partNames:
+            if item not in PARTS:
+                raise ValueError(f"Unknown part: {item}")
+
+        if side is not None and side not in SIDES:
+            raise ValueError(f"Unknown side: {side}")
+        sides = SIDES if side is None else [side]
+
+        # Only the parts of the selected sides and their dependencies
+        # are constructed, but only the selected parts are written
+        keyboardParts = _resolveParts(partNames)
+
+        # The final build is last, so that it can share its plans.
+        # The plan values that depend on the preview parameters are
+        # evaluated lazily, and are invalidated after the preview build.
+        builds = ["preview"] if isPreview else []
+        if not isPreview or isFinal:
+            builds.append("final")
+
+        # Check the parameters before the construction, so that all
+        # violations are reported at once. The plans are reused.
+
+        isPcb = cfg.pcb and "pcb" in partNames
+        with stage(report, "plan"), _buildCfg(builds[-1], previewKeep):
+            plans = _checkParameters(partNames, keyboardParts, sides, isPcb)
+
+        # Generate knob
+
+        if cfg.knob and "knob" in partNames:
+            for build in builds:
+                cacheKey = (tuple(jsonStrings), build, tuple(previewKeep), "knob")
+                triangles = self._partCache.get(cacheKey)
+                isReused = triangles is not None
+                if not isReused:
+                    with stage(report, "knob", build), _buildCfg(build, previewKeep):
+                        with trace.span("Knob", build=build):
+                            triangles = Knob().triangles
+                partCache[cacheKey] = triangles
+                fileName = _fileName("rotary-knob", build)
+                if isChecking:
+                    _checkMesh(fileName, triangles)
+                with stage(report, "encode", build):
+                    files[fileName] = _toBytes(fileName, triangles)
+                if report:
+                    # The knob is constructed from triangles without faces
+                    report.addPart(fileName, None if isReused else 0, triangles)
+
+        _checkDeadline(deadline)
+
+        # Generate PCB footprint
+
+        if isPcb:
+            with stage(report, "pcb"):
+                footprint = pcb.toKiCadFootprint(plans["right"], plans["left"])
+            files["pcb-positions.kicad_mod"] = footprint
+
+        # The pool is only started, if there are parts to triangulate
+        if not keyboardParts:
+            self._partCache = partCache
+            return files
+
+        # Generate parts
+
+        sidePlans = {s: plans[s] for s in sides}
+        pool = self._getPool()
+        faceCache = {}
+        if pool:
+            pool.report = report
+
+        try:
+            for build in builds:
+                cacheKey = (
+                    tuple(jsonStrings), build, tuple(previewKeep), tuple(partNames), tuple(sides))
+                # Faces are only validated before their triangulation
+                triangles = None if isValidating else self._partCache.get(cacheKey)
+                if triangles is not None:
+                    log.info("Reusing %s keyboard parts...", build)
+                    partCache[cacheKey] = triangles
+                    for name in triangles:
+                        fileName = _fileName(name, build)
+                        if isChecking:
+                            _checkMesh(fileName, triangles[name])
+                        with stage(report, "encode", build):
+                            files[fileName] = _toBytes(fileName, triangles[name])
+                        if report:
+                            report.addPart(fileName, None, triangles[name])
+                    continue
 
-    if hasattr(cfg.quality, "bumpscosity"):
-        responses = {
-            0: "Where did all of the bumpscosity go?",
-            1: "Only a single bumpscosit. It will have to do.",
-            12: "Just a light breeze of bumpscosity, not bad.",
-            50: "Ah, quite a pleasant amount of bumpscosity.",
-            76: "The bumpscosity is really getting up there, isn't it?",
-            100: "Who turned up the bumpscosity so high?",
-            1000: "A thousand?! How can you stand this much bumpscosity?"}
-        if cfg.quality.bumpscosity in responses:
-            log.debug(responses[cfg.quality.bumpscosity])
+                _checkDeadline(deadline)
+                log.info("Constructing %s keyboard parts...", build)
+                if build != builds[0]:
+                    for plan in plans.values():
+                        plan.invalidate(*PREVIEW_QUALITY, "floor.hexHoles")
+                isSupported = build == "final" or "support" in previewKeep
+                maxTriangles = getattr(cfg.quality, "maxTriangles", 0)
+                budgetScale = 1
 
-    # Generate knob
+                # The triangle count is known before triangulation, so that
+                # only the construction is repeated if the budget is exceeded.
+                while True:
+                    _checkDeadline(deadline)
+                    with _buildCfg(build, previewKeep, budgetScale):
+                        parts = _makeParts(
+                            sidePlans, keyboardParts, partNames, isSupported,
+                            pool, deadline, report, build)
+                        with stage(report, "simplify", build):
+                            _simplifyParts(parts)
 
-    if cfg.knob:
-        files["rotary-knob.stl"] = stl.toBytes(Knob().triangles)
+                    triangleCount = sum(_countTriangles(part) for part in parts.values())
+                    if not maxTriangles or triangleCount <= maxTriangles:
+                        break
+                    if budgetScale >= BUDGET_SCALE_STEP**BUDGET_MAX_STEPS:
+                        log.warning(
+                            "Could not meet quality.maxTriangles: %i > %i",
+                            triangleCount, maxTriangles)
+                        break
+
+                    budgetScale *= BUDGET_SCALE_STEP
+                    log.info(
+                        "Coarsening %s features to meet quality.maxTriangles: %i > %i",
+                        " and ".join(tessellation.BUDGET_FEATURES), triangleCount, maxTriangles)
+                    # The plans memoize the arcs of the bosses
+                    for plan in plans.values():
+                        plan.invalidate("quality.featureScales")
+
+                if isValidating:
+                    with stage(report, "validate", build):
+                        _validateParts(parts)
+
+                _checkDeadline(deadline)
+                with stage(report, "triangulate", build):
+                    triangles = _triangulateParts(
+                        parts, pool, self.threads, build == "final",
+                        self._faceCache, faceCache)
+                with stage(report, "mirror", build):
+                    _mirrorParts(triangles)
+                with stage(report, "merge", build):
+                    _mergeParts(triangles)
+                partCache[cacheKey] = triangles
+
+                for name, part in parts.items():
+                    fileName = _fileName(name, build)
+                    if isChecking:
+                        _checkMesh(fileName, triangles[name])
+                    with stage(report, "encode", build):
+                        files[fileName] = _toBytes(fileName, triangles[name])
+                    if report:
+                        report.addPart(fileName, len(part.faces), triangles[name])
+        finally:
+            # Only the entries of the latest call are kept, so that the
+            # memory usage does not grow with every variant. The faces
+            # are kept as well, if all parts were reused.
+            self._partCache = partCache
+            self._faceCache = faceCache or self._faceCache
+            if pool:
+                pool.report = None
+
+        for plan in plans.values():
+            log.debug("Plan nodes of the %s side:\n%s", plan.side, plan.dump())
+        log.debug("Arc cache hits and misses: %i, %i", *arcCacheInfo())
+        log.debug("Arc segments per feature: %s", tessellation.segmentCounts())
 
-    if isKnobOnly:
         return files
 
-    # Generate parts
+    def _getPool(self):
+        """Return the pool of the session, or None for a single thread."""
+        if self._pool is None and self.threads > 1:
+            self._pool = _CfgPool(self.threads)
+        return self._pool
+
+
+class _CfgPool:
+    """Run functions in worker processes with the current parameters.
+
+    The workers are initialized with the chrumm modules. Each task carries
+    the JSON strings of cfg, and a worker parses them once per change.
+    Overrides of a build are not available to workers, so that worker
+    functions must receive such parameters as arguments.
+    """
+
+    def __init__(self, processes):
+        self.pool = multiprocessing.Pool(processes=processes, initializer=_initWorker)
+        self.processes = processes
+        self.report = None
+
+    def map(self, function, iterable):
+        isProfiling = bool(self.report and self.report.profiler)
+        task = _CfgTask(function, cfg._jsonStrings, isProfiling, trace.isTracing())
+        with trace.span("Pool.map", function=_functionName(function)):
+            results = self.pool.map(task, iterable)
+        for _, cpuTime, maxRss, stats, events in results:
+            trace.addEvents(events)
+            if self.report:
+                self.report.addWorkerUsage(cpuTime, maxRss, stats)
+        return [result for result, _, _, _, _ in results]
+
+
+class _CfgTask:
+    """Callable that initializes cfg in a worker process, if needed."""
+
+    def __init__(self, function, jsonStrings, isProfiling=False, isTracing=False):
+        self.function = function
+        self.jsonStrings = jsonStrings
+        self.isProfiling = isProfiling
+        self.isTracing = isTracing
+
+    def __call__(self, arg):
+        """Return the result, CPU time, peak RSS, profile stats, and trace events."""
+        cpuTime = time.process_time()
+        if self.isTracing:
+            trace.start()
+        try:
+            if cfg._jsonStrings != self.jsonStrings:
+                with trace.span("cfg._init"):
+                    cfg._init(self.jsonStrings)
+            if self.isProfiling:
+                result, stats = profileCall(self.function, arg)
+            else:
+                result, stats = self.function(arg), None
+        finally:
+            events = trace.stop() if self.isTracing else []
+        return result, time.process_time() - cpuTime, peakRss(), stats, events
+
+
+def _initWorker():
+    # Interrupts are handled by the main process, which closes the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # The parts import every module that a worker may need
+    import chrumm.part  # noqa: F401
+
+
+def _checkDeadline(deadline):
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError("The generation took too long.")
+
+
+def _checkParameters(partNames, keyboardParts, sides, isPcb):
+    """Raise a ValueError with all violated constraints of the parameters.
+
+    Returns:
+        dict[str, Plan]: The plans of the sides, if they are needed.
+    """
+    checkedParts = keyboardParts + (["knob"] if "knob" in partNames else [])
+    problems = validation.checkParameters(checkedParts)
+    plans = {}
+
+    if keyboardParts or isPcb:
+        log.info("Constructing reference points...")
+        plans = {s: Plan(s) for s in SIDES if s in sides or isPcb}
+        try:
+            # Only the body and its dependents rely on the checks of the plans
+            if "body" in keyboardParts:
+                for side in sides:
+                    with trace.span("Plan.check", side=side):
+                        plans[side].check()
+        except ValueError as e:
+            problems.append(str(e))
+        sidePlans = [plans[s] for s in sides if s in plans]
+        problems.extend(validation.checkPlans(sidePlans, keyboardParts))
+
+    # The construction of the plans repeats some of the checks
+    problems = list(dict.fromkeys(problems))
+    if len(problems) == 1:
+        raise ValueError(problems[0])
+    if problems:
+        raise ValueError(f"Found {len(problems)} invalid parameters:\n" + "\n".join(problems))
+
+    return plans
+
+
+def _buildCfg(build, previewKeep, budgetScale=1):
+    """Return a context that adjusts the parameters to the build."""
+    values = {}
+
+    if budgetScale != 1:
+        values["quality.featureScales"] = tessellation.budgetScales(budgetScale)
+
+    if build == "preview":
+        values.update({n: max(cfg._get(n), v) for n, v in PREVIEW_QUALITY.items()})
+        if "hexHoles" not in previewKeep:
+            values["floor.hexHoles"] = False
+
+    return cfg._Override(values)
+
+
+def _checkMesh(fileName, triangles):
+    """Log open, non-manifold, and inconsistently oriented edges."""
+    log.info('Checking "%s"...', fileName)
+    problems = findMeshProblems(triangles)
+
+    for description, a, b in problems[:MAX_LOGGED_PROBLEMS]:
+        log.warning("%s: %s from %s to %s", fileName, description, a, b)
+
+    if len(problems) > MAX_LOGGED_PROBLEMS:
+        log.warning("%s: %i more problems", fileName, len(problems) - MAX_LOGGED_PROBLEMS)
 
-    log.info("Constructing reference points...")
-    planR = Plan("right")
-    planL = Plan("left")
 
-    log.info("Constructing keyboard parts...")
+def _countTriangles(part):
+    """Return the number of triangles of a part, before triangulation."""
+    # Ear clipping yields n - 2 triangles for a simple polygon with n
+    # points. Each merged hole adds its points plus two bridge points.
+    count = len(part.triangles)
+    for face in part.faces:
+        holes = [hole for hole in face.holes if hole]
+        count += len(face.edge) - 2 + sum(len(hole) + 2 for hole in holes)
+    return count
+
+
+def _fileName(name, build):
+    return f"{name}-preview.stl" if build == "preview" else f"{name}.stl"
+
+
+def _resolveParts(partNames):
+    """Return the keyboard parts to construct, including dependencies."""
+    resolved = set()
+    stack = [name for name in partNames if name in PART_DEPENDENCIES]
+    while stack:
+        name = stack.pop()
+        if name not in resolved:
+            resolved.add(name)
+            stack.extend(PART_DEPENDENCIES[name])
+    return [name for name in PART_DEPENDENCIES if name in resolved]
+
+
+def _makeParts(
+        plans, keyboardParts, partNames, isSupported,
+        pool=None, deadline=None, report=None, build=None):
+    """Construct the keyboard parts of the sides of the given plans.
+
+    Returns:
+        dict[str, Part]: The selected parts, without dependencies.
+    """
     parts = {}
-    parts["body-right"] = Body(planR)
-    parts["body-left"] = Body(planL)
-    parts["floor-right"] = Floor(planR, parts["body-right"])
-    parts["floor-left"] = Floor(planL, parts["body-left"])
+    for name in keyboardParts:
+        if name == "palm" and not cfg.palm:
+            continue
+        if name == "support" and not (cfg.support and isSupported):
+            continue
 
-    if cfg.palm:
-        parts["palm-right"] = Palm(planR)
-        parts["palm-left"] = Palm(planL)
+        for side, plan in plans.items():
+            _checkDeadline(deadline)
+            with stage(report, f"{name}-{side}", build), trace.span(name.title(), side=side):
+                if name == "body":
+                    part = Body(plan)
+                elif name == "floor":
+                    part = Floor(plan, parts["body-" + side], pool)
+                elif name == "palm":
+                    part = Palm(plan)
+                elif name == "support":
+                    part = Support(plan)
+            parts[f"{name}-{side}"] = part
 
-    if cfg.support:
-        parts["support-right"] = Support(planR)
-        parts["support-left"] = Support(planL)
+    return {n: p for n, p in parts.items() if n.rsplit("-", 1)[0] in partNames}
 
-    if cfg.pcb:
-        files["pcb-positions.kicad_mod"] = pcb.toKiCadFootprint(planR, planL)
 
-    # Triangulate faces
+def _validateParts(parts):
+    """Check the faces of all parts, to fail before the triangulation."""
+    log.info("Validating faces...")
+    for name, part in parts.items():
+        for i, face in enumerate(part.faces):
+            try:
+                face.validate()
+            except ValueError as e:
+                raise ValueError(f"Invalid face {i} of {name}: {e}") from e
 
+
+def _mergeParts(triangles):
+    """Merge coplanar triangles of each part in place, if enabled."""
+    maxMergeAngle = getattr(cfg.quality, "maxMergeAngle", None)
+    if maxMergeAngle is None:
+        return
+
+    log.info("Merging coplanar triangles...")
+    oldCount = sum(len(t) for t in triangles.values())
+    for name, partTriangles in triangles.items():
+        triangles[name] = mergeCoplanar(partTriangles, maxMergeAngle)
+    newCount = sum(len(t) for t in triangles.values())
+    log.debug("Merged %i triangles into %i", oldCount, newCount)
+
+
+def _simplifyParts(parts):
+    """Remove nearly collinear points from the faces, if enabled."""
+    maxSimplifyHeight = getattr(cfg.quality, "maxSimplifyHeight", 0)
+    if maxSimplifyHeight <= 0:
+        return
+
+    # Removed points should not deviate more than arc segments
+    tolerance = min(maxSimplifyHeight, cfg.quality.maxChordHeight)
+    removedCount = sum(
+        simplifyFaces(part.faces, part.triangles, tolerance) for part in parts.values())
+    log.debug("Removed %i nearly collinear face points", removedCount)
+
+
+def _triangulateParts(parts, pool, threads, isRefined, previousCache=None, cache=None):
+    """Triangulate the faces and return the combined triangles of each part.
+
+    Args:
+        previousCache (dict): Triangles of faces from an earlier call,
+            which are reused for faces with identical coordinates.
+        cache (dict): Receives the triangles of all faces.
+    """
     # The face objects are accumulated in a flat list, so that
     # they can be passed to Pool and triangulated in parallel.
     faces = [face for part in parts.values() for face in part.faces]
+    triangulate = functools.partial(_triangulateFace, isRefined=isRefined)
+
+    previousCache = {} if previousCache is None else previousCache
+    cache = {} if cache is None else cache
+    keys = [_faceKey(face, isRefined) for face in faces]
+    missing = [face for face, key in zip(faces, keys) if key not in previousCache]
+
+    if len(missing) < len(faces):
+        log.info("Reusing %i triangulated faces...", len(faces) - len(missing))
 
-    if threads <= 1:
-        log.info("Triangulating %i faces without multithreading...", len(faces))
-        faceTriangles = [face.triangulate() for face in faces]
+    if pool is None:
+        log.info("Triangulating %i faces without multithreading...", len(missing))
+        missingTriangles = [triangulate(face) for face in missing]
     else:
-        log.info("Triangulating %i faces with %i threads...", len(faces), threads)
-        with multiprocessing.Pool(processes=threads) as pool:
-            faceTriangles = pool.map(type(faces[0]).triangulate, faces)
+        log.info("Triangulating %i faces with %i threads...", len(missing), threads)
+        missingTriangles = pool.map(triangulate, missing)
+
+    missingTriangles.reverse()
+    faceTriangles = []
+    for key in keys:
+        if key in previousCache:
+            cache[key] = previousCache[key]
+        elif key not in cache:
+            cache[key] = missingTriangles.pop()
+        else:
+            # Identical faces within a call share the first result
+            missingTriangles.pop()
+        faceTriangles.append(cache[key])
 
     # Combine triangles
 
@@ -103,12 +732,57 @@ def make(jsonStrings, threads, isKnobOnly):
         triangles[name] = list(part.triangles)
         for face in part.faces:
             triangles[name].extend(faceTriangles.pop(0))
+
+    return triangles
+
+
+def _triangulateFace(face, isRefined):
+    with trace.span("Face.triangulate", edge=len(face.edge), holes=len(face.holes)):
+        return face.triangulate(isRefined)
+
+
+def _toBytes(fileName, triangles):
+    with trace.span("stl.toBytes", file=fileName):
+        return stl.toBytes(triangles)
+
+
+def _functionName(function):
+    if isinstance(function, functools.partial):
+        function = function.func
+    return getattr(function, "__qualname__", repr(function))
+
+
+def _mirrorParts(triangles):
+    """Mirror the triangles of the left parts in place."""
+    for name in triangles:
         if "left" in name:
-            triangles[name] = [t.mirroredX().reversed() for t in triangles[name]]
+            triangles[name] = _mirroredX(triangles[name])
+
 
-    # Generate files
+def _partSections(part):
+    """Return the top-level sections of a part, including its dependencies."""
+    sections = set()
+    for name in [part] + _resolveParts([part]):
+        sections.update(PART_CFG[name])
+    return sections
 
-    for name in parts.keys():
-        files[name + ".stl"] = stl.toBytes(triangles[name])
 
-    return files
+def _faceKey(face, isRefined):
+    """Return a hashable key of the exact face coordinates."""
+    edge = tuple((p.x, p.y, p.z) for p in face.edge)
+    holes = tuple(tuple((p.x, p.y, p.z) for p in hole) for hole in face.holes)
+    return isRefined, edge, holes
+
+
+def _mirroredX(triangles):
+    """Mirror triangles on the yz plane and keep their vertexes shared.
+
+    Each vertex is mirrored once, instead of once per triangle.
+    The vertex order is reversed, so that the normals point outward.
+    """
+    vectors = {}
+    for t in triangles:
+        for v in t.a, t.b, t.c:
+            if id(v) not in vectors:
+                vectors[id(v)] = v.mirroredX()
+    return [Triangle(vectors[id(t.c)], vectors[id(t.b)], vectors[id(t.a)]) for t in triangles]
@@ -1,3 +1,4 @@
+import functools
 import math
 
 from chrumm import cfg
@@ -5,18 +6,47 @@ from chrumm import cfg
 from chrumm.geo import Edge
 from chrumm.geo import Vector
 
+from . import tessellation
 
-def arc2D(radius, startAngle=0, spanAngle=math.tau, center=Vector()):
+
+def arc2D(radius, startAngle=0, spanAngle=math.tau, center=Vector(), feature="visible"):
+    """Return arc points, segmented according to the feature class."""
     if radius < 1e-6:
         return Edge(center)
 
+    maxChordHeight, maxChordAngle = tessellation.chordLimits(feature)
+    spanAngle = max(-math.tau, min(spanAngle, math.tau))
+    chordCount = _chordCount(radius, spanAngle, maxChordHeight, maxChordAngle)
+    tessellation.countSegments(feature, chordCount)
+
+    unitArc = _unitArc2D(startAngle, spanAngle, chordCount)
+    return Edge(Vector(center.x + radius*cos, center.y + radius*sin) for cos, sin in unitArc)
+
+
+def arcCacheInfo():
+    """Return the hits and misses of the arc tessellation caches."""
+    countInfo = _chordCount.cache_info()
+    arcInfo = _unitArc2D.cache_info()
+    return countInfo.hits + arcInfo.hits, countInfo.misses + arcInfo.misses
+
+
+# Arcs are tessellated with a two-level cache. The chord count buckets
+# all radii that result in the same segmentation, so that the unit arc
+# of a bucket can be shared. The cached values are identical to a fresh
+# calculation, because the same expressions are evaluated in the same
+# order. The quality parameters are part of the key, because the cfg
+# can be re-initialized between calls.
+
+@functools.lru_cache(maxsize=4096)
+def _chordCount(radius, spanAngle, maxChordHeight, maxChordAngle):
     # https://en.wikipedia.org/wiki/Sagitta_(geometry)
-    maxChordHeight = cfg.quality.maxChordHeight
-    maxHeightAngle = math.acos(1 - maxChordHeight/radius) * 2
-    maxChordAngle = min(cfg.quality.maxChordAngle, maxHeightAngle)
+    maxHeightAngle = math.acos(max(-1, 1 - maxChordHeight/radius)) * 2
+    maxChordAngle = min(maxChordAngle, maxHeightAngle)
+    return math.ceil(abs(spanAngle) / maxChordAngle)
 
-    spanAngle = max(-math.tau, min(spanAngle, math.tau))
-    chordCount = math.ceil(abs(spanAngle) / maxChordAngle)
+
+@functools.lru_cache(maxsize=1024)
+def _unitArc2D(startAngle, spanAngle, chordCount):
     chordAngle = spanAngle / chordCount
     pointCount = chordCount
 
@@ -24,16 +54,14 @@ def arc2D(radius, startAngle=0, spanAngle=math.tau, center=Vector()):
     if abs(abs(spanAngle) - math.tau) > 1e-6:
         pointCount += 1
 
-    edge = Edge()
+    unitArc = []
     for i in range(pointCount):
         angle = startAngle + i*chordAngle
-        x = center.x + radius*math.cos(angle)
-        y = center.y + radius*math.sin(angle)
-        edge.add(Vector(x, y))
-    return edge
+        unitArc.append((math.cos(angle), math.sin(angle)))
+    return tuple(unitArc)
 
 
-def cornerArc2D(radius, a, b, c):
+def cornerArc2D(radius, a, b, c, feature="visible"):
     #   a
     #  /
     # b(
@@ -50,7 +78,7 @@ def cornerArc2D(radius, a, b, c):
     centerDist = radius / math.sin(cornerAngle/2)
     centerDir = (aDir + cDir).normalized2D()
     centerPos = b.xy + centerDir*centerDist
-    return arc2D(radius, startAngle, arcAngle, centerPos)
+    return arc2D(radius, startAngle, arcAngle, centerPos, feature)
 
 
 def uprightHole2D(radius):
@@ -22,6 +22,8 @@ log = logging.getLogger(__name__)
 class Body:
 
     def __init__(self, plan):
+        plan.check()
+
         self.outlineI = Edge()
         self.outlineO = Edge()
         self.bracketF = None
@@ -84,9 +86,9 @@ class Body:
 
         # Rounded corner edges
 
-        cornerILFG = cornerArc2D(innerCornerRadius, thumbIRF, thumbILF, thumbILF.yz)
-        cornerIRFG = cornerArc2D(innerCornerRadius, pinkyIRB, pinkyIRF, thumbILF)
-        cornerIRBG = cornerArc2D(innerCornerRadius, alnumIRB, pinkyIRB, pinkyIRF)
+        cornerILFG = cornerArc2D(innerCornerRadius, thumbIRF, thumbILF, thumbILF.yz, "internal")
+        cornerIRFG = cornerArc2D(innerCornerRadius, pinkyIRB, pinkyIRF, thumbILF, "internal")
+        cornerIRBG = cornerArc2D(innerCornerRadius, alnumIRB, pinkyIRB, pinkyIRF, "internal")
 
         cornerOLFG = cornerArc2D(outerCornerRadius, thumbOLF.yz, thumbOLF, thumbORF)
         cornerORFG = cornerArc2D(outerCornerRadius, thumbOLF, pinkyORF, pinkyORB)
@@ -126,14 +128,14 @@ class Body:
         stepChamferPlaneI = Plane.fromPoints(alnumIRF, alnumILF, ridgeIRF)
         stepChamferPlaneO = Plane.fromPoints(alnumORF, alnumOLF, ridgeORF)
 
-        stepCornerArcI = cornerArc2D(stepCornerRadiusI, ridgeIRF, thumbILB, alnumIRF)
+        stepCornerArcI = cornerArc2D(stepCornerRadiusI, ridgeIRF, thumbILB, alnumIRF, "internal")
         stepCornerArcO = cornerArc2D(stepCornerRadiusO, alnumORF, thumbOLB, ridgeORF)
 
         stepCornerIG = Edge(plan.planes.thumbIT.projectZ(p) for p in stepCornerArcI)
         stepCornerOG = Edge(plan.planes.thumbOT.projectZ(p) for p in stepCornerArcO)
 
-        stepCornerIT = Edge(stepChamferPlaneI.intersect(Line(p, stepDir)) for p in stepCornerIG)
-        stepCornerOT = Edge(stepChamferPlaneO.intersect(Line(p, stepDir)) for p in stepCornerOG)
+        stepCornerIT = Edge(stepChamferPlaneI.projectMany(stepCornerIG, stepDir))
+        stepCornerOT = Edge(stepChamferPlaneO.projectMany(stepCornerOG, stepDir))
 
         stepEdgeIG = Edge(ridgeIRF, stepCornerIG, alnumIRF)
         stepEdgeIT = Edge(ridgeIRF, stepCornerIT, alnumIRF)
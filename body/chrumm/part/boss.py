@@ -7,6 +7,7 @@ from chrumm.geo import Edge
 from chrumm.geo import Matrix
 from chrumm.geo import Plane
 from chrumm.geo import Vector
+from chrumm.geo import loft
 
 from .arc import arc2D
 from .arc import uprightHole2D
@@ -63,7 +64,8 @@ class Boss:
             taperAngleL).mirroredX().reversed())
 
         matrix = Matrix().rotatedZ(wallDirection.angle2D()).translated(pos)
-        self.wallEdge = self.wallEdge.collapsed().transformed(matrix)
+        self.wallEdge = self.wallEdge.collapsed()
+        self.wallEdge.transform(matrix)
 
     def _initHead(self, pos):
         outerHeight = cfg.floor.outerHeight
@@ -96,8 +98,7 @@ class Boss:
             arcPos = Vector(pos.x, pos.y, z)
             arcs.append(protoArc.scaled(scale).translated(arcPos))
 
-        for i in range(len(arcs) - 1):
-            self.headTriangles.extend(arcs[i].meshPairwise(arcs[i+1], True))
+        self.headTriangles.extend(loft(arcs, True))
 
         self.clearanceHole = arcs[0].reversed()
         self.headHole = arcs[-1]
@@ -150,8 +151,7 @@ class Boss:
         arcs.append(Edge(tipPlane.projectZ(p) for p in arcs[-1]))
         arcs.append(Edge(tipPlane.pos))
 
-        for i in range(len(arcs) - 1):
-            self.threadTriangles.extend(arcs[i+1].meshPairwise(arcs[i], True))
+        self.threadTriangles.extend(loft(arcs, True, True))
 
         self.threadHole = arcs[0]
 
@@ -170,8 +170,8 @@ def _smoothTransition(protrusion, bossRadius, bossFillet, minTaperAngle):
 
     tangentAngle = min(max(0, minTaperAngle, filletCenter.angle2D()), math.radians(89))
     arcAngle = math.tau/4 - tangentAngle
-    filletArc = arc2D(bossFillet, -math.tau/4, -arcAngle, filletCenter)
-    bossArc = arc2D(bossRadius, tangentAngle, arcAngle)
+    filletArc = arc2D(bossFillet, -math.tau/4, -arcAngle, filletCenter, "internal")
+    bossArc = arc2D(bossRadius, tangentAngle, arcAngle, feature="internal")
 
     gapY = bossArc[0].y - filletArc[-1].y
     gapX = gapY / math.cos(tangentAngle) * math.sin(tangentAngle)
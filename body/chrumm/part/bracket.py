@@ -133,7 +133,7 @@ class CornerBracket:
 
             minHumpTaper = math.asin(humpInset / humpRadius)
             humpSpan = math.pi - taperAngle - max(minHumpTaper, taperAngle)
-            humpArcXY = arc2D(humpRadius, taperAngle, humpSpan)
+            humpArcXY = arc2D(humpRadius, taperAngle, humpSpan, feature="internal")
             humpArc = Edge(Vector(0, -p.x, -p.y) + humpCenter for p in humpArcXY)
 
             humpLineF = Line(humpArc[0], taperLine.dir)
@@ -151,7 +151,7 @@ class CornerBracket:
             # Ziptie hole
 
             zipArcCenterXY = Vector(0, zipHeight/2 - zipWidth/2)
-            zipArcXY = arc2D(zipHeight/2, 0, -math.pi, zipArcCenterXY)
+            zipArcXY = arc2D(zipHeight/2, 0, -math.pi, zipArcCenterXY, "internal")
             zipHoleXY = zipArcXY.transformed(Matrix().rotatedZ(taperAngle))
             zipHoleXY.add(zipHoleXY.mirroredX().mirroredY())
 
@@ -161,7 +161,7 @@ class CornerBracket:
 
             if zipHoleL[0].z <= arcL[-1].z:
                 overlap = taperDir*(zipHoleL[0] - arcL[-1]).magnitude()
-                zipHoleL = zipHoleL.translated(overlap)
+                zipHoleL.translate(overlap)
                 zipHoleR = zipHoleL.translated(Vector(humpWidth/2))
 
             arcR = arcL.translated(Vector(humpWidth/2))
@@ -267,8 +267,8 @@ class RoofBracket:
 
             roofPos = roofLine.intersect(armOffsetLine)
             roofAlign = roofAlign.translated(roofPos)
-            archLF = archLF.transformed(roofAlign)
-            archLB = archLB.transformed(roofAlign)
+            archLF.transform(roofAlign)
+            archLB.transform(roofAlign)
 
             armR = Edge(bossBT, bossBG, bossFG, bossFT)
             armL = Edge(
@@ -277,7 +277,7 @@ class RoofBracket:
                 apexLine.intersect(armLineF),
                 roofLine.intersect(armLineF)).translated(moveR)
 
-            archLB = archLB.translated(armL[1].yz - archLB[0])
+            archLB.translate(armL[1].yz - archLB[0])
             archRF = archLF.translated(moveR)
             archRB = archLB.translated(moveR)
 
@@ -301,7 +301,7 @@ class RoofBracket:
 
         holeTriangles, holeL, holeR = _screwHole(Vector(), side, False)
 
-        holeTriangles = [t.transformed(roofAlign) for t in holeTriangles]
+        holeTriangles = roofAlign.transformTriangles(holeTriangles)
         holeL = holeL.transformed(roofAlign)
         holeR = holeR.transformed(roofAlign)
 
@@ -323,7 +323,7 @@ class RoofBracket:
 
         holeG = uprightHole2D(threadRadius)
         holeT = holeG.translated(Vector(0, 0, bossHeight))
-        edgeG = arc2D(bossRadius, 0, math.pi)
+        edgeG = arc2D(bossRadius, 0, math.pi, feature="internal")
         edgeT = edgeG.translated(Vector(0, 0, bossHeight))
 
         armFG = Vector(bossRadius, -bossRadius)
@@ -332,16 +332,15 @@ class RoofBracket:
         armBT = Vector(-bossRadius, -nutRadius, bossHeight)
 
         rotMatrix = Matrix().rotatedZ(-math.tau/4 - splitAngle)
-        holeG = holeG.transformed(rotMatrix)
-        holeT = holeT.transformed(rotMatrix)
+        holeG.transform(rotMatrix)
+        holeT.transform(rotMatrix)
         edgeG = Edge(armFG, edgeG, armBG).transformed(rotMatrix)
         edgeT = Edge(armFT, edgeT, armBT).transformed(rotMatrix)
 
         offset = Vector(-xOffset, -yOffset, -zOffset)
-        holeG = holeG.translated(offset).transformed(refMatrix)
-        holeT = holeT.translated(offset).transformed(refMatrix)
-        edgeG = edgeG.translated(offset).transformed(refMatrix)
-        edgeT = edgeT.translated(offset).transformed(refMatrix)
+        for edge in holeG, holeT, edgeG, edgeT:
+            edge.translate(offset)
+            edge.transform(refMatrix)
 
         self.triangles.extend(holeT.meshPairwise(holeG, True))
         self.triangles.extend(edgeG.meshPairwise(edgeT))
@@ -446,7 +445,7 @@ class FloorBracket:
         # Edges and triangles
 
         moveR = Vector(boreLength + holeLength)
-        archL = archL.translated(screwCenter.xy)
+        archL.translate(screwCenter.xy)
         archR = archL.translated(moveR)
 
         faceEdge = Edge(archL, d, c, a).translated(moveR)
@@ -484,7 +483,7 @@ def _hexTangentDist(outerRadius, tangentAngle):
 
 def _archCorner(radius, a, b, c):
     return Edge(Vector(0, p.x, p.y) for p in cornerArc2D(
-        radius, Vector(a.y, a.z), Vector(b.y, b.z), Vector(c.y, c.z)))
+        radius, Vector(a.y, a.z), Vector(b.y, b.z), Vector(c.y, c.z), "internal"))
 
 
 def _screwHole(centerL, side, isUpright):
@@ -19,7 +19,10 @@ class Bumper:
         radius = cfg.bumper.diameter/2
         height = cfg.bumper.height
 
-        arc = arc2D(radius, -math.pi/2, math.pi).snapped() if isHalf else arc2D(radius)
+        if isHalf:
+            arc = arc2D(radius, -math.pi/2, math.pi, feature="hidden").snapped()
+        else:
+            arc = arc2D(radius, feature="hidden")
         edgeG = arc.translated(pos.xy - Vector(0, 0, floorHeight))
         edgeT = arc.translated(pos.xy - Vector(0, 0, floorHeight - height))
 
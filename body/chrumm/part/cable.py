@@ -4,6 +4,7 @@ from chrumm import cfg
 
 from chrumm.geo import Edge
 from chrumm.geo import Vector
+from chrumm.geo import loft
 
 from .arc import arc2D
 from .arc import uprightHalfHole2D
@@ -32,7 +33,7 @@ class Cable:
 
         # Hole
 
-        filletArcXY = arc2D(filletRadius, 0, math.tau/4)
+        filletArcXY = arc2D(filletRadius, 0, math.tau/4, feature="internal")
         filletArcYZ = Edge(Vector(0, p.y, p.x) for p in filletArcXY)
         filletCenter = pos + Vector(0, wallThickness - filletRadius, -cableRadius)
 
@@ -47,8 +48,7 @@ class Cable:
             arcCenter = filletCenter + Vector(0, p.y)
             holeArcs.append(holeArcXZ.scaled(arcScale).translated(arcCenter))
 
-        for i in range(len(holeArcs) - 1):
-            self.triangles.extend(holeArcs[i+1].meshPairwise(holeArcs[i]))
+        self.triangles.extend(loft(holeArcs, isReversed=True))
 
         # Bump
 
@@ -61,13 +61,13 @@ class Cable:
         # |/' wallBumpTaperAngle
 
         tipCenterXY = Vector(1, 1).normalized() * (bendRadius - bumpRadius)
-        bendArcXY = arc2D(bendRadius, math.tau/4, -math.tau/8)
-        bendArcXY.add(arc2D(bumpRadius, math.tau/8, -math.tau/8, tipCenterXY)[1:])
+        bendArcXY = arc2D(bendRadius, math.tau/4, -math.tau/8, feature="internal")
+        bendArcXY.add(arc2D(bumpRadius, math.tau/8, -math.tau/8, tipCenterXY, "internal")[1:])
         bendArcYZ = Edge(Vector(0, -p.x, p.y) for p in bendArcXY)
-        bendArcYZ = bendArcYZ.translated(holeArcs[0][-1] - bendArcYZ[0])
+        bendArcYZ.translate(holeArcs[0][-1] - bendArcYZ[0])
 
         taperFactor = math.sin(taperAngle) / math.cos(taperAngle)
-        taperArcXY = arc2D(bumpRadius, 0, -(math.tau/4 - taperAngle), tipCenterXY)
+        taperArcXY = arc2D(bumpRadius, 0, -(math.tau/4 - taperAngle), tipCenterXY, "internal")
         taperArcXY.add(Vector(0, taperArcXY[-1].y - taperArcXY[-1].x*taperFactor))
         taperArcYZ = Edge(Vector(0, -p.x, p.y) for p in taperArcXY)
 
@@ -84,8 +84,7 @@ class Cable:
         self.triangles.extend(bendEdgeB.meshPairwise(taperEdgeR[:1]))
         self.triangles.extend(bumpEdgeR.meshPairwise(bumpEdgeR[:1]))
 
-        for i in range(len(grooveArcs) - 1):
-            self.triangles.extend(grooveArcs[i].meshPairwise(grooveArcs[i+1]))
+        self.triangles.extend(loft(grooveArcs))
 
         # Edges
 
@@ -2,7 +2,6 @@ from chrumm import cfg
 
 from chrumm.geo import Edge
 from chrumm.geo import Face
-from chrumm.geo import Line
 from chrumm.geo import Matrix
 from chrumm.geo import Vector
 
@@ -50,8 +49,8 @@ class Encoder:
             Vector(width/2, depth/2, -holeHeight),
             Vector(width/2 + notchDepth, depth/2 - notchDepth, -holeHeight))
         boxEdgeT.add(boxEdgeT.mirroredY().reversed())
-        boxEdgeT = boxEdgeT.transformed(align)
-        boxEdgeG = Edge(roofPlaneI.intersect(Line(p, normal)) for p in boxEdgeT)
+        boxEdgeT.transform(align)
+        boxEdgeG = Edge(roofPlaneI.projectMany(boxEdgeT, normal))
 
         # Chamfered notch
         boxEdgeT[2] = boxEdgeT[1]
@@ -1,10 +1,13 @@
+import functools
 import math
 
 from chrumm import cfg
 
 from chrumm.geo import Edge
 from chrumm.geo import Face
+from chrumm.geo import offset2D
 from chrumm.geo import Segment
+from chrumm.geo import SegmentGrid
 from chrumm.geo import Vector
 
 from .arc import cornerArc2D
@@ -14,7 +17,7 @@ from .bumper import Bumper
 
 class Floor:
 
-    def __init__(self, plan, body):
+    def __init__(self, plan, body, pool=None):
         self.faces = []
         self.triangles = []
 
@@ -30,9 +33,9 @@ class Floor:
         floorIG = Vector(0, 0, floorOG.z + innerHeight)
         chamferT = Vector(0, 0, floorIG.z + innerChamfer)
 
-        lipSketchI = _naiveOffset2D(body.outlineI, -lipMargin - lipThickness)
-        lipSketchO = _naiveOffset2D(body.outlineI, -lipMargin)
-        chamferSketch = _naiveOffset2D(body.outlineI, -lipMargin - lipThickness - innerChamfer)
+        lipSketchI = offset2D(body.outlineI, -lipMargin - lipThickness)
+        lipSketchO = offset2D(body.outlineI, -lipMargin)
+        chamferSketch = offset2D(body.outlineI, -lipMargin - lipThickness - innerChamfer)
 
         # Wall profile edges
         #
@@ -103,7 +106,7 @@ class Floor:
                 sketchBG = Edge(Vector(p.y, p.z) for p in bracketB.splitEdge)
                 sketchBT = Edge(Vector(p.y, p.z) for p in body.bracketB.splitEdge)
 
-                for point in _naiveOffset2D(sketchBT, -cfg.cable.diameter):
+                for point in offset2D(sketchBT, -cfg.cable.diameter):
                     if sketchBG.contains2D(point):
                         raise ValueError(
                             "The cable overlaps the back floor brackets.\n"
@@ -133,8 +136,8 @@ class Floor:
 
         if cfg.floor.hexHoles:
             hexMargin = cfg.floor.hexHoles.wallMargin
-            hexBorder = _naiveOffset2D(profile[-1], -hexMargin, True)
-            hexagons = _hexGrid2D(hexBorder)
+            hexBorder = offset2D(profile[-1], -hexMargin, True)
+            hexagons = _hexGrid2D(hexBorder, pool)
             hexagonsI = [h.translated(floorIG) for h in hexagons]
             hexagonsO = [h.translated(floorOG) for h in hexagons]
 
@@ -225,91 +228,13 @@ def _cornerBumper(a, b, c, bumperInset):
     return Bumper(b + bumperDir*bumperDiag)
 
 
-def _naiveOffset2D(edge, distance, isClosed=False, minSegLength=1e-3):
-    """Grow or shrink a simple polygon edge by the given distance.
-
-    Note that the robust offsetting of arbitrary polygons is non-trivial
-    and out of scope for this function. Avoid overly sharp angles. Avoid
-    offset distances that cause a fundamental change of the topology.
-    One simple polygon is returned.
-    """
-    def connect(segments):
-        """Connect segments at their intersections as lines."""
-        for i in range(len(segments)):
-            seg0 = segments[i-1]
-            seg1 = segments[i]
-            middle = seg0.intersect2D(seg1, asLine=2)
-            if middle is None:
-                middle = (seg0.b + seg1.a) / 2
-            seg0.b = middle
-            seg1.a = middle
-
-    if abs(distance) < 1e-6:
-        return edge
-
-    # Offset segments
-    segments = edge.toSegments(True)
-    offset = [s.offset2D(distance) for s in segments]
-    if not isClosed:
-        offset[-1] = segments[-1].offset2D(0)
-
-    # Extend and reconnect offset segments.
-    # In case of a sharp angle, the intersection
-    # will be far away from the original point.
-    connect(offset)
-
-    # Reorder segments to start at a point that
-    # is not part of a self-intersecting loop
-    startIndex = 0
-    for i, startSegment in enumerate(offset):
-        isTooClose = False
-        for segment in segments:
-            if segment.distance2D(startSegment.a) < abs(distance) - 1e-6:
-                isTooClose = True
-                break
-        if not isTooClose:
-            startIndex = i
-            break
-    offset = offset[startIndex:] + offset[:startIndex]
-
-    # Cut off self-intersecting loops
-    i = 0
-    while i < len(offset):
-        segment = offset[i]
-        cutPos = None
-        cutDist = None
-        cutIndex = None
-        for j in range(i+2, len(offset) - int(i == 0)):
-            pos = segment.intersect2D(offset[j])
-            if pos is not None:
-                dist = (pos - segment.a).magSquared()
-                if cutDist is None or dist < cutDist:
-                    cutPos = pos
-                    cutDist = dist
-                    cutIndex = j
-        if cutIndex is not None:
-            del offset[i+1:cutIndex]
-            offset[i].b = cutPos
-            offset[i+1].a = cutPos
-        i += 1
-
-    # Remove segments that are too short
-    offset = [s for s in offset if s.magnitude2D() >= minSegLength]
-    connect(offset)
-
-    # Reorder segments to start near the original start point
-    distances = [(s.a - edge[0]).magSquared() for s in offset]
-    minIndex = distances.index(min(distances))
-    offset = offset[minIndex:] + offset[:minIndex]
-
-    return Edge(s.a for s in offset)
-
-
-def _hexGrid2D(edge):
+def _hexGrid2D(edge, pool=None):
     """Fill polygon edge with a hexagon grid.
 
     If a hexagon does not fit completely, then scale it down
     toward the vertex that is furthest inside the polygon.
+    The rows are independent and constructed in parallel,
+    if a multiprocessing pool is given.
     """
     minDiameter = cfg.floor.hexHoles.minDiameter
     maxDiameter = cfg.floor.hexHoles.maxDiameter
@@ -318,9 +243,6 @@ def _hexGrid2D(edge):
     yOffset = cfg.floor.hexHoles.yOffset
     holeMargin = cfg.floor.hexHoles.holeMargin
 
-    hexagons = []
-    segments = edge.toSegments(True)
-
     minX = min(p.x for p in edge)
     maxX = max(p.x for p in edge)
     minY = min(p.y for p in edge)
@@ -335,96 +257,149 @@ def _hexGrid2D(edge):
     xStart = minX + maxRadius + xOffset
     yStart = minY + minRadius + yOffset - yPitch
 
+    rowStarts = []
     row = 0
-    x = xStart
     y = yStart
     while y < maxY + minRadius:
-        while x < maxX + maxRadius:
-            center = Vector(x, y)
-            hexagon = Edge(
-                Vector(x - maxRadius, y),
-                Vector(x - maxRadius/2, y - minRadius),
-                Vector(x + maxRadius/2, y - minRadius),
-                Vector(x + maxRadius, y),
-                Vector(x + maxRadius/2, y + minRadius),
-                Vector(x - maxRadius/2, y + minRadius))
-
-            # Increment before possible continue statments
-            x += xPitch
-
-            # Check if hexagon is completely inside or outside (cheap)
-            centerDist = min(s.distance2D(center) for s in segments)
-            if centerDist >= maxRadius:
-                if edge.contains2D(center):
-                    hexagons.append(hexagon)
-                continue
+        rowStarts.append(Vector(xStart + xPitch/2*(row % 2), y))
+        row += 1
+        y = yStart + yPitch/2*row
 
-            # Scale down partially contained hexagon (expensive)
-            bestFactor = 0.0
-            bestCenter = None
-            pointsInHex = [p for p in edge if hexagon.contains2D(p)]
-
-            for i, scaleCenter in enumerate(hexagon):
-                if not edge.contains2D(scaleCenter):
-                    continue
-
-                minFactor = 1.0
-
-                # Find scale factor to exclude all polygon points
-                #   _____
-                #  /     \. ray
-                # /     p'\
-                # \   .'  /
-                #  \.'   /
-                #   c----  scaleCenter
-                if pointsInHex:
-                    for point in pointsInHex:
-                        if point.isClose(scaleCenter):
-                            continue
-                        ray = Segment(scaleCenter, point)
-                        for j in range(1, len(hexagon) - 1):
-                            hexSegment = Segment(hexagon[i-j-1], hexagon[i-j])
-                            rayIntersect = hexSegment.intersect2D(ray, asLine=1)
-                            if rayIntersect is None:
-                                continue
-                            pointDist = (point - scaleCenter).magnitude()
-                            rayDist = (rayIntersect - scaleCenter).magnitude()
-                            minFactor = min(pointDist / rayDist, minFactor)
-
-                # Find scale factor to exclude all polygon segments
-                #    _____ diag
-                #   /    /\
-                # -/----p--\-- segment
-                #  \   /   /
-                #   \ /   /
-                #    c----  scaleCenter
-                for j in range(1, len(hexagon)):
-                    diag = Segment(scaleCenter, hexagon[i-j])
-                    for segment in segments:
-                        point = diag.intersect2D(segment)
-                        if point is None:
-                            continue
-                        pointDist = (point - scaleCenter).magnitude()
-                        diagDist = diag.magnitude2D()
-                        minFactor = min(pointDist / diagDist, minFactor)
+    hexRows = functools.partial(
+        _hexRows2D,
+        edge=edge,
+        xEnd=maxX + maxRadius,
+        xPitch=xPitch,
+        minDiameter=minDiameter,
+        maxDiameter=maxDiameter)
 
-                if minFactor > bestFactor:
-                    bestFactor = minFactor
-                    bestCenter = scaleCenter
+    # Each task receives the edge once, together with a share of the rows.
+    # The shares are interleaved, because the middle rows are the longest.
+    chunkCount = min(len(rowStarts), 1 if pool is None else pool.processes)
+    chunks = [rowStarts[i::chunkCount] for i in range(chunkCount)]
 
-            # Add scaled hexagon
-            if maxDiameter*bestFactor >= minDiameter:
-                hexagons.append(hexagon.scaled(bestFactor, bestCenter))
+    if pool is None:
+        chunkRows = [hexRows(chunk) for chunk in chunks]
+    else:
+        chunkRows = pool.map(hexRows, chunks)
 
-        row += 1
-        x = xStart + xPitch/2*(row % 2)
-        y = yStart + yPitch/2*row
+    rows = [None] * len(rowStarts)
+    for i, chunk in enumerate(chunkRows):
+        rows[i::chunkCount] = chunk
+
+    hexagons = [hexagon for hexagons in rows for hexagon in hexagons]
 
     if cornerRadius > 0:
         hexagons = [Edge(cornerArc2D(
             cornerRadius,
             hexagon[i-2],
             hexagon[i-1],
-            hexagon[i]) for i in range(6)) for hexagon in hexagons]
+            hexagon[i],
+            "hidden") for i in range(6)) for hexagon in hexagons]
+
+    return hexagons
+
+
+def _hexRows2D(rowStarts, edge, xEnd, xPitch, minDiameter, maxDiameter):
+    """Return the hexagons of each of the given rows of the grid."""
+    grid = SegmentGrid(edge.toSegments(True))
+    return [
+        _hexRow2D(rowStart, edge, grid, xEnd, xPitch, minDiameter, maxDiameter)
+        for rowStart in rowStarts]
+
+
+def _hexRow2D(rowStart, edge, grid, xEnd, xPitch, minDiameter, maxDiameter):
+    """Return the hexagons of one row of the grid."""
+    maxRadius = maxDiameter/2
+    minRadius = maxRadius/2 * 3**0.5
+
+    centers = []
+    x = rowStart.x
+    y = rowStart.y
+    while x < xEnd:
+        centers.append(Vector(x, y))
+        x += xPitch
+
+    rowHexagons = [Edge(
+        Vector(c.x - maxRadius, c.y),
+        Vector(c.x - maxRadius/2, c.y - minRadius),
+        Vector(c.x + maxRadius/2, c.y - minRadius),
+        Vector(c.x + maxRadius, c.y),
+        Vector(c.x + maxRadius/2, c.y + minRadius),
+        Vector(c.x - maxRadius/2, c.y + minRadius)) for c in centers]
+
+    # Test all centers and vertices of the row at once
+    isInside = edge.containsMany2D(centers + [p for h in rowHexagons for p in h])
+    isCenterInside = isInside[:len(centers)]
+    isVertexInside = isInside[len(centers):]
+
+    hexagons = []
+
+    for k, (center, hexagon) in enumerate(zip(centers, rowHexagons)):
+        # Check if hexagon is completely inside or outside (cheap)
+        if grid.distance2D(center) >= maxRadius:
+            if isCenterInside[k]:
+                hexagons.append(hexagon)
+            continue
+
+        # Scale down partially contained hexagon (expensive)
+        bestFactor = 0.0
+        bestCenter = None
+        segments = [grid.segments[j] for j in grid.near2D(
+            center.x - maxRadius, center.y - minRadius,
+            center.x + maxRadius, center.y + minRadius)]
+        pointsInHex = [s.a for s in segments if hexagon.contains2D(s.a)]
+
+        for i, scaleCenter in enumerate(hexagon):
+            if not isVertexInside[6*k + i]:
+                continue
+
+            minFactor = 1.0
+
+            # Find scale factor to exclude all polygon points
+            #   _____
+            #  /     \. ray
+            # /     p'\
+            # \   .'  /
+            #  \.'   /
+            #   c----  scaleCenter
+            if pointsInHex:
+                for point in pointsInHex:
+                    if point.isClose(scaleCenter):
+                        continue
+                    ray = Segment(scaleCenter, point)
+                    for j in range(1, len(hexagon) - 1):
+                        hexSegment = Segment(hexagon[i-j-1], hexagon[i-j])
+                        rayIntersect = hexSegment.intersect2D(ray, asLine=1)
+                        if rayIntersect is None:
+                            continue
+                        pointDist = (point - scaleCenter).magnitude()
+                        rayDist = (rayIntersect - scaleCenter).magnitude()
+                        minFactor = min(pointDist / rayDist, minFactor)
+
+            # Find scale factor to exclude all polygon segments
+            #    _____ diag
+            #   /    /\
+            # -/----p--\-- segment
+            #  \   /   /
+            #   \ /   /
+            #    c----  scaleCenter
+            for j in range(1, len(hexagon)):
+                diag = Segment(scaleCenter, hexagon[i-j])
+                for segment in segments:
+                    point = diag.intersect2D(segment)
+                    if point is None:
+                        continue
+                    pointDist = (point - scaleCenter).magnitude()
+                    diagDist = diag.magnitude2D()
+                    minFactor = min(pointDist / diagDist, minFactor)
+
+            if minFactor > bestFactor:
+                bestFactor = minFactor
+                bestCenter = scaleCenter
+
+        # Add scaled hexagon
+        if maxDiameter*bestFactor >= minDiameter:
+            hexagons.append(hexagon.scaled(bestFactor, bestCenter))
 
     return hexagons
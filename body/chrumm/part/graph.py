@@ -0,0 +1,126 @@
+class LazyGraph:
+    """Evaluate named values on first access and track their dependencies.
+
+    Each node is a function without arguments, together with the dotted
+    cfg names that it reads. Its value is memoized. Accesses to other
+    nodes during its evaluation are recorded, so that invalidating a node
+    also invalidates every node that was derived from it.
+    """
+
+    def __init__(self):
+        self._functions = {}
+        self._cfgNames = {}
+        self._values = {}
+        self._dependencies = {}
+        self._active = []
+        self.evaluations = []
+
+    def __contains__(self, name):
+        return name in self._functions
+
+    def define(self, name, function, cfgNames=()):
+        """Add or replace a node.
+
+        Args:
+            name (str): Unique node name, like "points.ridgeORF".
+            function (callable): Returns the value of the node.
+            cfgNames (tuple[str]): Dotted cfg names that the function
+                reads directly, like "body" or "floor.lipHeight".
+        """
+        self.invalidate(name)
+        self._functions[name] = function
+        self._cfgNames[name] = tuple(cfgNames)
+
+    def get(self, name):
+        if self._active:
+            self._dependencies[self._active[-1]].add(name)
+
+        if name not in self._values:
+            if name in self._active:
+                raise RecursionError(f"Cyclic dependency of node: {name}")
+            self._active.append(name)
+            self._dependencies[name] = set()
+            try:
+                self._values[name] = self._functions[name]()
+            finally:
+                self._active.pop()
+            self.evaluations.append(name)
+
+        return self._values[name]
+
+    def names(self, prefix=""):
+        return [name for name in self._functions if name.startswith(prefix)]
+
+    def isEvaluated(self, name):
+        return name in self._values
+
+    def invalidate(self, name):
+        """Forget the value of a node and of all nodes derived from it.
+
+        Returns:
+            list[str]: The names of the forgotten values.
+        """
+        dependents = {}
+        for node, dependencies in self._dependencies.items():
+            for dependency in dependencies:
+                dependents.setdefault(dependency, []).append(node)
+
+        invalidated = []
+        stack = [name]
+        while stack:
+            node = stack.pop()
+            if node in self._values:
+                del self._values[node]
+                invalidated.append(node)
+                stack.extend(dependents.get(node, ()))
+        return invalidated
+
+    def invalidateCfg(self, *cfgNames):
+        """Invalidate the nodes that read any of the dotted cfg names.
+
+        A section name also matches the names of its parameters,
+        and the other way around.
+
+        Returns:
+            list[str]: The names of the forgotten values.
+        """
+        invalidated = []
+        for node, nodeNames in self._cfgNames.items():
+            if any(_isRelated(a, b) for a in cfgNames for b in nodeNames):
+                invalidated.extend(self.invalidate(node))
+        return invalidated
+
+    def dump(self):
+        """Return one line per node with its state and dependencies."""
+        lines = []
+        for name in self._functions:
+            if name in self._values:
+                state = "evaluated"
+                dependencies = sorted(self._dependencies[name]) + list(self._cfgNames[name])
+            else:
+                state = "pending"
+                dependencies = list(self._cfgNames[name])
+            lines.append(f"{name} ({state}): {', '.join(dependencies) or '-'}")
+        return "\n".join(lines)
+
+
+class LazyNamespace:
+    """Provide the nodes of a graph with a common prefix as attributes."""
+
+    def __init__(self, graph, prefix):
+        self._graph = graph
+        self._prefix = prefix + "."
+
+    def __getattr__(self, name):
+        # Only called if regular attribute lookup fails
+        if name.startswith("_") or self._prefix + name not in self._graph:
+            raise AttributeError(name)
+        return self._graph.get(self._prefix + name)
+
+    def __iter__(self):
+        """Iterate over the attribute names."""
+        return (n[len(self._prefix):] for n in self._graph.names(self._prefix))
+
+
+def _isRelated(a, b):
+    return a == b or a.startswith(b + ".") or b.startswith(a + ".")
@@ -118,11 +118,11 @@ class KeyFactory:
 
         if isSideways:
             rotate = Matrix().rotatedZ(math.tau/4)
-            self.boundsI = self.boundsI.transformed(rotate)
-            self.boundsO = self.boundsO.transformed(rotate)
-            self.roofHoleI = self.roofHoleI.transformed(rotate)
-            self.roofHoleO = self.roofHoleO.transformed(rotate)
-            self.triangles = [t.transformed(rotate) for t in self.triangles]
+            self.boundsI.transform(rotate)
+            self.boundsO.transform(rotate)
+            self.roofHoleI.transform(rotate)
+            self.roofHoleO.transform(rotate)
+            self.triangles = rotate.transformTriangles(self.triangles)
 
     def make(self, units=1):
         return Key(self, units)
@@ -189,4 +189,4 @@ class Key:
 
     @property
     def triangles(self):
-        return [t.transformed(self.matrix) for t in self._factory.triangles]
+        return self.matrix.transformTriangles(self._factory.triangles)
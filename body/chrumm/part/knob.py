@@ -9,6 +9,7 @@ from chrumm.geo import Face
 from chrumm.geo import Line
 from chrumm.geo import Matrix
 from chrumm.geo import Vector
+from chrumm.geo import loft
 
 from .arc import arc2D
 
@@ -55,9 +56,7 @@ class Knob:
         skirtEdgeG = skirtSketch.translated(centerG)
         skirtEdgeT = skirtSketch.translated(shaftG)
 
-        self.triangles.extend(Edge(Vector()).meshPairwise(chamferEdge, True))
-        self.triangles.extend(chamferEdge.meshPairwise(grooveEdgeT, True))
-        self.triangles.extend(grooveEdgeT.meshPairwise(grooveEdgeG, True))
+        self.triangles.extend(loft((Edge(Vector()), chamferEdge, grooveEdgeT, grooveEdgeG), True))
 
         self.triangles.extend(skirtEdgeG.meshPairwise(skirtEdgeT, True))
         self.triangles.extend(shaftEdgeG.meshPairwise(shaftEdgeT, True))
@@ -1,3 +1,4 @@
+import copy
 import math
 
 from chrumm import cfg
@@ -87,6 +88,18 @@ class Layout:
         initThumb(self._thumbL, "left", 0, 1)
         initThumb(self._thumbR, "right", 1, -1)
 
+    def copied(self):
+        """Return a copy with its own key matrices, sharing the key geometry."""
+        def copyKey(key):
+            return copy.copy(key) if key else key
+
+        layout = copy.copy(self)
+        layout._fingersL = [[[copyKey(k) for k in g] for g in row] for row in self._fingersL]
+        layout._fingersR = [[[copyKey(k) for k in g] for g in row] for row in self._fingersR]
+        layout._thumbL = [copyKey(k) for k in self._thumbL]
+        layout._thumbR = [copyKey(k) for k in self._thumbR]
+        return layout
+
     def all(self, side="both"):
         return self.alnum(side) + self.pinky(side) + self.thumb(side)
 
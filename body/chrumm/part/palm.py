@@ -8,6 +8,7 @@ from chrumm.geo import Line
 from chrumm.geo import Matrix
 from chrumm.geo import Plane
 from chrumm.geo import Vector
+from chrumm.geo import loft
 
 from .arc import arc2D
 from .arc import cornerArc2D
@@ -21,7 +22,6 @@ class Palm:
         self.triangles = []
 
         floorHeight = cfg.floor.outerHeight
-        taperAngle = cfg.palm.taperAngle
         bodyMargin = cfg.palm.bodyMargin
         palmHeight = cfg.palm.height
         floorFillet = cfg.palm.floorFillet
@@ -39,15 +39,11 @@ class Palm:
 
         # Roof edges
 
-        planeNormal = Vector(math.cos(taperAngle), -math.sin(taperAngle))
-        planeOutset = (pinkyRF - thumbLF).magnitude() / 2
-
-        planeL = Plane(Vector(-planeOutset), planeNormal.mirroredX())
-        planeR = Plane(Vector(planeOutset), planeNormal)
+        planeL, planeR = Palm._sidePlanes(plan)
 
         roofSpine = Palm._roofSpine()
-        roofL = Edge(planeL.intersect(r) for r in roofSpine)
-        roofR = Edge(planeR.intersect(r) for r in roofSpine)
+        roofL = Edge(planeL.intersectLines(roofSpine))
+        roofR = Edge(planeR.intersectLines(roofSpine))
 
         palmBG = Vector(0, roofL[0].y, -floorHeight)
         palmFG = Vector(0, roofL[-1].y, -floorHeight)
@@ -55,11 +51,10 @@ class Palm:
         # Final height
 
         roofRaise = Vector(0, 0, palmHeight - floorHeight - max(p.z for p in roofL))
-        roofL = roofL.translated(roofRaise)
-        roofR = roofR.translated(roofRaise)
+        roofL.translate(roofRaise)
+        roofR.translate(roofRaise)
 
-        minRoofZ = min(p.z for p in roofL + roofR)
-        minPalmHeight = palmHeight - minRoofZ - floorHeight + floorFillet
+        minPalmHeight = Palm.minHeight(plan)
 
         if palmHeight <= minPalmHeight:
             raise ValueError(f"palm.height must be greater than: {minPalmHeight:.3f}")
@@ -67,22 +62,22 @@ class Palm:
         # Front ground fillet
 
         filletCenterF = Vector(0, palmFG.y + floorFillet, -floorHeight + floorFillet)
-        filletSketchF = arc2D(floorFillet, math.tau/2, math.tau/4)
+        filletSketchF = arc2D(floorFillet, math.tau/2, math.tau/4, feature="hidden")
         filletSketchF = Edge(Vector(0, p.x, p.y) + filletCenterF for p in filletSketchF)
 
         filletLinesF = [Line(p, Vector(1)) for p in filletSketchF]
-        roofL.add(planeL.intersect(f) for f in filletLinesF)
-        roofR.add(planeR.intersect(f) for f in filletLinesF)
+        roofL.add(planeL.intersectLines(filletLinesF))
+        roofR.add(planeR.intersectLines(filletLinesF))
 
         # Back ground fillet
 
         filletCenterB = Vector(0, palmBG.y - floorFillet, filletCenterF.z)
-        filletSketchB = arc2D(floorFillet, math.tau*0.75, math.tau/4)
+        filletSketchB = arc2D(floorFillet, math.tau*0.75, math.tau/4, feature="hidden")
         filletSketchB = Edge(Vector(0, p.x, p.y) + filletCenterB for p in filletSketchB)
 
         filletLinesB = [Line(p, Vector(1)) for p in filletSketchB]
-        filletLB = Edge(planeL.intersect(f) for f in filletLinesB)
-        filletRB = Edge(planeR.intersect(f) for f in filletLinesB)
+        filletLB = Edge(planeL.intersectLines(filletLinesB))
+        filletRB = Edge(planeR.intersectLines(filletLinesB))
 
         # Hitch notch
 
@@ -107,7 +102,7 @@ class Palm:
         notchTaperNormal = notchTaperOffset.normalized()
         notchTaperPlaneR = Plane(notchRBG, notchTaperNormal - planeR.normal)
 
-        notchFilletRG = Edge(notchTaperPlaneR.intersect(f) for f in filletLinesB)
+        notchFilletRG = Edge(notchTaperPlaneR.intersectLines(filletLinesB))
         notchFilletRT = notchFilletRG.translated(notchRBT - notchRBG)
         notchFilletLT = notchFilletRT.mirroredX()
         notchFilletLG = notchFilletRG.mirroredX()
@@ -141,11 +136,8 @@ class Palm:
         self.triangles.extend(roofL.meshPairwise(roofR))
         self.triangles.extend(backEdgeT.meshPairwise(backEdgeG))
         self.triangles.extend(notchEdgeG.meshPairwise(notchEdgeT))
-        self.triangles.extend(filletLB.meshPairwise(notchFilletLG))
-        self.triangles.extend(notchFilletLG.meshPairwise(notchFilletLT))
-        self.triangles.extend(notchFilletLT.meshPairwise(notchFilletRT))
-        self.triangles.extend(notchFilletRT.meshPairwise(notchFilletRG))
-        self.triangles.extend(notchFilletRG.meshPairwise(filletRB))
+        self.triangles.extend(loft((
+            filletLB, notchFilletLG, notchFilletLT, notchFilletRT, notchFilletRG, filletRB)))
 
         # Groove
 
@@ -169,18 +161,18 @@ class Palm:
             grooveSpineT = [g.translated(roofRaise) for g in grooveSpineT]
             grooveSpineG = [g.translated(roofRaise) for g in grooveSpineG]
 
-            grooveLTO = Edge(planeL.intersect(g) for g in grooveSpineT)
-            grooveLGO = Edge(planeL.intersect(g) for g in grooveSpineG)
-            grooveRTO = Edge(planeR.intersect(g) for g in grooveSpineT)
-            grooveRGO = Edge(planeR.intersect(g) for g in grooveSpineG)
+            grooveLTO = Edge(planeL.intersectLines(grooveSpineT))
+            grooveLGO = Edge(planeL.intersectLines(grooveSpineG))
+            grooveRTO = Edge(planeR.intersectLines(grooveSpineT))
+            grooveRGO = Edge(planeR.intersectLines(grooveSpineG))
 
             planeLI = Plane(planeL.pos - planeL.normal*grooveWidth, planeL.normal)
             planeRI = Plane(planeR.pos - planeR.normal*grooveWidth, planeR.normal)
 
-            grooveLTI = Edge(planeLI.intersect(g) for g in grooveSpineT)
-            grooveLGI = Edge(planeLI.intersect(g) for g in grooveSpineG)
-            grooveRTI = Edge(planeRI.intersect(g) for g in grooveSpineT)
-            grooveRGI = Edge(planeRI.intersect(g) for g in grooveSpineG)
+            grooveLTI = Edge(planeLI.intersectLines(grooveSpineT))
+            grooveLGI = Edge(planeLI.intersectLines(grooveSpineG))
+            grooveRTI = Edge(planeRI.intersectLines(grooveSpineT))
+            grooveRGI = Edge(planeRI.intersectLines(grooveSpineG))
 
             for edge in (
                     grooveLTO, grooveLGO, grooveRTO, grooveRGO,
@@ -286,6 +278,30 @@ class Palm:
         for face in self.faces:
             face.edge = face.edge.transformed(placeMatrix)
 
+    @staticmethod
+    def minHeight(plan):
+        """Return the lower limit of palm.height, to fit the front ground fillet."""
+        planeL, planeR = Palm._sidePlanes(plan)
+        roofSpine = Palm._roofSpine()
+        roofL = Edge(planeL.intersectLines(roofSpine))
+        roofR = Edge(planeR.intersectLines(roofSpine))
+        roofHeight = max(p.z for p in roofL) - min(p.z for p in roofL + roofR)
+        return roofHeight + cfg.palm.floorFillet
+
+    @staticmethod
+    def _sidePlanes(plan):
+        """Return the tapered planes of the left and right side."""
+        taperAngle = cfg.palm.taperAngle
+        thumbLF = plan.points.thumbOLF.xy
+        pinkyRF = plan.points.pinkyORF.xy
+
+        planeNormal = Vector(math.cos(taperAngle), -math.sin(taperAngle))
+        planeOutset = (pinkyRF - thumbLF).magnitude() / 2
+
+        planeL = Plane(Vector(-planeOutset), planeNormal.mirroredX())
+        planeR = Plane(Vector(planeOutset), planeNormal)
+        return planeL, planeR
+
     @staticmethod
     def _roofSpine(inset=0):
         """Return list of lines that describe the roof profile."""
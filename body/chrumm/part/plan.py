@@ -1,3 +1,4 @@
+import functools
 import logging
 import math
 import types
@@ -11,6 +12,8 @@ from chrumm.geo import Plane
 from chrumm.geo import Vector
 
 from .boss import Boss
+from .graph import LazyGraph
+from .graph import LazyNamespace
 from .layout import Layout
 
 
@@ -34,24 +37,126 @@ log = logging.getLogger(__name__)
 # This allows for distinct abbreviations in code.
 
 
+# Planes of the body walls, where I and O denote inner and outer
+PLANES = (
+    "alnumIT", "alnumOT", "pivotIB", "pivotOB",
+    "thumbIT", "thumbOT", "pivotIF", "pivotOF",
+    "pinkyIT", "pinkyOT", "alnumIL", "alnumOL",
+    "alnumIF", "alnumOF", "pinkyIR", "pinkyOR",
+    "alnumIB", "alnumOB", "pinkyIF", "pinkyOF",
+    "thumbIL", "thumbOL")
+
+# Body reference points, as intersections of three planes
+BODY_POINTS = {
+    "alnumILF": ("alnumIL", "alnumIF", "alnumIT"),
+    "alnumILB": ("alnumIL", "alnumIB", "alnumIT"),
+    "alnumIRF": ("thumbIT", "alnumIF", "alnumIT"),
+    "alnumIRB": ("pivotIB", "alnumIB", "alnumIT"),
+    "pinkyIRF": ("pinkyIR", "pinkyIF", "pinkyIT"),
+    "pinkyIRB": ("pinkyIR", "alnumIB", "pinkyIT"),
+    "thumbILF": ("thumbIL", "pinkyIF", "thumbIT"),
+    "thumbILB": ("alnumIL", "alnumIF", "thumbIT"),
+    "thumbIRF": ("pivotIF", "pinkyIF", "thumbIT"),
+    "alnumOLF": ("alnumOL", "alnumOF", "alnumOT"),
+    "alnumOLB": ("alnumOL", "alnumOB", "alnumOT"),
+    "alnumORF": ("thumbOT", "alnumOF", "alnumOT"),
+    "alnumORB": ("pivotOB", "alnumOB", "alnumOT"),
+    "pinkyORF": ("pinkyOR", "pinkyOF", "pinkyOT"),
+    "pinkyORB": ("pinkyOR", "alnumOB", "pinkyOT"),
+    "thumbOLF": ("thumbOL", "pinkyOF", "thumbOT"),
+    "thumbOLB": ("alnumOL", "alnumOF", "thumbOT"),
+    "thumbORF": ("pivotOF", "pinkyOF", "thumbOT")}
+
+# Hitch reference points, set if the palm rest is enabled
+HITCH_POINTS = ("hitchOLB", "hitchORB", "hitchOLF", "hitchORF")
+
+# Dotted cfg names that are read by the nodes of a plan
+FRAME_CFG = ("body", "layout", "switch", "boss.diameter", "boss.outerWallMargin")
+CHECK_CFG = (
+    "floor.lipHeight", "floor.outerHeight", "floor.innerHeight",
+    "body.innerChamfer", "switch.floorMargin")
+BOSS_CFG = ("body", "boss", "floor", "support", "quality")
+HITCH_CFG = ("palm",)
+
+
 class Plan:
     """Determine the arrangement of keys, bosses, and reference points.
 
     The geometry is always constructed on the right side, regardless of the
     side argument. Otherwise, each part would need to be implemented twice.
     The triangles of the left side are mirrored after construction.
+
+    The planes, points, and bosses are nodes of a lazy graph, which are
+    evaluated on first access. Nodes can be invalidated by the cfg names
+    that they depend on, so that a plan can be reused with other values.
     """
 
     def __init__(self, side):
         self.side = side
-        self.points = types.SimpleNamespace()
-        self.planes = types.SimpleNamespace()
-        self.bosses = types.SimpleNamespace()
-        self.layout = Layout()
+        self.graph = LazyGraph()
+        self.points = LazyNamespace(self.graph, "points")
+        self.planes = LazyNamespace(self.graph, "planes")
+        self.bosses = LazyNamespace(self.graph, "bosses")
+
+        graph = self.graph
+        graph.define("frame", self._frame, FRAME_CFG)
+        graph.define("check", self._check, CHECK_CFG)
+
+        for name in PLANES:
+            graph.define("planes." + name, functools.partial(self._plane, name))
+        for name in "ridgeIRF", "ridgeORF":
+            graph.define("points." + name, functools.partial(self._ridgePoint, name))
+        for name in BODY_POINTS:
+            graph.define("points." + name, functools.partial(self._bodyPoint, name))
+
+        for name, lines, plane in (
+                ("alnumB", "alnumLinesB", "alnumOT"),
+                ("pinkyB", "alnumLinesB", "pinkyOT"),
+                ("pinkyF", "thumbLinesF", "pinkyOT"),
+                ("thumbF", "thumbLinesF", "thumbOT")):
+            boss = functools.partial(self._boss, name, lines, plane)
+            graph.define("bosses." + name, boss, BOSS_CFG)
+
+        if cfg.palm:
+            graph.define("hitch", self._hitch, HITCH_CFG)
+            for name in HITCH_POINTS:
+                graph.define("points." + name, functools.partial(self._hitchPoint, name))
+            for name in "hitchL", "hitchR":
+                graph.define("bosses." + name, functools.partial(self._hitchBoss, name), BOSS_CFG)
+
+    @property
+    def layout(self):
+        return self.graph.get("frame").layout
+
+    def check(self):
+        """Raise a ValueError, if the body or the switches overlap the floor.
+
+        The check is evaluated by the body, which is the first part that
+        relies on it, so that other parts do not evaluate the body points.
+        """
+        self.graph.get("check")
+
+    def invalidate(self, *cfgNames):
+        """Forget the nodes that depend on the given dotted cfg names.
+
+        Returns:
+            list[str]: The names of the forgotten nodes.
+        """
+        return self.graph.invalidateCfg(*cfgNames)
+
+    def dump(self):
+        """Return which nodes were evaluated, with their dependencies."""
+        return self.graph.dump()
+
+    def _frame(self):
+        """Arrange the keys and return the planes before the final z position.
 
-        # Shorthand
-        points = self.points
-        planes = self.planes
+        The keys are moved along with the planes, so this cannot be split.
+        """
+        side = self.side
+        layout = Layout()
+        points = types.SimpleNamespace()
+        planes = types.SimpleNamespace()
 
         splitAngle = cfg.body.splitAngle
         tiltAngle = cfg.body.tiltAngle
@@ -75,11 +180,11 @@ class Plan:
 
         creaseOffset = Plan._tentCreaseOffset()
 
-        for key in self.layout.alnum() + self.layout.thumb():
+        for key in layout.alnum() + layout.thumb():
             key.translate(creaseOffset)
 
-        alnumMax = self.layout.maxAlnum().position
-        pinkyMin = self.layout.minPinky().position
+        alnumMax = layout.maxAlnum().position
+        pinkyMin = layout.minPinky().position
         pivotPos = (alnumMax + pinkyMin) / 2
 
         # Alnum tent
@@ -93,7 +198,7 @@ class Plan:
         planes.pivotIB = Plane.fromX(pivotPos.x).transformed(alnumPivotMatrix)
         planes.pivotOB = Plane.fromX(pivotPos.x).transformed(alnumPivotMatrix)
 
-        for key in self.layout.alnum():
+        for key in layout.alnum():
             key.transform(alnumTentMatrix)
 
         # Thumb tent
@@ -107,7 +212,7 @@ class Plan:
         planes.pivotIF = Plane.fromX(pivotPos.x).transformed(thumbPivotMatrix)
         planes.pivotOF = Plane.fromX(pivotPos.x).transformed(thumbPivotMatrix)
 
-        for key in self.layout.thumb():
+        for key in layout.thumb():
             key.transform(thumbTentMatrix)
 
         # Pinky tent
@@ -117,22 +222,22 @@ class Plan:
         planes.pinkyIT = Plane.fromZ(-roofThickness).transformed(pinkyTentMatrix)
         planes.pinkyOT = Plane.fromZ(0).transformed(pinkyTentMatrix)
 
-        for key in self.layout.pinky():
+        for key in layout.pinky():
             key.transform(pinkyTentMatrix)
 
         # Alnum walls
 
-        alnumMinX = min(p.x for key in self.layout.alnum() for p in key.bounds)
+        alnumMinX = min(p.x for key in layout.alnum() for p in key.bounds)
         planes.alnumIL = Plane.fromX(alnumMinX)
         planes.alnumOL = Plane.fromX(alnumMinX)
 
-        alnumLinesF = Plan._wallLines2D(self.layout.alnum(), alnumFrontThickness, alnumFrontAngle)
+        alnumLinesF = Plan._wallLines2D(layout.alnum(), alnumFrontThickness, alnumFrontAngle)
         planes.alnumIF = Plane.fromLine2D(alnumLinesF[0])
         planes.alnumOF = Plane.fromLine2D(alnumLinesF[1])
 
         # Move thumb cluster against alnum wall
 
-        thumbBounds = [p for key in self.layout.thumb() for p in key.boundsO]
+        thumbBounds = [p for key in layout.thumb() for p in key.boundsO]
         alnumSlope = alnumLinesF[1].dir.y / alnumLinesF[1].dir.x
         alnumIntercept = alnumLinesF[1].pos.y - alnumLinesF[1].pos.x*alnumSlope
         thumbIntercept = max(p.y - p.x*alnumSlope for p in thumbBounds)
@@ -140,12 +245,12 @@ class Plan:
 
         if thumbDelta.y < 0:
             log.debug("The %s thumb cluster is moved forward by: %.3f", side, -thumbDelta.y)
-            for key in self.layout.thumb():
+            for key in layout.thumb():
                 key.translate(thumbDelta)
 
         # Pinky walls
 
-        pinkyLinesR = Plan._wallLines2D(self.layout.pinky(side), wallThickness, math.tau/4)
+        pinkyLinesR = Plan._wallLines2D(layout.pinky(side), wallThickness, math.tau/4)
         planes.pinkyIR = Plane.fromLine2D(pinkyLinesR[0])
         planes.pinkyOR = Plane.fromLine2D(pinkyLinesR[1])
 
@@ -153,7 +258,7 @@ class Plan:
 
         tiltSplitMatrix = Matrix().rotatedX(tiltAngle).rotatedZ(splitAngle)
 
-        for key in self.layout.all():
+        for key in layout.all():
             key.transform(tiltSplitMatrix)
         for attr in planes.__dict__:
             setattr(planes, attr, getattr(planes, attr).transformed(tiltSplitMatrix))
@@ -163,17 +268,17 @@ class Plan:
         wallAngleB = alnumBackAngle + splitAngle + math.pi
         wallAngleF = thumbFrontAngle + splitAngle
 
-        alnumLinesB = Plan._wallLines2D(self.layout.all(), wallThickness, wallAngleB)
-        thumbLinesF = Plan._wallLines2D(self.layout.all(), wallThickness, wallAngleF)
+        alnumLinesB = Plan._wallLines2D(layout.all(), wallThickness, wallAngleB)
+        thumbLinesF = Plan._wallLines2D(layout.all(), wallThickness, wallAngleF)
 
         # Screw boss positions
 
         def fitBosses(side):
-            pinkyKeysB = self.layout.perPinkyCol(0, side)
-            pinkyKeysF = self.layout.perPinkyCol(-1, side)
-            thumbKeysF = self.layout.thumb(side)
+            pinkyKeysB = layout.perPinkyCol(0, side)
+            pinkyKeysF = layout.perPinkyCol(-1, side)
+            thumbKeysF = layout.thumb(side)
             alnumKeysB = Plan._alnumBossKeys(
-                self.layout.perAlnumCol(0, side),
+                layout.perAlnumCol(0, side),
                 Plane.fromX(0),
                 planes.pivotOF,
                 Plane.fromLine2D(alnumLinesB[1]),
@@ -206,11 +311,11 @@ class Plan:
         alnumILB = planes.alnumIL.intersect(planes.alnumIB, planes.alnumIT)
         alnumOLB = planes.alnumOL.intersect(planes.alnumOB, planes.alnumOT)
 
-        boundsDeltaX = -min(p.x for key in self.layout.all() for p in key.bounds)
+        boundsDeltaX = -min(p.x for key in layout.all() for p in key.bounds)
         splitDeltaX = -min(alnumOLB.x, alnumILB.x) + minRidgeWidth/2
         delta = Vector(max(boundsDeltaX, splitDeltaX))
 
-        for key in self.layout.all():
+        for key in layout.all():
             key.translate(delta)
         for attr in planes.__dict__:
             setattr(planes, attr, getattr(planes, attr).translated(delta))
@@ -224,9 +329,9 @@ class Plan:
 
         # Thumb left front corner
 
-        thumbBounds = [p for key in self.layout.thumb() for p in key.bounds]
-        thumbDirL = Vector(0, 1).transformedNormal(self.layout.thumb("left")[0].matrix)
-        thumbDirR = Vector(0, 1).transformedNormal(self.layout.thumb("right")[0].matrix)
+        thumbBounds = [p for key in layout.thumb() for p in key.bounds]
+        thumbDirL = Vector(0, 1).transformedNormal(layout.thumb("left")[0].matrix)
+        thumbDirR = Vector(0, 1).transformedNormal(layout.thumb("right")[0].matrix)
         thumbLine = Line(Vector(), thumbDirL.xy + thumbDirR.xy)
         thumbOffset = min(thumbLine.distance2D(p) for p in thumbBounds)
         thumbLine = thumbLine.translated(thumbLine.dir.ortho2D()*-thumbOffset)
@@ -266,42 +371,47 @@ class Plan:
                 "  Try to increase body.minRidgeWidth, body.splitAngle,\n"
                 "  or decrease body.relRidgeTaper.")
 
-        # Body reference points
-
-        points.alnumILF = planes.alnumIL.intersect(planes.alnumIF, planes.alnumIT)
-        points.alnumILB = planes.alnumIL.intersect(planes.alnumIB, planes.alnumIT)
-        points.alnumIRF = planes.thumbIT.intersect(planes.alnumIF, planes.alnumIT)
-        points.alnumIRB = planes.pivotIB.intersect(planes.alnumIB, planes.alnumIT)
-        points.pinkyIRF = planes.pinkyIR.intersect(planes.pinkyIF, planes.pinkyIT)
-        points.pinkyIRB = planes.pinkyIR.intersect(planes.alnumIB, planes.pinkyIT)
-        points.thumbILF = planes.thumbIL.intersect(planes.pinkyIF, planes.thumbIT)
-        points.thumbILB = planes.alnumIL.intersect(planes.alnumIF, planes.thumbIT)
-        points.thumbIRF = planes.pivotIF.intersect(planes.pinkyIF, planes.thumbIT)
-
-        points.alnumOLF = planes.alnumOL.intersect(planes.alnumOF, planes.alnumOT)
-        points.alnumOLB = planes.alnumOL.intersect(planes.alnumOB, planes.alnumOT)
-        points.alnumORF = planes.thumbOT.intersect(planes.alnumOF, planes.alnumOT)
-        points.alnumORB = planes.pivotOB.intersect(planes.alnumOB, planes.alnumOT)
-        points.pinkyORF = planes.pinkyOR.intersect(planes.pinkyOF, planes.pinkyOT)
-        points.pinkyORB = planes.pinkyOR.intersect(planes.alnumOB, planes.pinkyOT)
-        points.thumbOLF = planes.thumbOL.intersect(planes.pinkyOF, planes.thumbOT)
-        points.thumbOLB = planes.alnumOL.intersect(planes.alnumOF, planes.thumbOT)
-        points.thumbORF = planes.pivotOF.intersect(planes.pinkyOF, planes.thumbOT)
-
         # Final z position
 
-        minKeyZ = min(key.position.z for key in self.layout.all())
+        minKeyZ = min(key.position.z for key in layout.all())
         delta = Vector(0, 0, minRoofHeight - minKeyZ)
 
-        for key in self.layout.all():
+        for key in layout.all():
             key.translate(delta)
-        for obj in planes, points:
-            for attr in obj.__dict__:
-                setattr(obj, attr, getattr(obj, attr).translated(delta))
 
-        # Check z overlaps
-
-        minBodyZ = min(p.z for p in points.__dict__.values())
+        return types.SimpleNamespace(
+            layout=layout,
+            planes=planes,
+            points=points,
+            zDelta=delta,
+            alnumLinesB=alnumLinesB,
+            thumbLinesF=thumbLinesF,
+            bossPositions={
+                "alnumB": bossAlnumB,
+                "pinkyB": bossPinkyB,
+                "pinkyF": bossPinkyF,
+                "thumbF": bossThumbF})
+
+    def _plane(self, name):
+        frame = self.graph.get("frame")
+        return getattr(frame.planes, name).translated(frame.zDelta)
+
+    def _ridgePoint(self, name):
+        frame = self.graph.get("frame")
+        return getattr(frame.points, name).translated(frame.zDelta)
+
+    def _bodyPoint(self, name):
+        # The planes are intersected before the final z position,
+        # which keeps the coordinates identical to moving the points.
+        frame = self.graph.get("frame")
+        a, b, c = (getattr(frame.planes, plane) for plane in BODY_POINTS[name])
+        return a.intersect(b, c).translated(frame.zDelta)
+
+    def _check(self):
+        """Check z overlaps."""
+        side = self.side
+        names = ["ridgeIRF", "ridgeORF"] + list(BODY_POINTS)
+        minBodyZ = min(self.graph.get("points." + name).z for name in names)
         minPinZ = min(p.z for key in self.layout.all(side) for p in key.boundsI)
 
         lipGap = minBodyZ - cfg.floor.lipHeight - cfg.body.innerChamfer
@@ -316,50 +426,58 @@ class Plan:
         log.debug("Gap between %s body and floor lip: %.3f", side, lipGap)
         log.debug("Gap between %s switches and floor: %.3f", side, pinGap)
 
-        # Bosses
-
-        self.bosses.alnumB = Boss(bossAlnumB, Vector(1), alnumLinesB[0].dir, planes.alnumOT)
-        self.bosses.pinkyB = Boss(bossPinkyB, Vector(1), alnumLinesB[0].dir, planes.pinkyOT)
-        self.bosses.pinkyF = Boss(bossPinkyF, Vector(1), thumbLinesF[0].dir, planes.pinkyOT)
-        self.bosses.thumbF = Boss(bossThumbF, Vector(1), thumbLinesF[0].dir, planes.thumbOT)
-
-        # Palm hitch
-
-        if cfg.palm:
-            hitchD = cfg.palm.hitchDepth
-            hitchPitch = cfg.palm.hitchScrewPitch
-            hitchMargin = cfg.palm.bodyMargin
-            hitchTaperAngle = cfg.palm.taperAngle
-
-            pinkyRFG = points.pinkyORF.xy
-            thumbLFG = points.thumbOLF.xy
-
-            wallDir = (thumbLFG - pinkyRFG).normalized()
-            wallOrtho = wallDir.ortho2D()
-            hitchDirL = wallOrtho.transformed(Matrix().rotatedZ(hitchTaperAngle))
-            hitchDirR = -wallOrtho.transformed(Matrix().rotatedZ(-hitchTaperAngle))
-            hitchOrthoL = hitchDirL.ortho2D()
-            hitchOrthoR = hitchDirR.ortho2D()
-
-            hitchB = (thumbLFG + pinkyRFG)/2
-            hitchM = hitchB + wallOrtho*(hitchMargin + hitchD/2)
-            hitchF = hitchB + wallOrtho*(hitchMargin + hitchD)
-
-            hitchBossL = hitchM + wallDir*hitchPitch/2
-            hitchBossR = hitchM - wallDir*hitchPitch/2
-
-            hitchLineB = Line(hitchB, wallDir)
-            hitchLineF = Line(hitchF, wallDir)
-            hitchLineL = Line(hitchBossL - hitchOrthoL*hitchD/2, hitchDirL)
-            hitchLineR = Line(hitchBossR - hitchOrthoR*hitchD/2, hitchDirR)
-
-            points.hitchOLB = hitchLineB.intersect(hitchLineL)
-            points.hitchORB = hitchLineB.intersect(hitchLineR)
-            points.hitchOLF = hitchLineF.intersect(hitchLineL)
-            points.hitchORF = hitchLineF.intersect(hitchLineR)
-
-            self.bosses.hitchL = Boss(hitchBossL, hitchOrthoL)
-            self.bosses.hitchR = Boss(hitchBossR, hitchOrthoL)
+    def _boss(self, name, lines, plane):
+        frame = self.graph.get("frame")
+        direction = getattr(frame, lines)[0].dir
+        return Boss(frame.bossPositions[name], Vector(1), direction, getattr(self.planes, plane))
+
+    def _hitch(self):
+        """Palm hitch."""
+        hitchD = cfg.palm.hitchDepth
+        hitchPitch = cfg.palm.hitchScrewPitch
+        hitchMargin = cfg.palm.bodyMargin
+        hitchTaperAngle = cfg.palm.taperAngle
+
+        pinkyRFG = self.points.pinkyORF.xy
+        thumbLFG = self.points.thumbOLF.xy
+
+        wallDir = (thumbLFG - pinkyRFG).normalized()
+        wallOrtho = wallDir.ortho2D()
+        hitchDirL = wallOrtho.transformed(Matrix().rotatedZ(hitchTaperAngle))
+        hitchDirR = -wallOrtho.transformed(Matrix().rotatedZ(-hitchTaperAngle))
+        hitchOrthoL = hitchDirL.ortho2D()
+        hitchOrthoR = hitchDirR.ortho2D()
+
+        hitchB = (thumbLFG + pinkyRFG)/2
+        hitchM = hitchB + wallOrtho*(hitchMargin + hitchD/2)
+        hitchF = hitchB + wallOrtho*(hitchMargin + hitchD)
+
+        hitchBossL = hitchM + wallDir*hitchPitch/2
+        hitchBossR = hitchM - wallDir*hitchPitch/2
+
+        hitchLineB = Line(hitchB, wallDir)
+        hitchLineF = Line(hitchF, wallDir)
+        hitchLineL = Line(hitchBossL - hitchOrthoL*hitchD/2, hitchDirL)
+        hitchLineR = Line(hitchBossR - hitchOrthoR*hitchD/2, hitchDirR)
+
+        hitchOLB, hitchORB = hitchLineB.intersectMany((hitchLineL, hitchLineR))
+        hitchOLF, hitchORF = hitchLineF.intersectMany((hitchLineL, hitchLineR))
+
+        return types.SimpleNamespace(
+            points={
+                "hitchOLB": hitchOLB,
+                "hitchORB": hitchORB,
+                "hitchOLF": hitchOLF,
+                "hitchORF": hitchORF},
+            bosses={
+                "hitchL": (hitchBossL, hitchOrthoL),
+                "hitchR": (hitchBossR, hitchOrthoL)})
+
+    def _hitchPoint(self, name):
+        return self.graph.get("hitch").points[name]
+
+    def _hitchBoss(self, name):
+        return Boss(*self.graph.get("hitch").bosses[name])
 
     @staticmethod
     def _tentCreaseOffset():
@@ -444,8 +562,7 @@ class Plan:
         # If no positions is valid, move the wall outward and repeat.
         while True:
             bossLine = wallLines[1].translated(bossDelta)
-            intersect0 = bossLine.intersect(line0)
-            intersect1 = bossLine.intersect(line1)
+            intersect0, intersect1 = bossLine.intersectMany((line0, line1))
             bossMiddle = (intersect0 + intersect1)/2
 
             # Oscillate around the middle to find a valid position
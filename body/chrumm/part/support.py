@@ -52,15 +52,16 @@ class SupportFactory:
         centerL = Vector(-holeW/2 + baseGap, baseW/2 - baseD/2, -baseInset)
         centerR = Vector(holeW/2 - topGap, topW/2 - topD/2, -topInset)
 
-        arc = Edge(Vector(0, p.y, -p.x) for p in arc2D(topD/2, 0, math.pi))
-        edgeL = arc.scaled(baseD/topD).translated(centerL)
+        arc = Edge(Vector(0, p.y, -p.x) for p in arc2D(topD/2, 0, math.pi, feature="hidden"))
+        edgeL = arc.scaled(baseD/topD)
+        edgeL.translate(centerL)
         edgeR = arc.translated(centerR)
 
         edgeL.add(edgeL.mirroredY().reversed())
         edgeR.add(edgeR.mirroredY().reversed())
 
         baseMove = Vector(0, (topW - baseW)/2 - (topW - baseW)*relBasePos)
-        edgeL = edgeL.translated(baseMove)
+        edgeL.translate(baseMove)
 
         self.triangles.extend(edgeL.meshPairwise(edgeR, True))
         self.triangles.extend(Face(edgeL.reversed()).triangulate())
@@ -70,7 +71,7 @@ class SupportFactory:
         angle = abs(Vector(1, 0).transformedNormal(key.matrix).angle2D())
 
         if angle <= cfg.support.minOverhangAngle:
-            return [t.transformed(key.matrix) for t in self.triangles]
+            return key.matrix.transformTriangles(self.triangles)
 
         return []
 
@@ -0,0 +1,76 @@
+"""Allocate arc segments per feature class."""
+# Not every surface deserves the same resolution. Small fillets
+# on the ground or inside the body are invisible after assembly,
+# but they would get the same number of segments per radian as
+# the large curves on the outside. Each arc is therefore tagged
+# with a feature class, whose chord height is scaled individually:
+#
+# - visible:  Exterior surfaces and functional fits (default)
+# - internal: Surfaces inside the assembled keyboard
+# - hidden:   Surfaces that face the desk or are removed after printing
+#
+# The scales are provided via quality.featureScales, for example:
+#   "featureScales": {"internal": 4, "hidden": 16}
+#
+# The chord angle is scaled by the square root, because the
+# sagitta of a chord grows approximately with its angle squared.
+
+import math
+import types
+
+from chrumm import cfg
+
+
+FEATURES = ("visible", "internal", "hidden")
+
+# Features that are coarsened to meet quality.maxTriangles
+BUDGET_FEATURES = ("internal", "hidden")
+
+_segmentCounts = dict.fromkeys(FEATURES, 0)
+
+
+def chordLimits(feature):
+    """Return the maximum chord height and angle of the feature class."""
+    if feature not in _segmentCounts:
+        raise ValueError(f"Unknown tessellation feature: {feature}")
+
+    maxChordHeight = cfg.quality.maxChordHeight
+    maxChordAngle = cfg.quality.maxChordAngle
+    scale = getattr(getattr(cfg.quality, "featureScales", None), feature, 1)
+
+    if scale == 1:
+        return maxChordHeight, maxChordAngle
+
+    # The angle limit avoids degenerate circles
+    return maxChordHeight*scale, min(maxChordAngle*scale**0.5, math.tau/6)
+
+
+def budgetScales(budgetScale):
+    """Return quality.featureScales, with the budget features scaled up."""
+    scales = getattr(cfg.quality, "featureScales", None)
+    scaled = types.SimpleNamespace()
+    for feature in FEATURES:
+        scale = getattr(scales, feature, 1)
+        if feature in BUDGET_FEATURES:
+            scale *= budgetScale
+        setattr(scaled, feature, scale)
+    return scaled
+
+
+def countSegments(feature, count):
+    _segmentCounts[feature] += count
+
+
+def segmentCounts():
+    """Return the number of arc segments per feature since the last reset.
+
+    Arcs are only generated in the main process, so that the counts
+    of worker processes remain zero.
+    """
+    return dict(_segmentCounts)
+
+
+def resetSegmentCounts():
+    """Reset the counts, so that each call of make starts at zero."""
+    for feature in FEATURES:
+        _segmentCounts[feature] = 0
@@ -0,0 +1,84 @@
+import unittest
+
+from ..graph import LazyGraph
+from ..graph import LazyNamespace
+
+
+class LazyGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.values = {"a": 1, "b": 2}
+        graph = LazyGraph()
+        graph.define("points.a", lambda: self.values["a"], ("body.a",))
+        graph.define("points.b", lambda: self.values["b"], ("floor",))
+        graph.define("sum", lambda: graph.get("points.a") + graph.get("points.b"))
+        graph.define("double", lambda: graph.get("sum") * 2)
+        self.graph = graph
+
+    def test_get(self):
+        self.assertFalse(self.graph.isEvaluated("double"))
+        self.assertEqual(self.graph.get("double"), 6)
+        self.assertEqual(self.graph.get("double"), 6)
+        self.assertEqual(self.graph.evaluations, ["points.a", "points.b", "sum", "double"])
+        self.assertTrue(self.graph.isEvaluated("sum"))
+
+    def test_define(self):
+        self.assertIn("sum", self.graph)
+        self.assertNotIn("points.c", self.graph)
+        self.assertEqual(self.graph.names("points."), ["points.a", "points.b"])
+
+        # Replacing a node invalidates its dependents
+        self.assertEqual(self.graph.get("double"), 6)
+        self.graph.define("points.a", lambda: 10)
+        self.assertFalse(self.graph.isEvaluated("double"))
+        self.assertEqual(self.graph.get("double"), 24)
+
+    def test_cycle(self):
+        self.graph.define("points.a", lambda: self.graph.get("sum"))
+        with self.assertRaises(RecursionError):
+            self.graph.get("sum")
+
+    def test_invalidate(self):
+        self.graph.get("double")
+        self.values["a"] = 5
+        invalidated = self.graph.invalidate("points.a")
+        self.assertEqual(invalidated, ["points.a", "sum", "double"])
+        self.assertTrue(self.graph.isEvaluated("points.b"))
+        self.assertEqual(self.graph.get("double"), 14)
+
+        # Pending nodes are not reported
+        self.assertEqual(self.graph.invalidate("points.a"), ["points.a", "sum", "double"])
+        self.assertEqual(self.graph.invalidate("points.a"), [])
+
+    def test_invalidateCfg(self):
+        self.graph.get("double")
+        self.values["b"] = 4
+
+        # Unrelated and partially matching names
+        self.assertEqual(self.graph.invalidateCfg("body.ab", "floors", "palm"), [])
+        self.assertEqual(self.graph.get("double"), 6)
+
+        # A parameter of a section
+        invalidated = self.graph.invalidateCfg("floor.lipHeight")
+        self.assertEqual(invalidated, ["points.b", "sum", "double"])
+        self.assertEqual(self.graph.get("double"), 10)
+
+        # A section of a parameter
+        self.assertEqual(self.graph.invalidateCfg("body"), ["points.a", "sum", "double"])
+        self.assertEqual(self.graph.invalidateCfg("body.a"), [])
+
+
+class LazyNamespaceTest(unittest.TestCase):
+
+    def test_getattr(self):
+        graph = LazyGraph()
+        graph.define("points.a", lambda: 1)
+        graph.define("pointsB", lambda: 2)
+        points = LazyNamespace(graph, "points")
+
+        self.assertEqual(points.a, 1)
+        self.assertEqual(list(points), ["a"])
+        with self.assertRaises(AttributeError):
+            points.b
+        with self.assertRaises(AttributeError):
+            points._graph2
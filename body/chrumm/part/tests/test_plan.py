@@ -0,0 +1,137 @@
+import json
+import pathlib
+import unittest
+
+import chrumm
+
+from chrumm import cfg
+from chrumm.geo import Edge
+from chrumm.geo import Triangle
+from chrumm.geo import Vector
+from chrumm.make import flatParameters
+from chrumm.sweep import overrideLayer
+
+from ..body import Body
+from ..plan import BOSS_CFG
+from ..plan import CHECK_CFG
+from ..plan import FRAME_CFG
+from ..plan import HITCH_CFG
+from ..plan import Plan
+from ..support import Support
+
+
+BASE_STRING = (pathlib.Path(__file__).parents[3] / "chrumm.json").read_text()
+
+# Parts that read the plan, in a quick build of one side
+PLAN_PARTS = ["body", "floor", "palm", "support"]
+
+# Shorter boss threads, so that small changes keep the parameters valid
+SESSION_STRING = json.dumps({"boss": {"minThreadLength": 5.5}})
+
+
+class PlanTest(unittest.TestCase):
+
+    def setUp(self):
+        cfg._init([BASE_STRING])
+
+    def test_lazy(self):
+        plan = Plan("right")
+        self.assertEqual(plan.graph.evaluations, [])
+
+        # Parts other than the body do not evaluate the checks
+        Support(plan)
+        self.assertFalse(plan.graph.isEvaluated("check"))
+        Body(plan)
+        self.assertTrue(plan.graph.isEvaluated("check"))
+
+    def test_invalidate(self):
+        # Every parameter is changed in a reused plan. The invalidated
+        # plan must equal a fresh plan, otherwise a node reads a
+        # parameter that is missing from its cfg names. The plan is
+        # restored afterwards, which is checked by the next parameter.
+        plan = Plan("right")
+        _planValues(plan)
+        parameters = flatParameters([BASE_STRING])
+
+        for name, value in parameters.items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            with self.subTest(name), cfg._Override({name: _changed(cfg._get(name))}):
+                try:
+                    expected = _planValues(Plan("right"))
+                except Exception:
+                    # The changed value is invalid
+                    continue
+                plan.invalidate(name)
+                values = _planValues(plan)
+                self.assertEqual([n for n in expected if values[n] != expected[n]], [])
+
+            plan.invalidate(name)
+
+    def test_sessionReuse(self):
+        # The cfg names of the plan nodes are changed between the calls
+        # of a session. Sections are changed by one of their parameters.
+        baseStrings = [BASE_STRING, SESSION_STRING]
+        parameters = flatParameters(baseStrings)
+        names = []
+        for cfgName in dict.fromkeys(FRAME_CFG + CHECK_CFG + BOSS_CFG + HITCH_CFG):
+            names.append(next(
+                n for n, v in parameters.items()
+                if (n == cfgName or n.startswith(cfgName + "."))
+                and isinstance(v, (int, float)) and not isinstance(v, bool)
+                and not n.endswith("Count")))
+
+        makeArgs = {"parts": PLAN_PARTS, "side": "right", "isPreview": True}
+        with chrumm.Session(threads=1) as session:
+            session.make(baseStrings, **makeArgs)
+            for name in names:
+                with self.subTest(name):
+                    layer = overrideLayer({name: parameters[name] * 0.98})
+                    jsonStrings = baseStrings + [json.dumps(layer)]
+                    expected = chrumm.make(jsonStrings, 1, False, **makeArgs)
+                    self.assertEqual(session.make(jsonStrings, **makeArgs), expected)
+
+    def test_previewReuse(self):
+        # The final build reuses the plans of the preview build
+        makeArgs = {"parts": PLAN_PARTS, "side": "right"}
+        files = chrumm.make([BASE_STRING], 1, False, isPreview=True, isFinal=True, **makeArgs)
+        expected = chrumm.make([BASE_STRING], 1, False, **makeArgs)
+        self.assertEqual({n: files[n] for n in expected}, expected)
+
+
+def _changed(value):
+    if isinstance(value, int):
+        return value + 1
+    return value * 1.05 if value else 0.5
+
+
+def _planValues(plan):
+    """Return the values of all nodes as plain data, which can be compared."""
+    return {name: _plain(plan.graph.get(name), set()) for name in plan.graph.names()}
+
+
+def _plain(value, active):
+    # A reused plan evaluates the same expressions, so that
+    # the values are compared exactly
+    if type(value) is Vector:
+        return value.x, value.y, value.z
+    if type(value) is Triangle:
+        a, b, c = value.a, value.b, value.c
+        return a.x, a.y, a.z, b.x, b.y, b.z, c.x, c.y, c.z
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if id(value) in active:
+        return "cycle"
+
+    active.add(id(value))
+    if isinstance(value, dict):
+        plain = {k: _plain(v, active) for k, v in value.items()}
+    elif isinstance(value, (list, tuple, Edge)):
+        plain = [_plain(v, active) for v in value]
+    else:
+        attributes = dict(getattr(value, "__dict__", {}))
+        for slot in getattr(type(value), "__slots__", ()):
+            attributes[slot] = getattr(value, slot, None)
+        plain = (type(value).__name__, _plain(attributes, active))
+    active.remove(id(value))
+    return plain
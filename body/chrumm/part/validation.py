@@ -0,0 +1,151 @@
+import math
+
+from chrumm import cfg
+
+from chrumm.geo import Vector
+
+from .bracket import CornerBracket
+from .knob import Knob
+from .palm import Palm
+
+
+# The constraints are also checked during construction, but only one at a
+# time, and only after the construction of the preceding parts. Here, they
+# are checked in advance and without construction of any part, so that all
+# violations can be reported at once. The messages are the same as those
+# of the construction, so that they can be deduplicated.
+
+
+def checkParameters(partNames):
+    """Return the violated constraints that only depend on the parameters.
+
+    Args:
+        partNames (list[str]): The parts that will be constructed,
+            including "knob", and the dependencies of other parts.
+    Returns:
+        list[str]: The error messages.
+    """
+    problems = []
+
+    if "knob" in partNames and cfg.knob and cfg.knob.grooveCount > 0:
+        try:
+            Knob._grooveSketch2D()
+        except ValueError as e:
+            problems.append(str(e))
+
+    if "body" in partNames:
+        problems.extend(_bodyProblems())
+        problems.extend(_switchProblems())
+
+    if "palm" in partNames and cfg.palm:
+        if cfg.palm.groove and cfg.palm.groove.height <= cfg.palm.floorFillet:
+            problems.append("palm.floorFillet must be less than palm.groove.height.")
+
+    return problems
+
+
+def checkPlans(plans, partNames):
+    """Return the violated constraints that only depend on the plans.
+
+    Only the reference points and small sub-parts are constructed, which
+    takes a few milliseconds.
+
+    Args:
+        plans (list[Plan]): The plans of the sides.
+        partNames (list[str]): The parts that will be constructed.
+    Returns:
+        list[str]: The error messages.
+    """
+    problems = []
+
+    if plans and "palm" in partNames and cfg.palm:
+        minPalmHeight = max(Palm.minHeight(plan) for plan in plans)
+        if cfg.palm.height <= minPalmHeight:
+            problems.append(f"palm.height must be greater than: {minPalmHeight:.3f}")
+
+    if plans and "body" in partNames and cfg.bracket and cfg.cable:
+        # The fit of the cable only depends on the bracket parameters,
+        # because it is relative to the screw. The unchamfered points of
+        # the back bracket are close enough for the other constraints.
+        plan = plans[0]
+        alnumILB = plan.points.alnumILB
+        alnumILBC = alnumILB + Vector(0, 0, -cfg.body.innerChamfer)
+        try:
+            CornerBracket(alnumILB, plan.points.alnumILF, alnumILBC, plan.side)
+        except (ValueError, ZeroDivisionError) as e:
+            problems.append(str(e) or type(e).__name__)
+
+    return problems
+
+
+def _bodyProblems():
+    problems = []
+
+    innerChamfer = cfg.body.innerChamfer
+    outerChamfer = cfg.body.outerChamfer
+    outerCornerRadius = cfg.body.outerCornerRadius
+    innerCornerRadius = outerCornerRadius - cfg.body.wallThickness
+
+    if cfg.body.thumbTentAngle >= cfg.body.alnumTentAngle:
+        problems.append("body.thumbTentAngle must be less than body.alnumTentAngle")
+
+    if innerChamfer >= innerCornerRadius:
+        problems.append(f"body.innerChamfer must be less than: {innerCornerRadius:.3f}")
+
+    if innerChamfer >= cfg.boss.innerWallFillet:
+        problems.append("body.innerChamfer must be less than boss.innerWallFillet.")
+
+    if outerChamfer >= outerCornerRadius:
+        problems.append("body.outerChamfer must be less than body.outerCornerRadius.")
+
+    return problems
+
+
+def _switchProblems():
+    """Check the chamfers and notches of the switch holes.
+
+    The walls are placed at the switch margins around the holes, without
+    regard to the chamfers of the holes and of the body. A chamfer of
+    the body that reaches a switch hole would cut into the hole.
+    """
+    problems = []
+
+    outerMargin = cfg.switch.outerMargin
+    innerMargin = cfg.switch.innerMargin
+    entryChamfer = cfg.switch.entryChamfer
+    outerChamfer = cfg.body.outerChamfer
+    innerChamfer = cfg.body.innerChamfer
+
+    if entryChamfer + outerChamfer >= outerMargin:
+        problems.append(
+            f"switch.outerMargin must be greater than: {entryChamfer + outerChamfer:.3f}\n"
+            "  Try to decrease switch.entryChamfer, or body.outerChamfer.")
+
+    clipNotch = cfg.switch.clipNotch
+    if clipNotch and clipNotch.height < cfg.body.roofThickness:
+        isSideways = getattr(clipNotch, "isSideways", False)
+        holeWidth = cfg.switch.depth if isSideways else cfg.switch.width
+        clipTaper = clipNotch.depth * math.tan(clipNotch.taperAngle)
+        clipDepth = clipNotch.depth
+
+        if clipDepth + innerChamfer >= innerMargin:
+            problems.append(
+                f"switch.innerMargin must be greater than: {clipDepth + innerChamfer:.3f}\n"
+                "  Try to decrease switch.clipNotch.depth, or body.innerChamfer.")
+
+        if clipNotch.width >= holeWidth:
+            name = "switch.depth" if isSideways else "switch.width"
+            problems.append(f"switch.clipNotch.width must be less than {name}.")
+
+        if clipNotch.width <= 2*clipTaper:
+            problems.append(
+                f"switch.clipNotch.width must be greater than: {2*clipTaper:.3f}\n"
+                "  Try to decrease switch.clipNotch.depth, or taperAngle.")
+
+        if entryChamfer >= clipNotch.height:
+            problems.append("switch.entryChamfer must be less than switch.clipNotch.height.")
+
+    elif innerChamfer >= innerMargin:
+        problems.append(f"switch.innerMargin must be greater than: {innerChamfer:.3f}")
+
+    return problems
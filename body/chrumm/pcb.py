@@ -1,4 +1,3 @@
-import copy
 import io
 import logging
 import math
@@ -16,8 +15,10 @@ log = logging.getLogger(__name__)
 
 def toKiCadFootprint(planR, planL):
     """Return switch position markers in the KiCad 7 footprint format."""
-    layoutR = copy.deepcopy(planR.layout)
-    layoutL = copy.deepcopy(planL.layout)
+    # The keys are moved by replacing their matrices,
+    # so the copies do not need their own geometry.
+    layoutR = planR.layout.copied()
+    layoutL = planL.layout.copied()
 
     _flattenLayout(layoutR)
     _flattenLayout(layoutL)
@@ -0,0 +1,144 @@
+import contextlib
+import cProfile
+import logging
+import os
+import pathlib
+import pstats
+
+
+log = logging.getLogger(__name__)
+
+
+# Stack times below this number of microseconds are omitted
+MIN_STACK_TIME = 1
+
+
+class Profiler:
+    """Profile each stage of make separately, with cProfile.
+
+    A stage that occurs multiple times is merged into one profile. The
+    profiles of worker tasks are merged per stage as well, and written
+    next to the profile of the main process, with a "-workers" suffix.
+    The profiles are driven by the stages of a Report.
+
+    Example:
+        report = chrumm.Report(chrumm.Profiler("profiles"))
+        files = chrumm.make(jsonStrings, 8, False, report=report)
+        report.profiler.write()
+    """
+
+    def __init__(self, directory, isCollapsed=False):
+        """Create an empty profile per stage.
+
+        Args:
+            directory (str): Output directory of the .pstats files.
+            isCollapsed (bool): Also write collapsed stacks, which can
+                be rendered as flame graphs by common tools.
+        """
+        self.directory = pathlib.Path(directory)
+        self.isCollapsed = isCollapsed
+        self._stats = {}
+        self._stem = None
+
+    @contextlib.contextmanager
+    def stage(self, name, build=None):
+        """Return a context that profiles a stage of the main process."""
+        stem = f"{build}-{name}" if build else name
+        profile = cProfile.Profile()
+        self._stem = stem
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._stem = None
+            self._add(stem, profile)
+
+    def addWorkerStats(self, stats):
+        """Add the profile stats of a worker task to the current stage."""
+        if self._stem is not None:
+            self._add(self._stem + "-workers", _Stats(stats))
+
+    def write(self):
+        """Write a .pstats file per stage, and optionally a .collapsed file."""
+        log.info('Writing profiles to "%s"...', self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stem, stats in self._stats.items():
+            stats.dump_stats(self.directory / f"{stem}.pstats")
+            if self.isCollapsed:
+                lines = collapsedStacks(stats.stats)
+                (self.directory / f"{stem}.collapsed").write_text("".join(lines))
+
+    def _add(self, stem, profile):
+        if stem in self._stats:
+            self._stats[stem].add(profile)
+        else:
+            self._stats[stem] = pstats.Stats(profile)
+
+
+def profileCall(function, arg):
+    """Call a function with cProfile, and return its result and stats."""
+    profile = cProfile.Profile()
+    result = profile.runcall(function, arg)
+    profile.create_stats()
+    return result, profile.stats
+
+
+def collapsedStacks(stats):
+    """Return the lines of the collapsed stack format of flame graphs.
+
+    cProfile only records the callers of each function, not the complete
+    stacks. The stacks are reconstructed from the functions without
+    callers, and the time of a function is split among its callers in
+    proportion to the time of each call edge. Recursion is cut off.
+
+    Args:
+        stats (dict): The stats attribute of pstats.Stats.
+    Returns:
+        list[str]: Lines of semicolon-separated function names,
+            followed by a number of microseconds.
+    """
+    callees = {}
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((function, edge[3]))
+
+    roots = [f for f, (_, _, _, _, callers) in stats.items() if not callers]
+    lines = []
+    stack = [((f,), 1.0) for f in sorted(roots, key=_label, reverse=True)]
+
+    while stack:
+        path, fraction = stack.pop()
+        function = path[-1]
+        selfTime = stats[function][2]
+
+        microseconds = round(selfTime * fraction * 1e6)
+        if microseconds >= MIN_STACK_TIME:
+            lines.append(";".join(_label(f) for f in path) + f" {microseconds}\n")
+
+        for callee, edgeTime in callees.get(function, ()):
+            calleeTime = stats[callee][3]
+            if callee in path or calleeTime <= 0:
+                continue
+            calleeFraction = fraction * edgeTime / calleeTime
+            if calleeFraction * calleeTime * 1e6 >= MIN_STACK_TIME:
+                stack.append((path + (callee,), calleeFraction))
+
+    return lines
+
+
+def _label(function):
+    fileName, line, name = function
+    if fileName == "~":
+        return name
+    return f"{name} ({os.path.basename(fileName)}:{line})"
+
+
+class _Stats:
+    """Stats of a worker task, in the form that pstats.Stats accepts."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
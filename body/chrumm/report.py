@@ -0,0 +1,117 @@
+import contextlib
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+from chrumm import __version__
+
+
+class Report:
+    """Collect the wall and CPU time of stages, and the size of each part.
+
+    The CPU time of a stage includes the time that worker processes spend
+    on its tasks. The stages do not overlap, so that their times add up.
+    An optional Profiler profiles the same stages.
+
+    Example:
+        report = chrumm.Report()
+        files = chrumm.make(jsonStrings, 8, False, report=report)
+        print(json.dumps(report.toDict()))
+    """
+
+    def __init__(self, profiler=None):
+        """Start the total time.
+
+        Args:
+            profiler (Profiler): Profiles each stage, or None.
+        """
+        self.profiler = profiler
+        self.stages = []
+        self.parts = {}
+        self.workerTime = 0.0
+        self.workerPeakRss = 0
+        self._startTime = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, name, build=None):
+        """Return a context that measures a stage, and appends it when it ends.
+
+        Args:
+            name (str): Stage name, like "plan", "body-right", or "encode".
+            build (str): Either "preview" or "final", or None.
+        """
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        workerTime = self.workerTime
+        try:
+            if self.profiler:
+                with self.profiler.stage(name, build):
+                    yield
+            else:
+                yield
+        finally:
+            stage = {"name": name}
+            if build:
+                stage["build"] = build
+            stage["wall"] = time.perf_counter() - wall
+            stage["cpu"] = time.process_time() - cpu + self.workerTime - workerTime
+            self.stages.append(stage)
+
+    def addWorkerUsage(self, cpuTime, peakRss, stats=None):
+        """Add the CPU time, peak RSS, and optional profile stats of a worker task."""
+        self.workerTime += cpuTime
+        self.workerPeakRss = max(self.workerPeakRss, peakRss or 0)
+        if self.profiler and stats is not None:
+            self.profiler.addWorkerStats(stats)
+
+    def addPart(self, fileName, faceCount, triangles):
+        """Add the size of a generated mesh.
+
+        Args:
+            fileName (str): The file name of the mesh.
+            faceCount (int): The number of faces before triangulation,
+                or None if the triangles were reused.
+            triangles (list[Triangle]): The final triangles.
+        """
+        vertices = {(v.x, v.y, v.z) for t in triangles for v in (t.a, t.b, t.c)}
+        self.parts[fileName] = {
+            "faces": faceCount,
+            "vertices": len(vertices),
+            "triangles": len(triangles)}
+
+    def toDict(self):
+        """Return the report as a dict that can be encoded as JSON."""
+        totals = {}
+        for stage in self.stages:
+            total = totals.setdefault(stage["name"], {"wall": 0.0, "cpu": 0.0})
+            total["wall"] += stage["wall"]
+            total["cpu"] += stage["cpu"]
+
+        return {
+            "version": __version__,
+            "wall": time.perf_counter() - self._startTime,
+            "stages": self.stages,
+            "totals": totals,
+            "parts": self.parts,
+            "peakRss": {"main": peakRss(), "workers": self.workerPeakRss or None}}
+
+
+def peakRss():
+    """Return the peak resident set size of this process in bytes, or None."""
+    if resource is None:
+        return None
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return maxRss if sys.platform == "darwin" else maxRss * 1024
+
+
+def stage(report, name, build=None):
+    """Return the stage context of a report, or a context that does nothing."""
+    if report is None:
+        return contextlib.nullcontext()
+    return report.stage(name, build)
@@ -0,0 +1,304 @@
+"""
+Scan the valid ranges of Chrumm parameters, one parameter at a time.
+The parts are constructed for each sample value, without triangulation.
+A sample is invalid, if the construction raises an error, for example
+a ValueError of a constraint, a ZeroDivisionError, or an invalid face.
+Between valid and invalid samples, the boundary is refined by bisection.
+The valid ranges are relative to the other parameters of the JSON files.
+
+Usage:
+  python3 -m chrumm.scan [--help] [--log LEVEL] [--threads N] [--out FILE]
+                         [--parts ITEMS] [--preview] [--tolerance T]
+                         --range NAME=RANGE... JSON...
+  python3 -m chrumm.scan [--help] [--log LEVEL] --check REPORT JSON...
+
+Options:
+  -h, --help     Print this help and exit
+  --log LEVEL    Either DEBUG, INFO, WARNING, or ERROR (default: INFO)
+  --threads N    Number of samples to construct in parallel
+                 (default: number of CPUs)
+  --out FILE     Output file of the report (default: scan.json)
+  --parts ITEMS  Comma-separated parts, see the --parts option of chrumm
+  --preview      Construct with the coarse preview parameters
+  --tolerance T  Width of a boundary interval, at which the bisection
+                 stops (default: 0.01, or 1 for counts)
+  --range NAME=RANGE
+                 Inclusive range START:STOP:STEP of initial samples,
+                 in addition to the value of the JSON files,
+                 for example: body.alnumTentAngle=0:40:5
+  --check REPORT
+                 Check the JSON files against the valid ranges of a report,
+                 and exit with status 1, if a parameter is out of range
+"""
+
+import getopt
+import json
+import logging
+import multiprocessing
+import os
+import pathlib
+import sys
+import traceback
+
+import chrumm
+
+from chrumm.make import construct
+from chrumm.make import flatParameters
+from chrumm.sweep import inclusiveRange
+from chrumm.sweep import overrideLayer
+
+
+log = logging.getLogger(__name__)
+
+
+# Default width of a boundary interval after bisection
+DEFAULT_TOLERANCE = 0.01
+
+
+def scan(baseStrings, ranges, threads=None, parts=None, isPreview=False, tolerance=None):
+    """Find the valid ranges of parameters in parallel.
+
+    Each round constructs all pending samples of all parameters in a pool
+    of worker processes. After the initial samples, each round splits the
+    boundary intervals, until they are narrower than the tolerance. If
+    there are more workers than boundaries, an interval is split into
+    more than two parts per round.
+
+    Args:
+        baseStrings (list[str]): List of JSON strings.
+        ranges (dict[str, list]): Initial sample values per dotted
+            parameter name, in the units of the JSON files.
+        threads (int): Number of worker processes, or None for all CPUs.
+        parts (list[str]): Items of PARTS to construct, or None for all.
+        isPreview (bool): Construct with the coarse preview parameters.
+        tolerance (float): Width of a boundary interval, or None for
+            DEFAULT_TOLERANCE, and 1 for counts.
+    Returns:
+        dict: The report, see checkReport().
+    """
+    baseParameters = flatParameters(baseStrings)
+    for name, values in ranges.items():
+        if name not in baseParameters:
+            raise ValueError(f"Unknown parameter: {name}")
+        if not all(_isNumber(x) for x in values + [baseParameters[name]]):
+            raise ValueError(f"Only numeric parameters can be scanned: {name}")
+
+    # Counts are bisected in integer steps, all other parameters continuously.
+    # The base value is sampled as well, so that a valid range is found,
+    # even if no initial sample hits it.
+    initial = {}
+    tolerances = {}
+    for name, values in ranges.items():
+        values = values + [baseParameters[name]]
+        if name.endswith("Count"):
+            initial[name] = list(dict.fromkeys(round(x) for x in values))
+            tolerances[name] = max(1, tolerance or 1)
+        else:
+            initial[name] = list(dict.fromkeys(float(x) for x in values))
+            tolerances[name] = tolerance or DEFAULT_TOLERANCE
+
+    errors = {name: {} for name in ranges}
+    pending = [(name, value) for name, values in initial.items() for value in values]
+    processes = threads or os.cpu_count()
+    roundCount = 0
+
+    with multiprocessing.Pool(processes, initializer=_initWorker) as pool:
+        while pending:
+            roundCount += 1
+            log.info("Constructing %i samples in round %i...", len(pending), roundCount)
+            jobs = [
+                (baseStrings + [json.dumps(overrideLayer({n: v}))], parts, isPreview)
+                for n, v in pending]
+            for (name, value), error in zip(pending, pool.imap(_construct, jobs)):
+                errors[name][value] = error
+
+            boundaries = {n: _boundaries(errors[n], tolerances[n]) for n in ranges}
+            boundaryCount = sum(len(x) for x in boundaries.values())
+            splitCount = max(1, processes // max(1, boundaryCount))
+            pending = [
+                (name, value) for name, intervals in boundaries.items()
+                for a, b in intervals for value in _split(a, b, splitCount)
+                if value not in errors[name]]
+
+    parameters = {}
+    for name, samples in errors.items():
+        values = sorted(samples)
+        parameters[name] = {
+            "base": baseParameters[name],
+            "range": [values[0], values[-1]],
+            "valid": _validRanges(values, samples),
+            "boundaries": [
+                {"lower": a, "upper": b, "error": samples[a] or samples[b]}
+                for a, b in zip(values, values[1:]) if bool(samples[a]) != bool(samples[b])],
+            "samples": len(values)}
+
+    return {
+        "version": chrumm.__version__,
+        "parts": parts,
+        "preview": isPreview,
+        "parameters": parameters}
+
+
+def checkReport(report, jsonStrings):
+    """Return the parameters that are outside of the valid ranges of a report.
+
+    The report is a dict with an entry per scanned parameter name:
+        base (float): The value of the scanned configuration.
+        range (list[float]): The lowest and highest sample.
+        valid (list[list[float]]): The lowest and highest valid sample
+            of each valid range.
+        boundaries (list[dict]): The lower and upper sample of each
+            boundary interval, and the error of the invalid sample.
+        samples (int): The number of samples.
+
+    Args:
+        report (dict): The result of scan().
+        jsonStrings (list[str]): List of JSON strings.
+    Returns:
+        list[str]: The problem messages.
+    """
+    parameters = flatParameters(jsonStrings)
+    problems = []
+
+    for name, entry in report["parameters"].items():
+        value = parameters.get(name)
+        if not _isNumber(value):
+            continue
+        if any(a <= value <= b for a, b in entry["valid"]):
+            continue
+
+        lowest, highest = entry["range"]
+        if not lowest <= value <= highest:
+            problems.append(f"{name} is outside of the scanned range: {value}")
+            continue
+
+        ranges = ", ".join(f"{a} to {b}" for a, b in entry["valid"]) or "none"
+        problems.append(f"{name} is outside of the valid ranges ({ranges}): {value}")
+        if entry["boundaries"]:
+            nearest = min(entry["boundaries"], key=lambda x: abs(x["lower"] - value))
+            problems[-1] += "\n  " + nearest["error"].replace("\n", "\n  ")
+
+    return problems
+
+
+def _isNumber(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _boundaries(samples, tolerance):
+    """Return the intervals between valid and invalid samples, which are too wide."""
+    values = sorted(samples)
+    return [
+        (a, b) for a, b in zip(values, values[1:])
+        if bool(samples[a]) != bool(samples[b]) and b - a > tolerance]
+
+
+def _split(a, b, count):
+    """Return values that split an interval into count + 1 parts."""
+    if isinstance(a, int) and isinstance(b, int):
+        return sorted({a + (b - a) * (i + 1) // (count + 1) for i in range(count)} - {a, b})
+    return [round(a + (b - a) * (i + 1) / (count + 1), 9) for i in range(count)]
+
+
+def _validRanges(values, samples):
+    """Return the lowest and highest value of each run of valid samples."""
+    ranges = []
+    for i, value in enumerate(values):
+        if samples[value]:
+            continue
+        if i > 0 and not samples[values[i-1]]:
+            ranges[-1][1] = value
+        else:
+            ranges.append([value, value])
+    return ranges
+
+
+def _initWorker():
+    # The stages of each sample are not logged
+    makeLog = logging.getLogger("chrumm.make")
+    makeLog.setLevel(max(logging.WARNING, makeLog.getEffectiveLevel()))
+
+
+def _construct(job):
+    """Construct the parts in a worker, and return an error or an empty string."""
+    jsonStrings, parts, isPreview = job
+    try:
+        construct(jsonStrings, parts, isPreview)
+        return ""
+    except Exception as e:
+        log.debug(traceback.format_exc().strip())
+        if isinstance(e, ZeroDivisionError):
+            return "Division by zero, caused by malformed geometry"
+        return str(e) or type(e).__name__
+
+
+def main():
+    logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
+
+    try:
+        threads = None
+        outFile = pathlib.Path("scan.json")
+        parts = None
+        isPreview = False
+        tolerance = None
+        ranges = {}
+        reportFile = None
+
+        longOptions = "help log= threads= out= parts= preview tolerance= range= check="
+        options, jsonFiles = getopt.getopt(sys.argv[1:], "h", longOptions.split())
+
+        for name, arg in options:
+            if name == "-h" or name == "--help":
+                print(__doc__)
+                sys.exit(0)
+            elif name == "--log":
+                logging.getLogger().setLevel(arg)
+            elif name == "--threads":
+                threads = int(arg)
+            elif name == "--out":
+                outFile = pathlib.Path(arg)
+            elif name == "--parts":
+                parts = [item for item in arg.split(",") if item]
+            elif name == "--preview":
+                isPreview = True
+            elif name == "--tolerance":
+                tolerance = float(arg)
+            elif name == "--range":
+                parameter, values = arg.split("=", 1)
+                ranges[parameter] = inclusiveRange(*(json.loads(v) for v in values.split(":")))
+            elif name == "--check":
+                reportFile = pathlib.Path(arg)
+
+        if not jsonFiles:
+            raise getopt.GetoptError("Missing JSON argument.")
+
+        jsonStrings = [pathlib.Path(f).read_text() for f in jsonFiles]
+
+        if reportFile:
+            problems = checkReport(json.loads(reportFile.read_text()), jsonStrings)
+            for problem in problems:
+                log.error(problem)
+            if problems:
+                sys.exit(1)
+            log.info("All scanned parameters are within the valid ranges.")
+            return
+
+        if not ranges:
+            raise getopt.GetoptError("Missing --range option.")
+
+        report = scan(jsonStrings, ranges, threads, parts, isPreview, tolerance)
+        outFile.write_text(json.dumps(report, indent=1))
+
+        for name, entry in report["parameters"].items():
+            ranges = ", ".join(f"{a} to {b}" for a, b in entry["valid"]) or "none"
+            log.info("Valid ranges of %s: %s", name, ranges)
+        log.info('Wrote "%s"', outFile)
+
+    except Exception as e:
+        log.error(e)
+        log.debug(traceback.format_exc().strip())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Serve Chrumm keyboard STL files over HTTP, on the local machine.
+A POST request to /generate with a JSON object, or with a list of JSON
+objects as parameter layers, returns a zip archive of the files. The
+layers are merged on top of the JSON files of the command line.
+
+Usage:
+  python3 -m chrumm.serve [--help] [--log LEVEL] [--host HOST] [--port PORT]
+                          [--threads N] [--queue N] [--timeout SECONDS] [JSON...]
+
+Options:
+  -h, --help     Print this help and exit
+  --log LEVEL    Either DEBUG, INFO, WARNING, or ERROR (default: INFO)
+  --host HOST    Address to listen on (default: 127.0.0.1)
+  --port PORT    Port to listen on (default: 8000)
+  --threads N    Number of threads to use (default: 8)
+  --queue N      Number of jobs that can wait, before requests
+                 are rejected with status 503 (default: 8)
+  --timeout SECONDS
+                 Time per job, including the wait in the queue,
+                 before it is cancelled with status 504 (default: 300)
+
+Query parameters of /generate:
+  parts=ITEMS    Comma-separated parts, see the --parts option of chrumm
+  side=SIDE      Either left or right
+  preview=1      Generate coarse preview meshes only
+
+A GET request to /status returns the queue length as JSON.
+"""
+
+import asyncio
+import concurrent.futures
+import getopt
+import http
+import http.server
+import io
+import json
+import logging
+import pathlib
+import sys
+import threading
+import time
+import traceback
+import urllib.parse
+import zipfile
+
+import chrumm
+
+from chrumm.make import PARTS
+from chrumm.make import SIDES
+
+
+log = logging.getLogger(__name__)
+
+
+# Maximum size of a request body in bytes
+MAX_BODY_SIZE = 1 << 20
+
+
+class Service:
+    """Run generation jobs from a bounded queue in a single session.
+
+    Jobs are generated one after another, because the parameters are
+    global. Each job uses the worker pool of the session, and reuses
+    the faces and parts of the previous job, if they did not change.
+    A job that exceeds its timeout is answered immediately, and its
+    generation stops before the next part or stage.
+    The event loop runs in its own thread, so that the methods can be
+    called from the threads of an HTTP server.
+    """
+
+    def __init__(self, baseStrings=(), threads=8, maxQueued=8, timeout=300):
+        """Start the event loop and the session.
+
+        Args:
+            baseStrings (list[str]): JSON strings below the job layers.
+            threads (int): Number of threads to use.
+            maxQueued (int): Number of jobs that can wait.
+            timeout (float): Seconds per job, including the wait.
+        """
+        self.baseStrings = list(baseStrings)
+        self.timeout = timeout
+        self.processedCount = 0
+        self._session = chrumm.Session(threads)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._queue = self._call(self._createQueue(maxQueued))
+        self._runner = self._call(self._startRunner())
+
+    def close(self):
+        """Stop the event loop and the session."""
+        self._call(self._stopRunner())
+        self._executor.shutdown()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._session.close()
+
+    def queuedCount(self):
+        return self._queue.qsize()
+
+    def generate(self, layers, **makeArgs):
+        """Queue a job and wait for its files.
+
+        Args:
+            layers (list[str]): JSON strings on top of the base strings.
+            makeArgs: Keyword arguments of Session.make.
+        Returns:
+            dict[str, bytes|str]: A dict of file names and data.
+        Raises:
+            asyncio.QueueFull: If too many jobs are waiting.
+            TimeoutError: If the job took too long.
+        """
+        jsonStrings = self.baseStrings + list(layers)
+        return self._call(self._submit(jsonStrings, makeArgs))
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _createQueue(self, maxQueued):
+        # The queue is bound to the loop that creates it in Python 3.7
+        return asyncio.Queue(maxQueued)
+
+    async def _startRunner(self):
+        return self._loop.create_task(self._run())
+
+    async def _stopRunner(self):
+        # The runner is awaited, so that it is not destroyed while pending
+        self._runner.cancel()
+        await asyncio.gather(self._runner, return_exceptions=True)
+
+    async def _submit(self, jsonStrings, makeArgs):
+        deadline = time.monotonic() + self.timeout
+        future = self._loop.create_future()
+        self._queue.put_nowait((jsonStrings, makeArgs, deadline, future))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            # The runner skips the job, or ignores its result
+            future.cancel()
+            raise TimeoutError("The generation took too long.")
+
+    async def _run(self):
+        while True:
+            jsonStrings, makeArgs, deadline, future = await self._queue.get()
+            if future.done():
+                continue
+            try:
+                files = await self._loop.run_in_executor(
+                    self._executor, self._make, jsonStrings, makeArgs, deadline)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(files)
+            self.processedCount += 1
+
+    def _make(self, jsonStrings, makeArgs, deadline):
+        return self._session.make(jsonStrings, deadline=deadline, **makeArgs)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Handle the requests of the HTTP server, with the service of the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != "/status":
+            self._sendError(http.HTTPStatus.NOT_FOUND, "Unknown path.")
+            return
+
+        service = self.server.service
+        status = {
+            "version": chrumm.__version__,
+            "queued": service.queuedCount(),
+            "processed": service.processedCount}
+        self._send(http.HTTPStatus.OK, "application/json", json.dumps(status).encode())
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != "/generate":
+            self._sendError(http.HTTPStatus.NOT_FOUND, "Unknown path.")
+            return
+
+        try:
+            length = self.headers.get("Content-Length", "0").strip()
+            if not (length.isascii() and length.isdigit()):
+                raise ValueError("Invalid Content-Length header.")
+            if int(length) > MAX_BODY_SIZE:
+                self._sendError(http.HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request too large.")
+                return
+            layers = json.loads(self.rfile.read(int(length)))
+            if isinstance(layers, dict):
+                layers = [layers]
+            if not isinstance(layers, list) or not all(isinstance(x, dict) for x in layers):
+                raise ValueError("Expected a JSON object or a list of JSON objects.")
+            makeArgs = _makeArgs(urllib.parse.parse_qs(url.query))
+        except ValueError as e:
+            self._sendError(http.HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        try:
+            files = self.server.service.generate([json.dumps(x) for x in layers], **makeArgs)
+        except asyncio.QueueFull:
+            self._sendError(http.HTTPStatus.SERVICE_UNAVAILABLE, "Too many queued jobs.")
+            return
+        except TimeoutError as e:
+            self._sendError(http.HTTPStatus.GATEWAY_TIMEOUT, str(e))
+            return
+        except ZeroDivisionError:
+            message = "Encountered a division by zero, caused by malformed geometry."
+            self._sendError(http.HTTPStatus.UNPROCESSABLE_ENTITY, message)
+            return
+        except Exception as e:
+            log.debug(traceback.format_exc().strip())
+            self._sendError(http.HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+            return
+
+        with io.BytesIO() as stream:
+            with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as archive:
+                for name, data in files.items():
+                    archive.writestr(f"chrumm-{name}", data)
+            self._send(http.HTTPStatus.OK, "application/zip", stream.getvalue())
+
+    def log_message(self, format, *args):
+        log.info("%s %s", self.address_string(), format % args)
+
+    def _send(self, status, contentType, data):
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _sendError(self, status, message):
+        # The connection is closed after an error, because the
+        # request body may not have been read
+        self.close_connection = True
+        data = json.dumps({"error": message}).encode()
+        self._send(status, "application/json", data)
+
+
+def _makeArgs(query):
+    """Return the keyword arguments of Session.make for query parameters."""
+    makeArgs = {}
+    for name, values in query.items():
+        value = values[-1]
+        if name == "parts":
+            makeArgs["parts"] = [item for item in value.split(",") if item]
+            for item in makeArgs["parts"]:
+                if item not in PARTS:
+                    raise ValueError(f"Unknown part: {item}")
+        elif name == "side":
+            if value not in SIDES:
+                raise ValueError(f"Unknown side: {value}")
+            makeArgs["side"] = value
+        elif name == "preview":
+            makeArgs["isPreview"] = value not in ("", "0", "false")
+        else:
+            raise ValueError(f"Unknown query parameter: {name}")
+    return makeArgs
+
+
+def serve(service, host="127.0.0.1", port=8000):
+    """Return an HTTP server for the service, which is not started yet.
+
+    Call serve_forever() to handle requests, and server_close() to stop.
+    Port 0 selects a free port, see server_address.
+    """
+    server = http.server.ThreadingHTTPServer((host, port), _Handler)
+    server.service = service
+    return server
+
+
+def main():
+    logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
+
+    try:
+        host = "127.0.0.1"
+        port = 8000
+        threads = 8
+        maxQueued = 8
+        timeout = 300
+
+        longOptions = "help log= host= port= threads= queue= timeout="
+        options, jsonFiles = getopt.getopt(sys.argv[1:], "h", longOptions.split())
+
+        for name, arg in options:
+            if name == "-h" or name == "--help":
+                print(__doc__)
+                sys.exit(0)
+            elif name == "--log":
+                logging.getLogger().setLevel(arg)
+            elif name == "--host":
+                host = arg
+            elif name == "--port":
+                port = int(arg)
+            elif name == "--threads":
+                threads = int(arg)
+            elif name == "--queue":
+                maxQueued = int(arg)
+            elif name == "--timeout":
+                timeout = float(arg)
+
+        baseStrings = [pathlib.Path(f).read_text() for f in jsonFiles]
+
+    except Exception as e:
+        log.error(e)
+        sys.exit(1)
+
+    service = Service(baseStrings, threads, maxQueued, timeout)
+    server = serve(service, host, port)
+    log.info("Serving chrumm %s on http://%s:%i", chrumm.__version__, *server.server_address)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Stopped.")
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
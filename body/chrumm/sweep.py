@@ -0,0 +1,279 @@
+"""
+Generate variants of a Chrumm configuration over a grid of parameters.
+Each variant is the merged JSON files with overrides of dotted parameter
+names. Parts with the same parameters are generated once. The files are
+stored by their SHA-256 hash, and listed per variant in a CSV manifest.
+
+Usage:
+  python3 -m chrumm.sweep [--help] [--log LEVEL] [--threads N] [--out DIR]
+                          [--parts ITEMS] [--side SIDE] [--preview]
+                          [--set NAME=VALUES]... [--range NAME=RANGE]...
+                          [--list FILE] JSON...
+
+Options:
+  -h, --help     Print this help and exit
+  --log LEVEL    Either DEBUG, INFO, WARNING, or ERROR (default: INFO)
+  --threads N    Number of variant parts to generate in parallel
+                 (default: number of CPUs)
+  --out DIR      Output directory (default: sweep)
+  --parts ITEMS  Comma-separated parts, see the --parts option of chrumm
+  --side SIDE    Generate the keyboard parts of either left or right side only
+  --preview      Generate coarse preview meshes only
+  --set NAME=VALUES
+                 Comma-separated JSON values of a grid axis,
+                 for example: palm.height=20,24,28
+  --range NAME=RANGE
+                 Inclusive range START:STOP:STEP of a grid axis,
+                 for example: body.alnumTentAngle=6:20:2
+  --list FILE    JSON list of objects with dotted names and values,
+                 which are combined with each point of the grid
+
+Output:
+  DIR/store/HASH.stl   Generated files, named by their content
+  DIR/manifest.csv     One row per file of each variant
+"""
+
+import csv
+import getopt
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import pathlib
+import sys
+import traceback
+
+import chrumm
+
+from chrumm.make import PARTS
+from chrumm.make import flatParameters
+from chrumm.make import partKey
+
+
+log = logging.getLogger(__name__)
+
+# Session of a worker process
+_session = None
+
+
+def sweep(baseStrings, variants, outDir, threads=None, parts=None, side=None, isPreview=False):
+    """Generate variants in parallel and store their files.
+
+    Each unique part is a job of a worker process, which keeps its own
+    session with warm caches. Because a floor job also constructs its
+    body, the parts of one variant are not generated together.
+
+    Args:
+        baseStrings (list[str]): List of JSON strings.
+        variants (list[dict]): Overrides of dotted parameter names.
+        outDir (pathlib.Path): Output directory.
+        threads (int): Number of worker processes, or None for all CPUs.
+        parts (list[str]): Items of PARTS to generate, or None for all.
+        side (str): Either "left" or "right", or None for both.
+        isPreview (bool): Generate coarse preview meshes only.
+    Returns:
+        list[dict]: The rows of the manifest.
+    """
+    selected = list(PARTS if parts is None else parts)
+    for item in selected:
+        if item not in PARTS:
+            raise ValueError(f"Unknown part: {item}")
+
+    baseParameters = flatParameters(baseStrings)
+    for variant in variants:
+        for name in variant:
+            if name not in baseParameters:
+                raise ValueError(f"Unknown parameter: {name}")
+
+    # Each part key is generated by the first variant that needs it
+
+    variantStrings = [baseStrings + [json.dumps(overrideLayer(v))] for v in variants]
+    variantKeys = []
+    jobs = {}
+    for jsonStrings in variantStrings:
+        keys = {part: partKey(jsonStrings, part) for part in selected}
+        variantKeys.append(keys)
+        for part, key in keys.items():
+            jobs.setdefault(key, (jsonStrings, part, side, isPreview))
+
+    log.info("Generating %i unique parts of %i variants...", len(jobs), len(variants))
+
+    storeDir = outDir / "store"
+    storeDir.mkdir(parents=True, exist_ok=True)
+
+    results = {}
+    processes = threads or os.cpu_count()
+    with multiprocessing.Pool(processes, initializer=_initWorker) as pool:
+        for key, (files, error) in zip(jobs, pool.imap(_generate, jobs.values())):
+            if error:
+                log.error("Failed to generate %s: %s", jobs[key][1], error)
+                results[key] = {}, error
+                continue
+            stored = {}
+            for fileName, data in files.items():
+                stored[fileName] = _store(storeDir, fileName, data)
+            results[key] = stored, ""
+            log.info("Generated %i of %i parts", len(results), len(jobs))
+
+    # Manifest
+
+    rows = []
+    for i, (variant, keys) in enumerate(zip(variants, variantKeys)):
+        for part in selected:
+            stored, error = results[keys[part]]
+            if error:
+                rows.append(_row(i, variant, part, error=error))
+            for fileName, (digest, size, path) in stored.items():
+                row = _row(i, variant, part, fileName, digest, size, path.relative_to(outDir))
+                rows.append(row)
+
+    names = sorted({name for variant in variants for name in variant})
+    columns = ["variant"] + names + ["part", "file", "sha256", "bytes", "path", "error"]
+    with open(outDir / "manifest.csv", "w", newline="") as stream:
+        writer = csv.DictWriter(stream, columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return rows
+
+
+def grid(axes):
+    """Return the variants of all combinations of axis values.
+
+    Args:
+        axes (dict[str, list]): Values per dotted parameter name.
+    Returns:
+        list[dict]
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def inclusiveRange(start, stop, step):
+    """Return the values from start to stop, including stop if it is hit."""
+    if step <= 0:
+        raise ValueError("The step of a range must be positive.")
+    count = int((stop - start) / step + 1e-9) + 1
+    values = [start + i*step for i in range(count)]
+    if all(isinstance(x, int) for x in (start, stop, step)):
+        return values
+    return [round(value, 9) for value in values]
+
+
+def overrideLayer(variant):
+    """Return a JSON object for a dict of dotted names and values."""
+    layer = {}
+    for name, value in variant.items():
+        *path, key = name.split(".")
+        obj = layer
+        for parentKey in path:
+            obj = obj.setdefault(parentKey, {})
+        obj[key] = value
+    return layer
+
+
+def _row(index, variant, part, fileName="", digest="", size="", path="", error=""):
+    row = {"variant": index, "part": part, "file": fileName, "error": error}
+    row.update({"sha256": digest, "bytes": size, "path": path})
+    row.update(variant)
+    return row
+
+
+def _store(storeDir, fileName, data):
+    """Write data once per content, and return its hash, size, and path."""
+    if isinstance(data, str):
+        data = data.encode()
+    digest = hashlib.sha256(data).hexdigest()
+    path = storeDir / (digest + pathlib.PurePath(fileName).suffix)
+    if not path.exists():
+        path.write_bytes(data)
+    return digest, len(data), path
+
+
+def _initWorker():
+    global _session
+    _session = chrumm.Session(threads=1)
+
+
+def _generate(job):
+    """Generate one part in a worker, and return its files or an error."""
+    jsonStrings, part, side, isPreview = job
+    try:
+        files = _session.make(jsonStrings, parts=[part], side=side, isPreview=isPreview)
+        return files, ""
+    except Exception as e:
+        log.debug(traceback.format_exc().strip())
+        if isinstance(e, ZeroDivisionError):
+            return {}, "Division by zero, caused by malformed geometry"
+        return {}, str(e) or type(e).__name__
+
+
+def _parseValue(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main():
+    logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
+
+    try:
+        threads = None
+        outDir = pathlib.Path("sweep")
+        parts = None
+        side = None
+        isPreview = False
+        axes = {}
+        variants = [{}]
+
+        longOptions = "help log= threads= out= parts= side= preview set= range= list="
+        options, jsonFiles = getopt.getopt(sys.argv[1:], "h", longOptions.split())
+
+        for name, arg in options:
+            if name == "-h" or name == "--help":
+                print(__doc__)
+                sys.exit(0)
+            elif name == "--log":
+                logging.getLogger().setLevel(arg)
+            elif name == "--threads":
+                threads = int(arg)
+            elif name == "--out":
+                outDir = pathlib.Path(arg)
+            elif name == "--parts":
+                parts = [item for item in arg.split(",") if item]
+            elif name == "--side":
+                side = arg
+            elif name == "--preview":
+                isPreview = True
+            elif name == "--set":
+                parameter, values = arg.split("=", 1)
+                axes[parameter] = [_parseValue(v) for v in values.split(",")]
+            elif name == "--range":
+                parameter, values = arg.split("=", 1)
+                axes[parameter] = inclusiveRange(*(_parseValue(v) for v in values.split(":")))
+            elif name == "--list":
+                variants = json.loads(pathlib.Path(arg).read_text())
+
+        if not jsonFiles:
+            raise getopt.GetoptError("Missing JSON argument.")
+
+        baseStrings = [pathlib.Path(f).read_text() for f in jsonFiles]
+        variants = [dict(v, **point) for v in variants for point in grid(axes)]
+
+        rows = sweep(baseStrings, variants, outDir, threads, parts, side, isPreview)
+
+        errorCount = sum(1 for row in rows if row["error"])
+        manifest = outDir / "manifest.csv"
+        log.info("Wrote %s with %i rows and %i errors", manifest, len(rows), errorCount)
+
+    except Exception as e:
+        log.error(e)
+        log.debug(traceback.format_exc().strip())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import importlib
+import json
+import pathlib
+import unittest
+import unittest.mock
+
+import chrumm
+
+from chrumm import cfg
+from chrumm.part import Plan
+
+
+BASE_STRING = (pathlib.Path(__file__).parents[2] / "chrumm.json").read_text()
+
+# The package attribute chrumm.make is the function of the same name
+makeModule = importlib.import_module("chrumm.make")
+
+
+class BudgetTest(unittest.TestCase):
+
+    def test_coarsenBosses(self):
+        # The bosses of the plans are coarsened with the other internal features
+        cfg._init([BASE_STRING])
+        segmentCount = len(Plan("right").bosses.alnumB.wallEdge)
+
+        budgetString = json.dumps({"quality": {"maxTriangles": 6000}})
+        with unittest.mock.patch.object(
+                makeModule, "_makeParts", wraps=makeModule._makeParts) as makeParts:
+            chrumm.make([BASE_STRING, budgetString], 1, False, parts=["body"], side="right")
+
+        self.assertGreater(makeParts.call_count, 1)
+        plan = makeParts.call_args[0][0]["right"]
+        self.assertLess(len(plan.bosses.alnumB.wallEdge), segmentCount)
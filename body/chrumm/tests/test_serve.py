@@ -0,0 +1,164 @@
+import http.client
+import io
+import json
+import pathlib
+import threading
+import time
+import unittest
+import zipfile
+
+from ..serve import MAX_BODY_SIZE
+from ..serve import Service
+from ..serve import serve
+
+
+BASE_PATH = pathlib.Path(__file__).parents[2] / "chrumm.json"
+
+
+class ServerTestCase(unittest.TestCase):
+    """Serve the service of createService() on a free port of localhost."""
+
+    @classmethod
+    def createService(cls):
+        return Service([BASE_PATH.read_text()], threads=1)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.service = cls.createService()
+        cls.server = serve(cls.service, port=0)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.thread.join()
+        cls.server.server_close()
+        cls.service.close()
+
+    def request(self, method, path, body=b"", headers=None):
+        """Return the status and the body of a response."""
+        connection = http.client.HTTPConnection(*self.server.server_address, timeout=60)
+        try:
+            connection.putrequest(method, path)
+            for name, value in (headers or {"Content-Length": str(len(body))}).items():
+                connection.putheader(name, value)
+            connection.endheaders(body)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+
+class ServeTest(ServerTestCase):
+
+    def test_status(self):
+        status, data = self.request("GET", "/status")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(data)["queued"], 0)
+
+        status, data = self.request("GET", "/unknown")
+        self.assertEqual(status, 404)
+
+    def test_generate(self):
+        body = json.dumps({"knob": {"outerDiameter": 20}}).encode()
+        status, data = self.request("POST", "/generate?parts=knob&preview=1", body)
+        self.assertEqual(status, 200)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(archive.namelist(), ["chrumm-rotary-knob-preview.stl"])
+
+        body = json.dumps({"floor": {"lipHeight": 30}}).encode()
+        status, data = self.request("POST", "/generate?parts=floor&side=right&preview=1", body)
+        self.assertEqual(status, 422)
+        self.assertIn("floor lip", json.loads(data)["error"])
+
+    def test_invalidRequests(self):
+        processedCount = self.service.processedCount
+
+        status, data = self.request("POST", "/generate?parts=knob", b"[1]")
+        self.assertEqual(status, 400)
+        self.assertIn("error", json.loads(data))
+
+        status, _ = self.request("POST", "/generate?parts=knob", b"{")
+        self.assertEqual(status, 400)
+
+        status, _ = self.request("POST", "/generate?unknown=1", b"{}")
+        self.assertEqual(status, 400)
+
+        status, _ = self.request("POST", "/generate", headers={"Content-Length": "ten"})
+        self.assertEqual(status, 400)
+
+        status, _ = self.request("POST", "/generate", headers={"Content-Length": "-1"})
+        self.assertEqual(status, 400)
+
+        tooLarge = str(MAX_BODY_SIZE + 1)
+        status, _ = self.request("POST", "/generate", headers={"Content-Length": tooLarge})
+        self.assertEqual(status, 413)
+
+        status, data = self.request("POST", "/generate?side=up", b"{}")
+        self.assertEqual(status, 400)
+        self.assertIn("Unknown side", json.loads(data)["error"])
+
+        status, data = self.request("POST", "/generate?parts=knob,foo", b"{}")
+        self.assertEqual(status, 400)
+        self.assertIn("Unknown part", json.loads(data)["error"])
+
+        # Invalid requests are rejected before they are queued
+        self.assertEqual(self.service.processedCount, processedCount)
+
+
+class BlockingService(Service):
+    """Record the jobs, and block each job until it is released."""
+
+    def __init__(self, *args, **kwargs):
+        self.jobs = []
+        self.started = threading.Event()
+        self.released = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def _make(self, jsonStrings, makeArgs, deadline):
+        self.jobs.append(jsonStrings)
+        self.started.set()
+        self.released.wait(60)
+        return {"part.stl": b""}
+
+
+class QueueTest(ServerTestCase):
+
+    @classmethod
+    def createService(cls):
+        return BlockingService(maxQueued=1, timeout=0.5)
+
+    def test_queue(self):
+        statuses = {}
+
+        def post(name):
+            body = json.dumps({"name": name}).encode()
+            statuses[name] = self.request("POST", "/generate", body)[0]
+
+        # The first job blocks the runner, and the second job waits
+        running = threading.Thread(target=post, args=("running",))
+        running.start()
+        self.assertTrue(self.service.started.wait(10))
+        waiting = threading.Thread(target=post, args=("waiting",))
+        waiting.start()
+        while self.service.queuedCount() < 1:
+            time.sleep(0.01)
+
+        # The queue is full
+        post("rejected")
+        self.assertEqual(statuses["rejected"], 503)
+
+        # Both jobs exceed the timeout
+        running.join()
+        waiting.join()
+        self.assertEqual(statuses["running"], 504)
+        self.assertEqual(statuses["waiting"], 504)
+
+        # The waiting job is skipped by the runner, after the first job ends
+        self.service.released.set()
+        while self.service.queuedCount() > 0 or self.service.processedCount < 1:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        self.assertEqual(self.service.processedCount, 1)
+        self.assertEqual([json.loads(job[-1])["name"] for job in self.service.jobs], ["running"])
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+
+
+# Events of the current process, or None if tracing is off
+_events = None
+
+
+class _Span:
+    """Record a complete event of the Chrome trace format on exit."""
+
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        if _events is not None:
+            _events.append({
+                "name": self.name,
+                "ph": "X",
+                "ts": self.start * 1e6,
+                "dur": (end - self.start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": self.args})
+
+
+class _NullSpan:
+    """Do nothing, while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, **args):
+    """Return a context that records a span, if tracing is on.
+
+    Args:
+        name (str): Span name, like "Body" or "Face.triangulate".
+        args: JSON values that are shown with the span.
+    """
+    if _events is None:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def start():
+    """Start recording the spans of this process."""
+    global _events
+    _events = []
+
+
+def stop():
+    """Stop recording, and return the recorded events."""
+    global _events
+    events = _events or []
+    _events = None
+    return events
+
+
+def isTracing():
+    return _events is not None
+
+
+def addEvents(events):
+    """Add the events of another process, if tracing is on."""
+    if _events is not None:
+        _events.extend(events)
+
+
+def toJson(events):
+    """Return the events as a trace file for chrome://tracing or Perfetto.
+
+    The timestamps of all processes share the clock of time.perf_counter,
+    which is system-wide on common platforms.
+    """
+    mainPid = os.getpid()
+    names = {mainPid: "chrumm"}
+    for event in events:
+        if event["pid"] not in names:
+            names[event["pid"]] = f"worker {len(names)}"
+
+    metadata = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}}
+        for pid, name in names.items()]
+    metadata.extend(
+        {"name": "process_sort_index", "ph": "M", "pid": pid, "args": {"sort_index": i}}
+        for i, pid in enumerate(names))
+
+    return json.dumps({"traceEvents": metadata + events, "displayTimeUnit": "ms"})